@@ -5,13 +5,51 @@ dataloader模块测试配置文件
 """
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, MagicMock
 import pandas as pd
 
 from vnpy.trader.object import BarData
 from vnpy.trader.constant import Exchange, Interval
-from vnpy.dataloader.base import DownloadRequest, DownloadResult, DataSource
+from vnpy.dataloader.base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSource
+
+
+class StubStockDownloader(BaseStockDownloader):
+    """返回固定数据的本地下载器，记录所有收到的请求"""
+
+    def __init__(self, bar_count: int = 3, fail_symbols: tuple = ()):
+        super().__init__("StubStockDownloader")
+        self.source = DataSource.YFINANCE
+        self.bar_count = bar_count
+        self.fail_symbols = fail_symbols
+        self.requests = []
+
+    def init_connection(self, **kwargs) -> bool:
+        return True
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        self.requests.append(request)
+
+        if request.symbol in self.fail_symbols:
+            return DownloadResult(request=request, bars=[], success=False, error_msg="模拟下载失败")
+
+        start = request.start_date or datetime(2023, 1, 1)
+        bars = [
+            BarData(
+                symbol=request.symbol,
+                exchange=request.exchange,
+                datetime=start + timedelta(days=i),
+                interval=request.interval,
+                volume=1000.0,
+                open_price=100.0,
+                high_price=101.0,
+                low_price=99.0,
+                close_price=100.5,
+                gateway_name="stub"
+            )
+            for i in range(self.bar_count)
+        ]
+        return DownloadResult(request=request, bars=bars, success=True)
 
 
 @pytest.fixture
@@ -45,6 +83,12 @@ def sample_bar_data():
     )
 
 
+@pytest.fixture
+def stub_downloader():
+    """创建本地模拟下载器fixture"""
+    return StubStockDownloader()
+
+
 @pytest.fixture
 def mock_yfinance_data():
     """创建模拟的yfinance数据DataFrame"""
@@ -0,0 +1,155 @@
+"""
+异步下载单元测试
+
+测试异步下载器接口、同步下载器桥接、同步调用包装以及异步批量下载运行器。
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+from vnpy.trader.constant import Exchange
+from vnpy.dataloader.async_downloader import (
+    AsyncBaseStockDownloader,
+    AsyncStockDataManager,
+    ExecutorStockDownloader,
+    SyncStockDownloader
+)
+from vnpy.dataloader.base import DownloadRequest, DownloadResult, DataSource
+from vnpy.dataloader.manager import StockDataManager
+
+from .conftest import StubStockDownloader
+
+
+class FakeAsyncDownloader(AsyncBaseStockDownloader):
+    """记录最大在途请求数的异步模拟下载器"""
+
+    def __init__(self, fail_symbols: tuple = ()):
+        super().__init__("FakeAsyncDownloader")
+        self.source = DataSource.YFINANCE
+        self.stub = StubStockDownloader(fail_symbols=fail_symbols)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        # 让出事件循环，使其他请求同时在途
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        self.in_flight -= 1
+
+        if request.symbol == "ERROR":
+            raise ConnectionError("connection reset")
+        return self.stub.download_bars(request)
+
+
+SYMBOLS = [f"SYM{i}" for i in range(50)]
+
+
+class TestExecutorStockDownloader:
+    """ExecutorStockDownloader测试类"""
+
+    def test_download_bars_should_run_sync_downloader_in_executor(self):
+        """测试同步下载器应该在线程池中执行"""
+        # Arrange
+        stub = StubStockDownloader()
+        downloader = ExecutorStockDownloader(stub, max_workers=2)
+        requests = [DownloadRequest(symbol, Exchange.NASDAQ) for symbol in SYMBOLS[:5]]
+
+        # Act
+        results = asyncio.run(downloader.download_bars_batch(requests))
+        single = asyncio.run(downloader.download_bars(requests[0]))
+        downloader.close()
+
+        # Assert
+        assert [r.request.symbol for r in results] == SYMBOLS[:5]
+        assert single.success is True
+        assert len(stub.requests) == 6
+
+
+class TestSyncStockDownloader:
+    """SyncStockDownloader测试类"""
+
+    def test_download_bars_should_wrap_async_downloader(self):
+        """测试同步包装应该可以直接调用异步下载器"""
+        # Arrange
+        downloader = SyncStockDownloader(FakeAsyncDownloader())
+
+        # Act
+        result = downloader.download_bars(DownloadRequest("AAPL", Exchange.NASDAQ))
+        results = downloader.download_bars_batch([DownloadRequest(s, Exchange.NASDAQ) for s in SYMBOLS])
+
+        # Assert
+        assert result.success is True
+        assert len(results) == 50
+        assert downloader.downloader.max_in_flight == 50
+
+
+class TestAsyncStockDataManager:
+    """AsyncStockDataManager测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.manager = StockDataManager()
+        self.manager.database = Mock()
+        self.manager.database.save_bar_frame.return_value = True
+        self.runner = AsyncStockDataManager(self.manager)
+
+    def teardown_method(self):
+        """每个测试方法执行后的清理工作"""
+        self.runner.close()
+
+    def test_run_with_async_downloader_should_bound_in_flight_requests(self):
+        """测试在途请求数不应该超过max_concurrency"""
+        # Arrange
+        downloader = FakeAsyncDownloader()
+        self.runner.add_downloader(DataSource.YFINANCE, downloader)
+
+        # Act
+        results = self.runner.run(SYMBOLS, exchange=Exchange.NASDAQ, save_to_db=False, max_concurrency=8)
+
+        # Assert
+        assert sorted(r.request.symbol for r in results) == sorted(SYMBOLS)
+        assert downloader.max_in_flight == 8
+
+    def test_run_with_source_limit_should_use_smaller_concurrency(self):
+        """测试数据源并发数限制应该生效"""
+        # Arrange
+        downloader = FakeAsyncDownloader()
+        self.runner.add_downloader(DataSource.YFINANCE, downloader)
+        self.manager.set_source_limit(DataSource.YFINANCE, concurrency=3)
+
+        # Act
+        self.runner.run(SYMBOLS, exchange=Exchange.NASDAQ, save_to_db=False)
+
+        # Assert
+        assert downloader.max_in_flight == 3
+
+    def test_run_should_save_successful_results(self):
+        """测试下载成功的结果应该写入数据库，异常应该转换为失败结果"""
+        # Arrange
+        self.runner.add_downloader(DataSource.YFINANCE, FakeAsyncDownloader(fail_symbols=("BAD",)))
+
+        # Act
+        results = self.runner.run(["AAPL", "BAD", "ERROR"], exchange=Exchange.NASDAQ)
+
+        # Assert
+        failed = {r.request.symbol: r for r in results if not r.success}
+        assert set(failed) == {"BAD", "ERROR"}
+        assert failed["ERROR"].retryable is True
+        assert self.manager.database.save_bar_frame.call_count == 1
+
+    def test_run_without_async_downloader_should_bridge_sync_downloader(self):
+        """测试没有异步下载器时应该桥接同步下载器"""
+        # Arrange
+        stub = StubStockDownloader()
+        self.manager.downloaders[DataSource.YFINANCE] = stub
+
+        # Act
+        results = self.runner.run(SYMBOLS[:10], exchange=Exchange.NASDAQ, save_to_db=False)
+
+        # Assert
+        assert len(results) == 10
+        assert len(stub.requests) == 10
@@ -0,0 +1,219 @@
+"""
+dataloader基础模块单元测试
+
+测试按列批量转换DataFrame为BarData的公共函数，以及按列存储的下载结果。
+"""
+
+import pytest
+from dataclasses import fields, replace
+from datetime import datetime
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import convert_tz
+from vnpy.dataloader.base import (
+    BarColumns,
+    DownloadRequest,
+    DownloadResult,
+    convert_dataframe_to_bars,
+    convert_dataframe_to_columns,
+    convert_datetime_array,
+    normalize_columns
+)
+
+
+class TestNormalizeColumns:
+    """normalize_columns测试类"""
+
+    @pytest.mark.parametrize("column,expected", [
+        ("Open", "open"),
+        ("Date", "datetime"),
+        ("收盘", "close"),
+        ("成交额", "turnover"),
+    ])
+    def test_normalize_columns_should_map_to_standard_names(self, column, expected):
+        """测试列名应该被转换为标准列名"""
+        # Arrange
+        df = pd.DataFrame({column: [1]})
+
+        # Act
+        result = normalize_columns(df)
+
+        # Assert
+        assert list(result.columns) == [expected]
+
+
+class TestConvertDatetimeArray:
+    """convert_datetime_array测试类"""
+
+    def test_convert_datetime_array_with_yyyymmdd_integers_should_parse_dates(self):
+        """测试YYYYMMDD格式整数应该被解析为日期"""
+        # Act
+        result = convert_datetime_array(pd.Series([20230103]))
+
+        # Assert
+        assert result[0] == datetime(2023, 1, 3)
+
+    def test_convert_datetime_array_with_aware_timestamps_should_match_convert_tz(self):
+        """测试带时区时间戳的转换结果应该与逐个convert_tz一致"""
+        # Arrange
+        index = pd.date_range("2023-01-03 09:30", periods=3, freq="min", tz="America/New_York")
+
+        # Act
+        result = convert_datetime_array(index)
+
+        # Assert
+        assert list(result) == [convert_tz(ts.to_pydatetime()) for ts in index]
+
+    def test_convert_datetime_array_with_naive_utc_should_localize_as_utc(self):
+        """测试指定无时区时间戳为UTC时应该按UTC转换"""
+        # Arrange
+        index = pd.DatetimeIndex(["2023-01-03 14:30"])
+
+        # Act
+        result = convert_datetime_array(index, naive_tz="UTC")
+
+        # Assert
+        assert result[0] == convert_tz(index.tz_localize("UTC")[0].to_pydatetime())
+
+
+class TestConvertDataframeToBars:
+    """convert_dataframe_to_bars测试类"""
+
+    def test_convert_with_akshare_columns_should_return_bars(self):
+        """测试akshare中文列名数据应该被正确转换"""
+        # Arrange
+        df = pd.DataFrame({
+            "日期": ["2023-01-03", "2023-01-04"],
+            "开盘": [10.0, 11.0],
+            "收盘": [10.5, 11.5],
+            "最高": [10.8, 11.8],
+            "最低": [9.8, 10.8],
+            "成交量": [1000, 2000],
+        })
+
+        # Act
+        bars = convert_dataframe_to_bars(df, "AAPL", Exchange.NASDAQ, Interval.DAILY, "akshare")
+
+        # Assert
+        assert len(bars) == 2
+        assert bars[1].datetime == datetime(2023, 1, 4)
+        assert bars[1].close_price == 11.5
+        assert bars[1].volume == 2000.0
+        assert bars[1].gateway_name == "akshare"
+
+    def test_convert_with_invalid_dates_should_drop_rows(self):
+        """测试无法解析时间的行应该被丢弃"""
+        # Arrange
+        df = pd.DataFrame({"date": ["2023-01-03", "not a date"], "close": [1.0, 2.0]})
+
+        # Act
+        bars = convert_dataframe_to_bars(df, "AAPL", Exchange.NASDAQ, Interval.DAILY, "akshare")
+
+        # Assert
+        assert len(bars) == 1
+        assert bars[0].close_price == 1.0
+
+    def test_convert_with_none_should_return_empty_list(self):
+        """测试None数据应该返回空列表"""
+        # Act
+        bars = convert_dataframe_to_bars(None, "AAPL", Exchange.NASDAQ, Interval.DAILY, "akshare")
+
+        # Assert
+        assert bars == []
+
+
+@pytest.fixture
+def sample_columns():
+    """创建两行K线列数据fixture"""
+    df = pd.DataFrame({
+        "date": ["2023-01-03", "2023-01-04"],
+        "open": [10.0, 11.0],
+        "close": [10.5, 11.5],
+        "volume": [1000, 2000],
+    })
+    return convert_dataframe_to_columns(df, "AAPL", Exchange.NASDAQ, Interval.DAILY, "akshare")
+
+
+class TestBarColumns:
+    """BarColumns测试类"""
+
+    def test_to_bars_should_create_one_bar_per_row(self, sample_columns):
+        """测试生成的BarData应该与列数据一一对应"""
+        # Act
+        bars = sample_columns.to_bars()
+
+        # Assert
+        assert len(bars) == 2
+        assert bars[0].datetime == datetime(2023, 1, 3)
+        assert bars[0].open_price == 10.0
+        assert bars[0].high_price == 0.0
+
+    def test_from_bars_should_round_trip(self, sample_columns):
+        """测试从BarData列表重建的列数据应该与原数据一致"""
+        # Act
+        result = BarColumns.from_bars(sample_columns.to_bars())
+
+        # Assert
+        assert (result.datetime == sample_columns.datetime).all()
+        assert (result.close == sample_columns.close).all()
+
+    def test_to_dict_should_use_lab_column_names(self, sample_columns):
+        """测试列名应该与AlphaLab的parquet文件一致"""
+        # Act
+        data = sample_columns.to_dict()
+
+        # Assert
+        assert list(data) == [
+            "datetime", "open", "high", "low", "close", "volume", "turnover", "open_interest"
+        ]
+
+
+class TestDownloadResultColumns:
+    """DownloadResult列数据测试类"""
+
+    def test_download_result_with_columns_should_count_rows(self, sample_columns):
+        """测试只有列数据时应该按行数统计并标记成功"""
+        # Act
+        result = DownloadResult(request=DownloadRequest("AAPL"), bars=None, success=True, columns=sample_columns)
+
+        # Assert
+        assert result.success is True
+        assert result.total_count == 2
+        assert result._bars is None
+
+    def test_bars_with_columns_should_materialize_lazily(self, sample_columns):
+        """测试首次访问bars时应该由列数据生成BarData"""
+        # Arrange
+        result = DownloadResult(request=DownloadRequest("AAPL"), bars=None, success=True, columns=sample_columns)
+
+        # Act
+        bars = result.bars
+
+        # Assert
+        assert len(bars) == 2
+        assert result.bars is bars
+
+    def test_get_columns_with_bars_only_should_convert(self, sample_columns):
+        """测试只有BarData列表时应该按需转换为列数据"""
+        # Arrange
+        result = DownloadResult(request=DownloadRequest("AAPL"), bars=sample_columns.to_bars(), success=True)
+
+        # Act
+        columns = result.get_columns()
+
+        # Assert
+        assert len(columns) == 2
+
+    def test_replace_should_keep_bars_field(self, sample_columns):
+        """测试dataclasses.replace应该保留bars字段"""
+        # Arrange
+        result = DownloadResult(request=DownloadRequest("AAPL"), bars=sample_columns.to_bars(), success=True)
+
+        # Act
+        copied = replace(result, error_msg="copied")
+
+        # Assert
+        assert "bars" in [f.name for f in fields(DownloadResult)]
+        assert copied.bars == result.bars
+        assert copied.total_count == 2
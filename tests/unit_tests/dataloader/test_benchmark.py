@@ -0,0 +1,78 @@
+"""
+入库和启动性能基准测试单元测试
+
+使用极小的数据量检查各阶段结果和扩展曲线的格式、SQLite写入目标，以及导入耗时分析。
+"""
+
+import json
+import sqlite3
+
+from vnpy.dataloader.benchmark import SqliteBarTarget, parse_importtime, run_ingest_benchmark, run_startup_benchmark
+
+
+class TestIngestBenchmark:
+    """run_ingest_benchmark测试类"""
+
+    def test_run_ingest_benchmark_should_report_all_stages(self, tmp_path):
+        """测试应该输出各阶段结果和从1到最大线程数的扩展曲线，结果可以序列化为JSON"""
+        # Act
+        results = run_ingest_benchmark(symbol_count=2, rows=50, max_workers=3, target_dir=tmp_path)
+
+        # Assert
+        assert results["bars"] == 100
+        assert [s["stage"] for s in results["stages"]] == ["convert", "validate", "database_save", "parquet_save"]
+        assert [s["workers"] for s in results["scaling"]] == [1, 2, 3]
+        assert all(s["bars_per_second"] > 0 for s in results["stages"])
+        json.dumps(results)
+
+        connection = sqlite3.connect(str(tmp_path.joinpath("benchmark.db")))
+        assert connection.execute("SELECT COUNT(*) FROM dbbardata").fetchone()[0] == 100
+        connection.close()
+
+    def test_sqlite_target_should_replace_duplicates(self, tmp_path, sample_bar_data):
+        """测试重复写入同一根K线时应该覆盖而不是新增"""
+        # Arrange
+        target = SqliteBarTarget(tmp_path.joinpath("test.db"))
+
+        # Act
+        target.save_bar_data([sample_bar_data])
+        target.save_bar_data([sample_bar_data])
+
+        # Assert
+        assert target.connection.execute("SELECT COUNT(*) FROM dbbardata").fetchone()[0] == 1
+        target.close()
+
+
+class TestStartupBenchmark:
+    """run_startup_benchmark测试类"""
+
+    def test_parse_importtime_should_skip_header_and_convert_seconds(self):
+        """测试应该跳过表头和无关输出，并把微秒转换为秒"""
+        # Arrange
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       150 |        150 |   zipimport\n"
+            "some warning\n"
+            "import time:      2000 |       5000 | vnpy.trader.constant\n"
+        )
+
+        # Act
+        records = parse_importtime(output)
+
+        # Assert
+        assert [r["module"] for r in records] == ["zipimport", "vnpy.trader.constant"]
+        assert records[1]["self_seconds"] == 0.002
+        assert records[1]["cumulative_seconds"] == 0.005
+
+    def test_run_startup_benchmark_should_report_slowest_modules(self):
+        """测试应该输出每个入口模块的导入耗时和最慢模块，结果可以序列化为JSON"""
+        # Act
+        results = run_startup_benchmark(["vnpy.trader.constant"], repeat=1, top=2)
+
+        # Assert
+        result = results["modules"][0]
+        assert result["module"] == "vnpy.trader.constant"
+        assert result["imported_modules"] > 0
+        assert len(result["slowest"]) == 2
+        assert result["slowest"][0]["self_seconds"] >= result["slowest"][1]["self_seconds"]
+        json.dumps(results)
@@ -0,0 +1,180 @@
+"""
+ResponseCache单元测试
+
+使用本地模拟下载器离线测试数据源响应缓存。
+"""
+
+from datetime import datetime
+
+import pytest
+from unittest.mock import Mock, patch
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.dataloader.base import DownloadRequest, DownloadResult, convert_dataframe_to_columns
+from vnpy.dataloader.akshare_downloader import AkshareStockDownloader
+from vnpy.dataloader.cache import ResponseCache
+
+from .conftest import StubStockDownloader
+
+
+class FrameStubDownloader(StubStockDownloader):
+    """通过fetch_frame获取原始数据的模拟下载器"""
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__()
+        self.fetch = Mock(return_value=df)
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        df = self.fetch_frame(request, self.fetch)
+        columns = convert_dataframe_to_columns(df, request.symbol, request.exchange, request.interval, "stub")
+        return DownloadResult(request=request, bars=None, columns=columns, success=columns is not None)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """创建临时目录下的缓存fixture"""
+    return ResponseCache(tmp_path, ttl=60, max_bytes=10 * 1024 * 1024)
+
+
+@pytest.fixture
+def cached_downloader(cache, mock_yfinance_data):
+    """创建启用缓存的模拟下载器fixture"""
+    downloader = FrameStubDownloader(mock_yfinance_data)
+    downloader.set_cache(cache)
+    return downloader
+
+
+class TestResponseCache:
+    """ResponseCache测试类"""
+
+    def test_identical_requests_should_fetch_once(self, cached_downloader, cache, sample_download_request):
+        """测试相同请求第二次应该命中缓存而不请求数据源"""
+        # Act
+        first = cached_downloader.download_bars(sample_download_request)
+        second = cached_downloader.download_bars(sample_download_request)
+
+        # Assert
+        assert cached_downloader.fetch.call_count == 1
+        assert second.total_count == first.total_count == 3
+        assert (second.columns.datetime == first.columns.datetime).all()
+        assert cache.get_stats()["hit_count"] == 1
+        assert cache.get_stats()["miss_count"] == 1
+
+    def test_different_ranges_should_use_different_keys(self, cached_downloader, sample_download_request):
+        """测试不同时间区间应该分别请求数据源"""
+        # Arrange
+        other_request = DownloadRequest("AAPL", Exchange.NASDAQ, interval=Interval.DAILY)
+
+        # Act
+        cached_downloader.download_bars(sample_download_request)
+        cached_downloader.download_bars(other_request)
+
+        # Assert
+        assert cached_downloader.fetch.call_count == 2
+
+    def test_expired_entry_should_be_refetched(self, cached_downloader, sample_download_request):
+        """测试超过有效期的缓存应该重新请求数据源"""
+        # Arrange
+        cached_downloader.download_bars(sample_download_request)
+
+        # Act
+        with patch("vnpy.dataloader.cache.time", return_value=pd.Timestamp.now().timestamp() + 3600):
+            cached_downloader.download_bars(sample_download_request)
+
+        # Assert
+        assert cached_downloader.fetch.call_count == 2
+
+    def test_put_with_empty_frame_should_not_cache(self, cache):
+        """测试空数据不应该写入缓存"""
+        # Act
+        cache.put("empty", pd.DataFrame())
+
+        # Assert
+        assert cache.get("empty") is None
+
+    def test_evict_over_size_limit_should_remove_least_recently_used(self, tmp_path, mock_yfinance_data):
+        """测试超过大小上限时应该淘汰最久未使用的缓存"""
+        # Arrange
+        cache = ResponseCache(tmp_path, ttl=0)
+        cache.put("old", mock_yfinance_data)
+        cache.put("new", mock_yfinance_data)
+        cache.get("new")
+        cache.max_bytes = cache.get_file_path("new").stat().st_size
+
+        # Act
+        cache.evict()
+
+        # Assert
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+
+    def test_put_should_not_rescan_cache_directory(self, cache, mock_yfinance_data):
+        """测试写入时应该根据内存索引判断大小，而不是重新扫描缓存目录"""
+        # Arrange
+        cache.put("first", mock_yfinance_data)
+        cache.max_bytes = cache.get_size()
+
+        # Act
+        with patch("vnpy.dataloader.cache.os.scandir") as scandir:
+            cache.put("second", mock_yfinance_data)
+
+        # Assert
+        scandir.assert_not_called()
+        assert cache.get("first") is None
+        assert cache.get("second") is not None
+        assert cache.get_size() == cache.get_file_path("second").stat().st_size
+
+    def test_new_cache_should_rebuild_index_from_directory(self, tmp_path, mock_yfinance_data):
+        """测试重新创建缓存时应该从缓存目录恢复索引"""
+        # Arrange
+        ResponseCache(tmp_path, ttl=0).put("saved", mock_yfinance_data)
+
+        # Act
+        cache = ResponseCache(tmp_path, ttl=0)
+
+        # Assert
+        assert list(cache.entries) == ["saved"]
+        assert cache.get_size() == cache.get_file_path("saved").stat().st_size
+
+    def test_get_stats_without_requests_should_return_zero_hit_rate(self, cache):
+        """测试没有请求时命中率应该为0"""
+        # Act
+        stats = cache.get_stats()
+
+        # Assert
+        assert stats["hit_rate"] == 0.0
+        assert stats["size"] == 0
+
+
+class TestAkshareCache:
+    """akshare下载器缓存测试类"""
+
+    def test_different_ranges_should_share_full_history_cache(self, cache):
+        """测试akshare总是返回全部历史数据，不同时间范围的请求应该共用一份缓存并各自截取"""
+        # Arrange
+        df = pd.DataFrame({
+            "日期": ["2023-01-03", "2023-01-04", "2023-01-05", "2023-01-06"],
+            "开盘": [1.0, 2.0, 3.0, 4.0],
+            "收盘": [1.0, 2.0, 3.0, 4.0],
+            "最高": [1.0, 2.0, 3.0, 4.0],
+            "最低": [1.0, 2.0, 3.0, 4.0],
+            "成交量": [100, 100, 100, 100],
+        })
+        downloader = AkshareStockDownloader()
+        downloader.ak = Mock()
+        downloader.ak.stock_us_hist.return_value = df
+        downloader.set_cache(cache)
+
+        # Act
+        first = downloader.download_bars(
+            DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 3), datetime(2023, 1, 4))
+        )
+        second = downloader.download_bars(
+            DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 5), datetime(2023, 1, 6))
+        )
+
+        # Assert
+        assert downloader.ak.stock_us_hist.call_count == 1
+        assert [bar.close_price for bar in first.bars] == [1.0, 2.0]
+        assert [bar.close_price for bar in second.bars] == [3.0, 4.0]
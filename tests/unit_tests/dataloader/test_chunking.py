@@ -0,0 +1,197 @@
+"""
+分段下载单元测试
+
+测试按数据源时间跨度限制拆分请求、并行下载后按顺序去重拼接以及逐段保存。
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.dataloader.base import DownloadRequest, DownloadResult, DataSource
+from vnpy.dataloader.manager import StockDataManager
+
+from .conftest import StubStockDownloader
+
+
+class ChunkedStubDownloader(StubStockDownloader):
+    """日线每次请求最多覆盖2天的模拟下载器"""
+
+    chunk_sizes = {Interval.DAILY: timedelta(days=2)}
+
+
+class FailingChunkDownloader(ChunkedStubDownloader):
+    """指定开始日期的分段返回失败的模拟下载器"""
+
+    def __init__(self, fail_day: int, retryable: bool):
+        super().__init__(bar_count=2)
+        self.fail_day = fail_day
+        self.retryable = retryable
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        if request.start_date.day == self.fail_day:
+            self.requests.append(request)
+            return DownloadResult(
+                request=request, bars=[], success=False, error_msg="模拟网络错误", retryable=self.retryable
+            )
+        return super().download_bars(request)
+
+
+def make_request(days: int) -> DownloadRequest:
+    """创建从2023-01-01开始指定天数的下载请求"""
+    start = datetime(2023, 1, 1)
+    return DownloadRequest("AAPL", Exchange.NASDAQ, start, start + timedelta(days=days), Interval.DAILY)
+
+
+class TestSplitRequest:
+    """split_request测试类"""
+
+    def test_split_request_with_long_range_should_return_contiguous_chunks(self):
+        """测试超过时间跨度限制的请求应该被拆分为首尾相接的多段"""
+        # Arrange
+        downloader = ChunkedStubDownloader()
+
+        # Act
+        requests = downloader.split_request(make_request(5))
+
+        # Assert
+        assert [(r.start_date.day, r.end_date.day) for r in requests] == [(1, 3), (3, 5), (5, 6)]
+        assert all(r.symbol == "AAPL" for r in requests)
+
+    def test_split_request_without_policy_should_return_original(self):
+        """测试没有设置时间跨度限制的时间间隔不应该拆分"""
+        # Arrange
+        downloader = ChunkedStubDownloader()
+        request = DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1), interval=Interval.MINUTE)
+
+        # Act
+        requests = downloader.split_request(request)
+
+        # Assert
+        assert requests == [request]
+
+
+class TestDownloadBarsChunked:
+    """download_bars_chunked测试类"""
+
+    def test_download_bars_chunked_should_stitch_without_duplicates(self):
+        """测试各段重叠的数据应该按时间顺序去重拼接"""
+        # Arrange
+        downloader = ChunkedStubDownloader(bar_count=3)
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=2)
+
+        # Assert
+        assert len(downloader.requests) == 3
+        assert result.success is True
+        assert [bar.datetime.day for bar in result.bars] == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_download_bars_chunked_with_sink_should_stream_in_order(self):
+        """测试设置sink时应该按时间顺序逐段输出且不保留数据"""
+        # Arrange
+        downloader = ChunkedStubDownloader(bar_count=3)
+        sink = Mock()
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=3, sink=sink)
+
+        # Assert
+        days = [bar.datetime.day for call in sink.call_args_list for bar in call.args[0].bars]
+        assert days == [1, 2, 3, 4, 5, 6, 7]
+        assert result.total_count == 7
+        assert result.bars == []
+
+    def test_download_bars_chunked_with_failed_chunks_should_report_error(self):
+        """测试所有分段都失败时应该返回失败结果和错误信息"""
+        # Arrange
+        downloader = ChunkedStubDownloader(fail_symbols=("AAPL",))
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(4))
+
+        # Assert
+        assert result.success is False
+        assert result.error_msg == "模拟下载失败"
+
+
+    def test_download_bars_chunked_with_one_failed_chunk_should_fail_with_range(self):
+        """测试任一分段临时失败时应该返回可重试的失败结果，并列出失败分段的时间区间"""
+        # Arrange
+        downloader = FailingChunkDownloader(fail_day=3, retryable=True)
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=1)
+
+        # Assert
+        assert result.success is False
+        assert result.retryable is True
+        assert result.error_msg == "分段下载失败: [2023-01-03 00:00:00, 2023-01-05 00:00:00] 模拟网络错误"
+        assert [bar.datetime.day for bar in result.bars] == [1, 2]
+
+    def test_download_bars_chunked_with_failed_chunk_should_not_sink_later_chunks(self):
+        """测试分段失败后不应该继续输出后续分段，避免本地数据出现缺口"""
+        # Arrange
+        downloader = FailingChunkDownloader(fail_day=3, retryable=True)
+        sink = Mock(return_value=True)
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=1, sink=sink)
+
+        # Assert
+        days = [bar.datetime.day for call in sink.call_args_list for bar in call.args[0].bars]
+        assert days == [1, 2]
+        assert result.success is False
+        assert result.total_count == 2
+
+    def test_download_bars_chunked_with_sink_failure_should_fail(self):
+        """测试sink写入失败时应该返回失败结果"""
+        # Arrange
+        downloader = ChunkedStubDownloader(bar_count=3)
+        sink = Mock(side_effect=[True, False, True])
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=1, sink=sink)
+
+        # Assert
+        assert sink.call_count == 2
+        assert result.success is False
+        assert result.error_msg == "分段下载失败: [2023-01-03 00:00:00, 2023-01-05 00:00:00] 数据写入失败"
+        assert result.total_count == 3
+
+    def test_download_bars_chunked_with_empty_chunk_should_skip(self):
+        """测试不可重试的分段失败应该视为该时间段没有数据"""
+        # Arrange
+        downloader = FailingChunkDownloader(fail_day=1, retryable=False)
+
+        # Act
+        result = downloader.download_bars_chunked(make_request(6), max_workers=1)
+
+        # Assert
+        assert result.success is True
+        assert result.error_msg == ""
+        assert [bar.datetime.day for bar in result.bars] == [3, 4, 5, 6]
+
+
+class TestStockDataManagerChunked:
+    """StockDataManager分段下载测试类"""
+
+    def test_download_stock_data_with_long_range_should_save_each_chunk(self):
+        """测试需要分段下载时应该逐段保存到数据库"""
+        # Arrange
+        manager = StockDataManager()
+        manager.downloaders[DataSource.YFINANCE] = ChunkedStubDownloader(bar_count=2)
+        manager.database = Mock()
+
+        # Act
+        result = manager.download_stock_data(
+            "AAPL",
+            exchange=Exchange.NASDAQ,
+            start_date=datetime(2023, 1, 1),
+            end_date=datetime(2023, 1, 7),
+            interval=Interval.DAILY
+        )
+
+        # Assert
+        assert result.total_count == 6
+        assert manager.database.save_bar_frame.call_count == 3
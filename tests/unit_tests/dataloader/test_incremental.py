@@ -0,0 +1,192 @@
+"""
+增量下载单元测试
+
+测试缺失区间计算、IncrementalDownloader以及多段结果合并。
+"""
+
+import pytest
+from datetime import date, datetime
+from unittest.mock import Mock
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BarOverview
+from vnpy.trader.calendar import TradingCalendar
+from vnpy.dataloader.base import DownloadRequest
+from vnpy.dataloader.incremental import IncrementalDownloader, compute_missing_ranges, merge_results
+from vnpy.dataloader.quality import BarQualityChecker
+
+from .conftest import StubStockDownloader
+
+
+STORED = (datetime(2023, 1, 10), datetime(2023, 1, 20))
+
+
+def strip_tz(ranges):
+    """去掉时区信息便于比较"""
+    return [
+        (start.replace(tzinfo=None) if start else None, end.replace(tzinfo=None) if end else None)
+        for start, end in ranges
+    ]
+
+
+class TestComputeMissingRanges:
+    """compute_missing_ranges测试类"""
+
+    def test_compute_without_stored_data_should_return_full_range(self):
+        """测试本地没有数据时应该下载完整区间"""
+        # Act
+        result = compute_missing_ranges(datetime(2023, 1, 1), datetime(2023, 1, 31), None, Interval.DAILY)
+
+        # Assert
+        assert result == [(datetime(2023, 1, 1), datetime(2023, 1, 31))]
+
+    def test_compute_with_covered_range_should_return_empty(self):
+        """测试本地数据已覆盖请求区间时不需要下载"""
+        # Act
+        result = compute_missing_ranges(datetime(2023, 1, 12), datetime(2023, 1, 18), STORED, Interval.DAILY)
+
+        # Assert
+        assert result == []
+
+    def test_compute_with_wider_range_should_return_head_and_tail(self):
+        """测试请求区间两端超出本地数据时应该返回头尾两段缺口"""
+        # Act
+        result = compute_missing_ranges(datetime(2023, 1, 1), datetime(2023, 1, 31), STORED, Interval.DAILY)
+
+        # Assert
+        assert strip_tz(result) == [
+            (datetime(2023, 1, 1), datetime(2023, 1, 10)),
+            (datetime(2023, 1, 21), datetime(2023, 1, 31)),
+        ]
+
+    @pytest.mark.parametrize("interval,expected_start", [
+        (Interval.DAILY, datetime(2023, 1, 21)),
+        (Interval.MINUTE, datetime(2023, 1, 20, 0, 1)),
+    ])
+    def test_compute_without_end_should_download_after_stored_end(self, interval, expected_start):
+        """测试结束时间为空时应该从本地最新数据之后开始下载"""
+        # Act
+        result = compute_missing_ranges(None, None, STORED, interval)
+
+        # Assert
+        assert strip_tz(result) == [(expected_start, None)]
+
+    def test_compute_with_calendar_should_skip_gap_without_sessions(self):
+        """测试交易日历覆盖的缺口中没有交易日时不需要下载"""
+        # Arrange
+        calendar = TradingCalendar.from_weekdays(datetime(2023, 1, 1), datetime(2023, 12, 31))
+        stored = (datetime(2023, 1, 2), datetime(2023, 1, 13))      # 周一到周五
+
+        # Act
+        weekend = compute_missing_ranges(None, datetime(2023, 1, 15), stored, Interval.DAILY, calendar)
+        week = compute_missing_ranges(None, datetime(2023, 1, 17), stored, Interval.DAILY, calendar)
+
+        # Assert
+        assert weekend == []
+        assert strip_tz(week) == [(datetime(2023, 1, 14), datetime(2023, 1, 17))]
+
+
+class TestIncrementalDownloader:
+    """IncrementalDownloader测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.stub = StubStockDownloader()
+        self.database = Mock()
+        self.database.get_bar_overview.return_value = [
+            BarOverview("AAPL", Exchange.NASDAQ, Interval.DAILY, 11, *STORED)
+        ]
+        self.downloader = IncrementalDownloader(self.stub, self.database)
+
+    def test_download_bars_with_stored_data_should_only_request_gaps(self):
+        """测试本地已有数据时应该只请求缺失区间"""
+        # Arrange
+        request = DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        # Act
+        result = self.downloader.download_bars(request)
+
+        # Assert
+        assert len(self.stub.requests) == 2
+        assert result.success is True
+        assert result.total_count == 6
+        assert result.request is request
+
+    def test_download_bars_with_covered_range_should_skip_download(self):
+        """测试本地数据已覆盖时应该返回成功的空结果且不发出请求"""
+        # Arrange
+        request = DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 12), datetime(2023, 1, 18))
+
+        # Act
+        result = self.downloader.download_bars(request)
+
+        # Assert
+        assert self.stub.requests == []
+        assert result.success is True
+        assert result.total_count == 0
+
+    def test_download_bars_with_unknown_symbol_should_request_full_range(self):
+        """测试本地没有数据的股票应该请求完整区间"""
+        # Arrange
+        request = DownloadRequest("MSFT", Exchange.NASDAQ, datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        # Act
+        self.downloader.download_bars(request)
+
+        # Assert
+        assert self.stub.requests == [request]
+
+    def test_download_bars_batch_should_forward_gaps_to_wrapped_batch(self):
+        """测试批量增量下载应该沿用被包装下载器的批量设置，并把所有缺失区间交给其合并请求"""
+        # Arrange
+        self.stub.batch_size = 50
+        self.stub.download_bars_batch = Mock(wraps=self.stub.download_bars_batch)
+        downloader = IncrementalDownloader(self.stub, self.database)
+        requests = [
+            DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1), datetime(2023, 1, 31)),
+            DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 12), datetime(2023, 1, 18)),
+            DownloadRequest("MSFT", Exchange.NASDAQ, datetime(2023, 1, 1), datetime(2023, 1, 31)),
+        ]
+
+        # Act
+        results = downloader.download_bars_batch(requests)
+
+        # Assert
+        assert downloader.batch_size == 50
+        self.stub.download_bars_batch.assert_called_once()
+        assert len(self.stub.download_bars_batch.call_args.args[0]) == 3
+        assert [r.request for r in results] == requests
+        assert [r.total_count for r in results] == [6, 0, 3]
+
+    def test_quality_check_should_only_report_gaps_in_downloaded_ranges(self):
+        """测试增量下载结果的缺失检测应该只覆盖实际下载的头尾缺口，不把本地已有的交易日计为缺失"""
+        # Arrange
+        self.stub.bar_count = 5
+        checker = BarQualityChecker()
+        request = DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        # Act
+        checker.check_result(self.downloader.download_bars(request))
+
+        # Assert
+        report = checker.reports["AAPL.NASDAQ"]
+        assert report.missing_dates == [date(2023, 1, 6), date(2023, 1, 9)]
+
+
+class TestMergeResults:
+    """merge_results测试类"""
+
+    def test_merge_results_should_deduplicate_overlapping_bars(self):
+        """测试合并结果应该按时间去重并排序"""
+        # Arrange
+        stub = StubStockDownloader(bar_count=3)
+        request = DownloadRequest("AAPL", Exchange.NASDAQ)
+        first = stub.download_bars(DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 3)))
+        second = stub.download_bars(DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1)))
+
+        # Act
+        result = merge_results(request, [first, second])
+
+        # Assert
+        assert result.total_count == 5
+        assert [bar.datetime.day for bar in result.bars] == [1, 2, 3, 4, 5]
@@ -0,0 +1,179 @@
+"""
+可恢复批量下载任务单元测试
+
+测试下载单元完成记录的读写、进度统计以及任务中断后的恢复。
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.dataloader.base import DownloadRequest, DataSource
+from vnpy.dataloader.job import DownloadJob, DownloadJournal, JobProgress
+from vnpy.dataloader.manager import StockDataManager
+
+from .conftest import StubStockDownloader
+
+
+START = datetime(2023, 1, 1)
+SYMBOLS = ["AAPL", "MSFT", "GOOG", "AMZN", "BAD"]
+
+
+@pytest.fixture
+def manager():
+    """创建使用模拟下载器和模拟数据库的数据管理器"""
+    manager = StockDataManager()
+    manager.downloaders[DataSource.YFINANCE] = StubStockDownloader(fail_symbols=("BAD",))
+    manager.database = Mock()
+    manager.database.save_bar_frame.return_value = True
+    return manager
+
+
+class TestDownloadJournal:
+    """DownloadJournal测试类"""
+
+    def test_record_success_should_persist_across_instances(self, tmp_path):
+        """测试成功的下载单元应该写入日志并在重新加载后视为已完成"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        journal = DownloadJournal("job", journal_path)
+        stub = StubStockDownloader(fail_symbols=("BAD",))
+        good = stub.download_bars(DownloadRequest("AAPL", Exchange.NASDAQ, START))
+        bad = stub.download_bars(DownloadRequest("BAD", Exchange.NASDAQ, START))
+
+        # Act
+        journal.record(DataSource.YFINANCE, good)
+        journal.record(DataSource.YFINANCE, bad)
+        reloaded = DownloadJournal("job", journal_path)
+
+        # Assert
+        assert reloaded.is_completed(DownloadJournal.make_key(DataSource.YFINANCE, good.request)) is True
+        assert reloaded.is_completed(DownloadJournal.make_key(DataSource.YFINANCE, bad.request)) is False
+
+    def test_load_with_truncated_last_line_should_ignore_it(self, tmp_path):
+        """测试进程中断导致的不完整行应该被忽略"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        journal_path.write_text('{"key": "a", "success": true}\n{"key": "b", "succ', encoding="UTF-8")
+
+        # Act
+        journal = DownloadJournal("job", journal_path)
+
+        # Assert
+        assert journal.completed == {"a"}
+
+
+class TestJobProgress:
+    """JobProgress测试类"""
+
+    def test_get_eta_should_extrapolate_from_finished_units(self):
+        """测试预计剩余时间应该按已完成单元的平均耗时估算"""
+        # Arrange
+        with patch("vnpy.dataloader.job.monotonic", side_effect=[0.0, 10.0]):
+            progress = JobProgress(total=10, skipped=2)
+            result = StubStockDownloader().download_bars(DownloadRequest("AAPL", Exchange.NASDAQ))
+            progress.update(DataSource.YFINANCE, result)
+            progress.update(DataSource.YFINANCE, result)
+
+            # Act
+            eta = progress.get_eta()
+
+        # Assert
+        assert eta == pytest.approx(30.0)
+
+
+class TestDownloadJob:
+    """DownloadJob测试类"""
+
+    def test_run_should_record_completed_units(self, manager, tmp_path):
+        """测试运行后应该记录成功的下载单元并统计失败数"""
+        # Arrange
+        job = DownloadJob(manager, "job", tmp_path / "job.jsonl", checkpoint_size=2)
+
+        # Act
+        results = job.run(SYMBOLS, exchange=Exchange.NASDAQ, start_date=START)
+
+        # Assert
+        assert len(results) == 5
+        assert len(job.journal.completed) == 4
+        assert job.progress.failed == 1
+
+    def test_run_after_interruption_should_resume_remaining_units(self, manager, tmp_path):
+        """测试任务中断后重新运行应该只下载未完成的单元"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        first = DownloadJob(manager, "job", journal_path, checkpoint_size=2)
+        original = manager.download_multiple_stocks
+        calls = []
+
+        def crash_on_second_batch(**kwargs):
+            calls.append(kwargs["symbols"])
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return original(**kwargs)
+
+        with patch.object(manager, "download_multiple_stocks", side_effect=crash_on_second_batch):
+            with pytest.raises(KeyboardInterrupt):
+                first.run(SYMBOLS, exchange=Exchange.NASDAQ, start_date=START)
+
+        downloader = StubStockDownloader()
+        manager.downloaders[DataSource.YFINANCE] = downloader
+
+        # Act
+        results = DownloadJob(manager, "job", journal_path).run(SYMBOLS, exchange=Exchange.NASDAQ, start_date=START)
+
+        # Assert
+        assert [r.request.symbol for r in results] == ["GOOG", "AMZN", "BAD"]
+        assert [r.symbol for r in downloader.requests] == ["GOOG", "AMZN", "BAD"]
+
+    def test_run_with_different_range_should_not_skip(self, manager, tmp_path):
+        """测试时间范围不同的下载单元不应该被跳过"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        DownloadJob(manager, "job", journal_path).run(["AAPL"], exchange=Exchange.NASDAQ, start_date=START)
+
+        # Act
+        results = DownloadJob(manager, "job", journal_path).run(
+            ["AAPL"], exchange=Exchange.NASDAQ, start_date=datetime(2024, 1, 1)
+        )
+
+        # Assert
+        assert len(results) == 1
+
+    def test_run_without_end_date_on_next_day_should_not_skip(self, manager, tmp_path):
+        """测试未指定结束时间的任务在之后的日期重新运行时不应该跳过已完成的单元"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        DownloadJob(manager, "job", journal_path).run(["AAPL"], exchange=Exchange.NASDAQ, start_date=START)
+        same_day = DownloadJob(manager, "job", journal_path).run(["AAPL"], exchange=Exchange.NASDAQ, start_date=START)
+
+        # Act
+        with patch("vnpy.dataloader.job.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime.now() + timedelta(days=1)
+            next_day = DownloadJob(manager, "job", journal_path).run(["AAPL"], exchange=Exchange.NASDAQ, start_date=START)
+
+        # Assert
+        assert same_day == []
+        assert len(next_day) == 1
+
+    @pytest.mark.parametrize("buffer_rows", [0, 100_000])
+    def test_run_with_failed_write_should_not_record_completed(self, manager, tmp_path, buffer_rows):
+        """测试数据保存失败的下载单元不应该记录为已完成，重新运行时应该再次下载"""
+        # Arrange
+        journal_path = tmp_path / "job.jsonl"
+        manager.set_write_buffer(max_rows=buffer_rows)
+        manager.database.save_bar_frame.side_effect = lambda df, symbol, *args: symbol != "MSFT"
+        manager.database.save_bar_data.side_effect = lambda bars: bars[0].symbol != "MSFT"
+        job = DownloadJob(manager, "job", journal_path)
+
+        # Act
+        job.run(["AAPL", "MSFT"], exchange=Exchange.NASDAQ, start_date=START)
+        reloaded = DownloadJournal("job", journal_path)
+
+        # Assert
+        key = DownloadJournal.make_key(DataSource.YFINANCE, DownloadRequest("AAPL", Exchange.NASDAQ, START))
+        assert reloaded.completed == {key}
+        assert job.progress.failed == 1
+        assert "数据保存失败" in journal_path.read_text(encoding="UTF-8")
@@ -0,0 +1,165 @@
+"""
+AlphaLab流式写入单元测试
+
+测试下载结果追加为分段文件、读取时合并分段文件以及后台合并到主文件。
+"""
+
+from datetime import datetime, timedelta
+from threading import Thread
+from unittest.mock import Mock
+
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.alpha.lab import AlphaLab
+from vnpy.dataloader.base import DownloadRequest, DataSource
+from vnpy.dataloader.lab_sink import LabBarSink
+from vnpy.dataloader.manager import StockDataManager
+
+from .conftest import StubStockDownloader
+
+
+class ChunkedStubDownloader(StubStockDownloader):
+    """日线每次请求最多覆盖2天的模拟下载器"""
+
+    chunk_sizes = {Interval.DAILY: timedelta(days=2)}
+
+
+def make_request(days: int) -> DownloadRequest:
+    """创建从2023-01-01开始指定天数的下载请求"""
+    start = datetime(2023, 1, 1)
+    return DownloadRequest("AAPL", Exchange.NASDAQ, start, start + timedelta(days=days), Interval.DAILY)
+
+
+class TestLabBarSink:
+    """LabBarSink测试类"""
+
+    def test_download_chunked_should_append_one_part_per_chunk(self, tmp_path):
+        """测试分段下载时每段数据应该写入一个分段文件，读取时合并去重"""
+        # Arrange
+        lab = AlphaLab(str(tmp_path))
+        sink = LabBarSink(lab)
+
+        # Act
+        result = sink.download(ChunkedStubDownloader(bar_count=3), make_request(5))
+
+        # Assert
+        assert result.success
+        assert result.bars == []
+        assert len(lab.get_part_paths(lab.get_bar_path("AAPL.NASDAQ", Interval.DAILY))) == 3
+        assert not lab.get_bar_path("AAPL.NASDAQ", Interval.DAILY).exists()
+
+        df = lab.read_bar_file("AAPL.NASDAQ", Interval.DAILY)
+        assert df["datetime"].to_list() == [datetime(2023, 1, d) for d in range(1, 8)]
+
+    def test_compact_should_merge_parts_into_main_file(self, tmp_path):
+        """测试合并后分段文件应该被删除，数据写入主文件"""
+        # Arrange
+        lab = AlphaLab(str(tmp_path))
+        sink = LabBarSink(lab)
+        sink.download(ChunkedStubDownloader(bar_count=3), make_request(5))
+
+        # Act
+        count = sink.compact_async().result()
+        sink.close()
+
+        # Assert
+        assert count == 3
+        assert lab.get_part_paths(lab.get_bar_path("AAPL.NASDAQ", Interval.DAILY)) == []
+        assert sink.get_stats()["pending_count"] == 0
+
+        df = lab.read_bar_file("AAPL.NASDAQ", Interval.DAILY)
+        assert df["datetime"].to_list() == [datetime(2023, 1, d) for d in range(1, 8)]
+
+    def test_write_failed_result_should_skip(self, tmp_path):
+        """测试下载失败的结果不应该写入"""
+        # Arrange
+        lab = AlphaLab(str(tmp_path))
+        sink = LabBarSink(lab)
+        downloader = StubStockDownloader(fail_symbols=("AAPL",))
+
+        # Act
+        result = sink.download(downloader, make_request(1))
+
+        # Assert
+        assert not result.success
+        assert lab.get_part_paths(lab.get_bar_path("AAPL.NASDAQ", Interval.DAILY)) == []
+        assert sink.get_stats()["part_count"] == 0
+
+
+    def test_read_during_compaction_should_see_all_rows(self, tmp_path):
+        """测试后台合并分段文件期间读取不应该因分段文件被删除而失败或丢失数据"""
+        # Arrange
+        lab = AlphaLab(str(tmp_path))
+        vt_symbol = "AAPL.NASDAQ"
+        days = 30
+        errors = []
+
+        def append_and_compact():
+            for i in range(days):
+                df = pl.DataFrame({
+                    "datetime": [datetime(2023, 1, 1) + timedelta(days=i)],
+                    "open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0],
+                    "volume": [1.0], "turnover": [0.0], "open_interest": [0.0],
+                })
+                lab.append_bar_df(vt_symbol, Interval.DAILY, df)
+                lab.compact_bar_data(vt_symbol, Interval.DAILY)
+
+        writer = Thread(target=append_and_compact)
+
+        # Act
+        writer.start()
+        counts = []
+        while writer.is_alive():
+            try:
+                df = lab.read_bar_file(vt_symbol, Interval.DAILY)
+            except Exception as e:
+                errors.append(e)
+                continue
+            counts.append(0 if df is None else len(df))
+        writer.join()
+
+        # Assert
+        assert errors == []
+        assert counts == sorted(counts)
+        assert len(lab.read_bar_file(vt_symbol, Interval.DAILY)) == days
+
+
+class TestManagerDownloadToLab:
+    """StockDataManager.download_to_lab测试类"""
+
+    def test_download_to_lab_should_write_all_symbols(self, tmp_path):
+        """测试批量下载应该写入每只股票并在后台合并"""
+        # Arrange
+        lab = AlphaLab(str(tmp_path))
+        manager = StockDataManager()
+        manager.set_lab(lab)
+        manager.downloaders[DataSource.YFINANCE] = StubStockDownloader(bar_count=2)
+
+        # Act
+        results = manager.download_to_lab(["AAPL", "MSFT"], exchange=Exchange.NASDAQ)
+        manager.lab_sink.close()
+
+        # Assert
+        assert [r.success for r in results] == [True, True]
+        for vt_symbol in ("AAPL.NASDAQ", "MSFT.NASDAQ"):
+            assert lab.get_part_paths(lab.get_bar_path(vt_symbol, Interval.DAILY)) == []
+            assert len(lab.read_bar_file(vt_symbol, Interval.DAILY)) == 2
+
+    def test_incremental_downloads_should_read_range_from_write_target(self, tmp_path):
+        """测试增量下载应该从结果写入的位置判断已有数据"""
+        # Arrange
+        manager = StockDataManager()
+        manager.database = Mock()
+        manager.set_lab(AlphaLab(str(tmp_path)))
+        manager.downloaders[DataSource.YFINANCE] = StubStockDownloader()
+
+        # Act
+        db_downloader = manager.get_downloader(DataSource.YFINANCE, incremental=True)
+        lab_downloader = manager.get_downloader(DataSource.YFINANCE, incremental=True, to_lab=True)
+
+        # Assert
+        assert db_downloader.database is manager.database
+        assert db_downloader.lab is None
+        assert lab_downloader.lab is manager.lab
+        assert lab_downloader.database is None
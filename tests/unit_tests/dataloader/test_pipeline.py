@@ -0,0 +1,154 @@
+"""
+DownloadPipeline单元测试
+
+测试并发下载流水线、限速器以及StockDataManager的并发下载模式。
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.dataloader.base import DownloadRequest, DataSource
+from vnpy.dataloader.manager import StockDataManager
+from vnpy.dataloader.pipeline import DownloadPipeline, RateLimiter
+
+from .conftest import StubStockDownloader
+
+
+def make_tasks(symbols):
+    """创建下载任务列表"""
+    return [
+        (DataSource.YFINANCE, DownloadRequest(symbol, Exchange.NASDAQ, interval=Interval.DAILY))
+        for symbol in symbols
+    ]
+
+
+class TestDownloadPipeline:
+    """DownloadPipeline测试类"""
+
+    def test_run_with_multiple_tasks_should_yield_every_result(self, stub_downloader):
+        """测试并发下载应该返回所有任务的结果"""
+        # Arrange
+        pipeline = DownloadPipeline({DataSource.YFINANCE: stub_downloader}, max_workers=4)
+        symbols = [f"SYM{i}" for i in range(20)]
+
+        # Act
+        results = list(pipeline.run(make_tasks(symbols)))
+
+        # Assert
+        assert sorted(r.request.symbol for r in results) == sorted(symbols)
+        assert all(r.success for r in results)
+
+    def test_run_with_writer_should_persist_only_successful_results(self):
+        """测试写入阶段应该只保存下载成功的结果"""
+        # Arrange
+        downloader = StubStockDownloader(fail_symbols=("BAD",))
+        writer = Mock()
+        pipeline = DownloadPipeline({DataSource.YFINANCE: downloader}, max_workers=2, writer=writer)
+
+        # Act
+        results = list(pipeline.run(make_tasks(["AAPL", "BAD", "MSFT"])))
+
+        # Assert
+        assert len(results) == 3
+        written = sorted(call.args[0].request.symbol for call in writer.call_args_list)
+        assert written == ["AAPL", "MSFT"]
+
+    def test_run_with_callback_should_be_called_for_each_result(self, stub_downloader):
+        """测试回调函数应该对每个结果调用一次"""
+        # Arrange
+        pipeline = DownloadPipeline({DataSource.YFINANCE: stub_downloader}, max_workers=2)
+        callback = Mock()
+
+        # Act
+        list(pipeline.run(make_tasks(["AAPL", "MSFT"]), callback))
+
+        # Assert
+        assert callback.call_count == 2
+
+    def test_run_with_unknown_source_should_return_failure_result(self):
+        """测试不支持的数据源应该返回失败结果"""
+        # Arrange
+        pipeline = DownloadPipeline({}, max_workers=1)
+
+        # Act
+        results = list(pipeline.run(make_tasks(["AAPL"])))
+
+        # Assert
+        assert results[0].success is False
+        assert "不支持的数据源" in results[0].error_msg
+
+    def test_run_with_downloader_exception_should_return_failure_result(self):
+        """测试下载器抛出异常时应该返回失败结果而不是中断流水线"""
+        # Arrange
+        downloader = Mock()
+        downloader.download_bars.side_effect = RuntimeError("boom")
+        pipeline = DownloadPipeline({DataSource.YFINANCE: downloader}, max_workers=1)
+
+        # Act
+        results = list(pipeline.run(make_tasks(["AAPL"])))
+
+        # Assert
+        assert results[0].success is False
+        assert "boom" in results[0].error_msg
+
+
+class TestRateLimiter:
+    """RateLimiter测试类"""
+
+    def test_acquire_without_tokens_should_wait_for_refill(self):
+        """测试令牌耗尽时应该等待令牌补充"""
+        # Arrange
+        with patch("vnpy.dataloader.pipeline.monotonic", side_effect=[0.0, 0.0, 0.0, 0.5]), \
+                patch("vnpy.dataloader.pipeline.sleep") as mock_sleep:
+            limiter = RateLimiter(rate=2)
+
+            # Act
+            limiter.acquire()
+            limiter.acquire()
+
+        # Assert
+        mock_sleep.assert_called_once_with(pytest.approx(0.5))
+
+
+class TestStockDataManagerConcurrent:
+    """StockDataManager并发下载测试类"""
+
+    def test_download_multiple_stocks_with_workers_should_use_pipeline(self, stub_downloader):
+        """测试多线程模式应该下载全部股票"""
+        # Arrange
+        manager = StockDataManager()
+        manager.downloaders[DataSource.YFINANCE] = stub_downloader
+        manager.set_source_limit(DataSource.YFINANCE, concurrency=2)
+
+        # Act
+        results = manager.download_multiple_stocks(
+            ["AAPL", "MSFT", "GOOG"],
+            exchange=Exchange.NASDAQ,
+            save_to_db=False,
+            max_workers=4
+        )
+
+        # Assert
+        assert len(results) == 3
+        assert len(stub_downloader.requests) == 3
+
+    def test_download_multiple_stocks_with_batch_should_use_download_bars_batch(self, stub_downloader):
+        """测试合并请求模式应该按batch_size分组调用download_bars_batch"""
+        # Arrange
+        manager = StockDataManager()
+        stub_downloader.batch_size = 2
+        manager.downloaders[DataSource.YFINANCE] = stub_downloader
+
+        # Act
+        with patch.object(stub_downloader, "download_bars_batch", wraps=stub_downloader.download_bars_batch) as mock_batch:
+            results = manager.download_multiple_stocks(
+                ["AAPL", "MSFT", "GOOG"],
+                exchange=Exchange.NASDAQ,
+                save_to_db=False,
+                batch=True
+            )
+
+        # Assert
+        assert [r.request.symbol for r in results] == ["AAPL", "MSFT", "GOOG"]
+        assert mock_batch.call_count == 2
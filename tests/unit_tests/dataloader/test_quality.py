@@ -0,0 +1,206 @@
+"""
+数据质量检查单元测试
+
+测试去重排序、价格和OHLC检查、缺失交易日检测、拆股复权以及保存前的清洗。
+"""
+
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.dataloader.base import BarColumns, DownloadRequest, DownloadResult
+from vnpy.dataloader.quality import BarQualityChecker
+from vnpy.dataloader.manager import StockDataManager
+
+
+def make_columns(days: list, close: list = None, **prices) -> BarColumns:
+    """创建2023年1月指定日期的日线列数据"""
+    n = len(days)
+    close = np.array(close if close is not None else [100.0] * n, dtype=float)
+
+    return BarColumns(
+        symbol="AAPL",
+        exchange=Exchange.NASDAQ,
+        interval=Interval.DAILY,
+        gateway_name="stub",
+        datetime=np.array([datetime(2023, 1, d) for d in days], dtype="datetime64[us]"),
+        open=np.array(prices.get("open", close), dtype=float),
+        high=np.array(prices.get("high", close + 1), dtype=float),
+        low=np.array(prices.get("low", close - 1), dtype=float),
+        close=close,
+        volume=np.array(prices.get("volume", [1000.0] * n), dtype=float),
+        turnover=np.zeros(n),
+        open_interest=np.zeros(n)
+    )
+
+
+class TestBarQualityChecker:
+    """BarQualityChecker测试类"""
+
+    def test_check_unsorted_duplicates_should_sort_and_keep_last(self):
+        """测试倒序和重复时间应该被排序去重，重复时保留后出现的数据"""
+        # Arrange
+        checker = BarQualityChecker(check_gaps=False)
+        columns = make_columns([3, 2, 2], close=[103.0, 101.0, 102.0])
+
+        # Act
+        clean, report = checker.check(columns)
+
+        # Assert
+        assert clean.close.tolist() == [102.0, 103.0]
+        assert report.unsorted_count == 1
+        assert report.duplicate_count == 1
+        assert report.clean_count == 2
+
+    def test_check_invalid_prices_should_drop_rows(self):
+        """测试价格为0或缺失、成交量为负数的数据应该被删除"""
+        # Arrange
+        checker = BarQualityChecker(check_gaps=False)
+        columns = make_columns([2, 3, 4, 5], close=[100.0, 0.0, np.nan, 100.0], volume=[1.0, 1.0, 1.0, -1.0])
+
+        # Act
+        clean, report = checker.check(columns)
+
+        # Assert
+        assert len(clean) == 1
+        assert report.invalid_price_count == 2
+        assert report.invalid_volume_count == 1
+        assert report.dropped_count == 3
+
+    def test_check_ohlc_error_should_fix_high_low(self):
+        """测试最高价低于收盘价时应该修正最高价和最低价"""
+        # Arrange
+        checker = BarQualityChecker(check_gaps=False)
+        columns = make_columns([2], close=[100.0], open=[98.0], high=[99.0], low=[99.5])
+
+        # Act
+        clean, report = checker.check(columns)
+
+        # Assert
+        assert report.ohlc_error_count == 1
+        assert clean.high.tolist() == [100.0]
+        assert clean.low.tolist() == [98.0]
+
+    def test_check_ohlc_error_without_fix_should_drop(self):
+        """测试不修正时OHLC矛盾的数据应该被删除"""
+        # Arrange
+        checker = BarQualityChecker(fix_ohlc=False, check_gaps=False)
+        columns = make_columns([2, 3], close=[100.0, 100.0], high=[99.0, 101.0])
+
+        # Act
+        clean, report = checker.check(columns)
+
+        # Assert
+        assert len(clean) == 1
+        assert report.ohlc_error_count == 1
+
+    def test_check_gaps_with_calendar_should_report_missing_days(self):
+        """测试应该对照交易日历报告没有数据的交易日，最后一根K线之后不计为缺失"""
+        # Arrange
+        calendar = [date(2023, 1, d) for d in (3, 4, 5, 6, 9, 10)]
+        checker = BarQualityChecker(calendar=calendar)
+        columns = make_columns([4, 6])
+
+        # Act
+        _, report = checker.check(columns, start=datetime(2023, 1, 1))
+
+        # Assert
+        assert report.missing_count == 2
+        assert report.missing_dates == [date(2023, 1, 3), date(2023, 1, 5)]
+
+    def test_check_gaps_without_calendar_should_use_weekdays(self):
+        """测试没有交易日历时应该按周一到周五检测缺失"""
+        # Arrange
+        checker = BarQualityChecker()
+        columns = make_columns([6, 10])
+
+        # Act
+        _, report = checker.check(columns)
+
+        # Assert
+        assert report.missing_dates == [date(2023, 1, 9)]
+
+    def test_check_splits_should_adjust_prices_before_ex_date(self):
+        """测试除权日之前的价格应该除以拆股比例，成交量乘以拆股比例"""
+        # Arrange
+        checker = BarQualityChecker(check_gaps=False)
+        checker.set_splits("AAPL.NASDAQ", {date(2023, 1, 4): 2.0, date(2023, 1, 6): 2.0})
+        columns = make_columns([3, 4, 5, 6], close=[400.0, 200.0, 200.0, 100.0])
+
+        # Act
+        clean, report = checker.check(columns)
+
+        # Assert
+        assert clean.close.tolist() == [100.0, 100.0, 100.0, 100.0]
+        assert clean.volume.tolist() == [4000.0, 2000.0, 2000.0, 1000.0]
+        assert report.split_count == 3
+
+    def test_check_result_all_invalid_should_fail(self):
+        """测试没有有效数据时应该返回失败结果"""
+        # Arrange
+        checker = BarQualityChecker()
+        request = DownloadRequest("AAPL", Exchange.NASDAQ)
+        result = DownloadResult(request=request, bars=None, success=True, columns=make_columns([2], close=[0.0]))
+
+        # Act
+        checked = checker.check_result(result)
+
+        # Assert
+        assert not checked.success
+        assert "没有有效数据" in checked.error_msg
+
+    def test_check_result_clean_data_should_return_original(self):
+        """测试没有发现问题时应该返回原下载结果"""
+        # Arrange
+        checker = BarQualityChecker()
+        request = DownloadRequest("AAPL", Exchange.NASDAQ)
+        result = DownloadResult(request=request, bars=None, success=True, columns=make_columns([2, 3]))
+
+        # Act
+        checked = checker.check_result(result)
+
+        # Assert
+        assert checked is result
+        assert checker.get_report("AAPL.NASDAQ").is_clean()
+
+    def test_reports_should_accumulate_per_symbol(self):
+        """测试同一只股票多次检查的报告应该累加"""
+        # Arrange
+        checker = BarQualityChecker(check_gaps=False)
+
+        # Act
+        checker.check(make_columns([2, 2]))
+        checker.check(make_columns([3, 3]))
+
+        # Assert
+        report = checker.get_report("AAPL.NASDAQ")
+        assert report.total_count == 4
+        assert report.duplicate_count == 2
+        assert len(checker.get_reports()) == 1
+
+
+class TestManagerQualityCheck:
+    """StockDataManager数据质量检查测试类"""
+
+    def test_save_download_result_should_save_clean_bars(self):
+        """测试设置检查器后应该只保存清洗后的数据"""
+        # Arrange
+        manager = StockDataManager()
+        manager.database = Mock()
+        manager.database.save_bar_frame.return_value = True
+        manager.set_quality_checker(BarQualityChecker(check_gaps=False))
+
+        request = DownloadRequest("AAPL", Exchange.NASDAQ)
+        result = DownloadResult(
+            request=request, bars=None, success=True, columns=make_columns([2, 3], close=[100.0, 0.0])
+        )
+
+        # Act
+        success = manager.save_download_result(result)
+
+        # Assert
+        assert success
+        df = manager.database.save_bar_frame.call_args[0][0]
+        assert df["close"].to_list() == [100.0]
@@ -0,0 +1,234 @@
+"""
+下载容错单元测试
+
+使用注入故障的模拟下载器测试重试策略、熔断器、备用数据源切换以及StockDataManager的容错配置。
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.dataloader.base import DownloadRequest, DownloadResult, DataSource
+from vnpy.dataloader.manager import StockDataManager
+from vnpy.dataloader.resilience import CircuitBreaker, ResilientDownloader, RetryPolicy
+
+from .conftest import StubStockDownloader
+
+
+class FlakyStockDownloader(StubStockDownloader):
+    """前failures次请求返回临时性错误的模拟下载器"""
+
+    def __init__(self, failures: int = 0, raise_error: bool = False):
+        super().__init__()
+        self.failures = failures
+        self.raise_error = raise_error
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        if self.failures:
+            self.failures -= 1
+            self.requests.append(request)
+
+            if self.raise_error:
+                raise ConnectionError("connection reset")
+            return DownloadResult(request=request, bars=[], success=False, error_msg="429 Too Many Requests", retryable=True)
+
+        return super().download_bars(request)
+
+
+REQUEST = DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 1, 1))
+
+
+class TestRetryPolicy:
+    """RetryPolicy测试类"""
+
+    @pytest.mark.parametrize("attempt,expected", [(1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)])
+    def test_get_delay_without_jitter_should_grow_exponentially(self, attempt, expected):
+        """测试没有抖动时等待时间应该按倍数增长且不超过上限"""
+        # Arrange
+        policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=0)
+
+        # Act & Assert
+        assert policy.get_delay(attempt) == expected
+
+    def test_get_delay_with_jitter_should_stay_in_range(self):
+        """测试抖动后的等待时间应该在设定范围内"""
+        # Arrange
+        policy = RetryPolicy(base_delay=2.0, jitter=0.5)
+
+        # Act
+        delays = [policy.get_delay(1) for _ in range(100)]
+
+        # Assert
+        assert all(1.0 <= delay <= 2.0 for delay in delays)
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker测试类"""
+
+    def test_record_failure_reaching_threshold_should_open(self):
+        """测试连续失败达到阈值时应该熔断"""
+        # Arrange
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        # Act
+        breaker.record_failure()
+        breaker.record_failure()
+
+        # Assert
+        assert breaker.is_open() is True
+        assert breaker.allow_request() is False
+
+    def test_allow_request_after_timeout_should_let_one_probe_through(self):
+        """测试冷却时间后应该只放行一个试探请求"""
+        # Arrange
+        with patch("vnpy.dataloader.resilience.monotonic", side_effect=[0.0, 61.0, 61.0]):
+            breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+            breaker.record_failure()
+
+            # Act
+            first = breaker.allow_request()
+            second = breaker.allow_request()
+
+        # Assert
+        assert first is True
+        assert second is False
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_record_success_after_probe_should_close(self):
+        """测试试探请求成功后应该恢复正常"""
+        # Arrange
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.allow_request()
+
+        # Act
+        breaker.record_success()
+
+        # Assert
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+
+@patch("vnpy.dataloader.resilience.sleep")
+class TestResilientDownloader:
+    """ResilientDownloader测试类"""
+
+    def test_download_bars_with_transient_failures_should_retry(self, mock_sleep):
+        """测试临时性错误应该按重试策略重试直到成功"""
+        # Arrange
+        flaky = FlakyStockDownloader(failures=2)
+        downloader = ResilientDownloader(flaky, RetryPolicy(max_attempts=3, jitter=0))
+
+        # Act
+        result = downloader.download_bars(REQUEST)
+
+        # Assert
+        assert result.success is True
+        assert len(flaky.requests) == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
+        assert downloader.get_stats()["retry_count"] == 2
+
+    def test_download_bars_with_exception_should_retry(self, mock_sleep):
+        """测试下载器抛出的异常应该视为临时性错误重试"""
+        # Arrange
+        flaky = FlakyStockDownloader(failures=1, raise_error=True)
+        downloader = ResilientDownloader(flaky)
+
+        # Act
+        result = downloader.download_bars(REQUEST)
+
+        # Assert
+        assert result.success is True
+        assert mock_sleep.call_count == 1
+
+    def test_download_bars_with_permanent_failure_should_not_retry(self, mock_sleep):
+        """测试非临时性错误不应该重试"""
+        # Arrange
+        stub = StubStockDownloader(fail_symbols=("AAPL",))
+        downloader = ResilientDownloader(stub)
+
+        # Act
+        result = downloader.download_bars(REQUEST)
+
+        # Assert
+        assert result.success is False
+        assert len(stub.requests) == 1
+        mock_sleep.assert_not_called()
+
+    def test_download_bars_with_open_breaker_should_skip_source(self, mock_sleep):
+        """测试熔断后应该不再请求数据源"""
+        # Arrange
+        flaky = FlakyStockDownloader(failures=10)
+        downloader = ResilientDownloader(flaky, RetryPolicy(max_attempts=5), CircuitBreaker(failure_threshold=2))
+
+        # Act
+        first = downloader.download_bars(REQUEST)
+        second = downloader.download_bars(REQUEST)
+
+        # Assert
+        assert len(flaky.requests) == 2
+        assert first.error_msg == "429 Too Many Requests"
+        assert "熔断" in second.error_msg
+        assert downloader.get_stats()["trip_count"] == 1
+
+    def test_download_bars_with_fallback_should_fail_over(self, mock_sleep):
+        """测试重试耗尽后应该切换到备用数据源"""
+        # Arrange
+        fallback = StubStockDownloader()
+        downloader = ResilientDownloader(FlakyStockDownloader(failures=10), RetryPolicy(max_attempts=2), fallback=fallback)
+
+        # Act
+        result = downloader.download_bars(REQUEST)
+
+        # Assert
+        assert result.success is True
+        assert fallback.requests == [REQUEST]
+        assert downloader.get_stats()["fallback_count"] == 1
+
+    def test_download_bars_batch_should_retry_failed_symbols(self, mock_sleep):
+        """测试合并请求中临时性失败的股票应该逐只重试"""
+        # Arrange
+        flaky = FlakyStockDownloader(failures=1)
+        downloader = ResilientDownloader(flaky)
+        requests = [REQUEST, DownloadRequest("MSFT", Exchange.NASDAQ, datetime(2023, 1, 1))]
+
+        # Act
+        results = downloader.download_bars_batch(requests)
+
+        # Assert
+        assert all(r.success for r in results)
+        assert len(flaky.requests) == 3
+
+
+class TestStockDataManagerResilience:
+    """StockDataManager容错配置测试类"""
+
+    def test_enable_resilience_with_fallback_should_wrap_downloader(self):
+        """测试启用容错后应该包装下载器并使用备用数据源"""
+        # Arrange
+        manager = StockDataManager()
+        manager.downloaders[DataSource.YFINANCE] = FlakyStockDownloader(failures=10)
+        manager.downloaders[DataSource.AKSHARE] = StubStockDownloader()
+
+        # Act
+        downloader = manager.enable_resilience(DataSource.YFINANCE, RetryPolicy(max_attempts=1), fallback=DataSource.AKSHARE)
+        result = manager.download_stock_data("AAPL", exchange=Exchange.NASDAQ, save_to_db=False)
+
+        # Assert
+        assert manager.downloaders[DataSource.YFINANCE] is downloader
+        assert result.success is True
+
+    def test_disable_resilience_should_restore_downloader(self):
+        """测试关闭容错后应该恢复原下载器"""
+        # Arrange
+        manager = StockDataManager()
+        original = manager.downloaders[DataSource.YFINANCE]
+        manager.enable_resilience(DataSource.YFINANCE)
+
+        # Act
+        manager.disable_resilience(DataSource.YFINANCE)
+
+        # Assert
+        assert manager.downloaders[DataSource.YFINANCE] is original
@@ -0,0 +1,120 @@
+"""
+StalenessScheduler单元测试
+
+测试按数据陈旧程度和重要性排序的调度队列，以及时间和数量预算。
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BarOverview
+from vnpy.dataloader.base import DataSource
+from vnpy.dataloader.manager import StockDataManager
+from vnpy.dataloader.scheduler import StalenessScheduler
+
+from .conftest import StubStockDownloader
+
+
+NOW = datetime(2024, 1, 31)
+UNIVERSE = ["AAPL.NASDAQ", "MSFT.NASDAQ", "IBM.NYSE", "NEW.NASDAQ"]
+
+
+def make_overview(symbol: str, exchange: Exchange, end: datetime) -> BarOverview:
+    """创建K线概览"""
+    return BarOverview(symbol, exchange, Interval.DAILY, 10, datetime(2023, 1, 1), end)
+
+
+class TestStalenessScheduler:
+    """StalenessScheduler测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.downloader = StubStockDownloader(bar_count=1)
+        self.manager = StockDataManager()
+        self.manager.downloaders[DataSource.YFINANCE] = self.downloader
+        self.manager.database = Mock()
+        self.manager.database.get_bar_overview.return_value = [
+            make_overview("AAPL", Exchange.NASDAQ, datetime(2024, 1, 30)),
+            make_overview("MSFT", Exchange.NASDAQ, datetime(2024, 1, 20)),
+            make_overview("IBM", Exchange.NYSE, datetime(2024, 1, 10)),
+        ]
+        self.manager.database.save_bar_frame.return_value = True
+        self.scheduler = StalenessScheduler(self.manager)
+
+    def test_build_queue_should_order_by_staleness(self):
+        """测试没有数据的股票最优先，其余按陈旧程度排序"""
+        # Act
+        items = list(self.scheduler.iter_schedule(UNIVERSE, NOW))
+
+        # Assert
+        assert [item.vt_symbol for item in items] == ["NEW.NASDAQ", "IBM.NYSE", "MSFT.NASDAQ", "AAPL.NASDAQ"]
+        assert items[1].priority == 21 * 24 * 3600
+
+    def test_build_queue_with_importance_should_boost_priority(self):
+        """测试重要性权重应该提高较新数据的优先级"""
+        # Arrange
+        self.scheduler.set_importance("MSFT.NASDAQ", 2)
+
+        # Act
+        items = list(self.scheduler.iter_schedule(UNIVERSE, NOW))
+
+        # Assert
+        assert [item.vt_symbol for item in items][1:3] == ["MSFT.NASDAQ", "IBM.NYSE"]
+
+    def test_add_index_importance_should_use_latest_components(self):
+        """测试应该为指数最新一期成分股增加权重"""
+        # Arrange
+        self.manager.lab = Mock()
+        self.manager.lab.load_component_data.return_value = {
+            datetime(2024, 1, 1): ["AAPL.NASDAQ", "IBM.NYSE"],
+            datetime(2024, 1, 15): ["AAPL.NASDAQ", "MSFT.NASDAQ"],
+        }
+
+        # Act
+        self.scheduler.add_index_importance("SPX", 1, datetime(2024, 1, 1), NOW)
+
+        # Assert
+        assert self.scheduler.importances == {"AAPL.NASDAQ": 1, "MSFT.NASDAQ": 1}
+
+    def test_run_with_quota_should_download_most_stale_first(self):
+        """测试数量预算应该只下载优先级最高的股票"""
+        # Act
+        results = self.scheduler.run(UNIVERSE, quota=2, max_workers=1)
+
+        # Assert
+        assert [r.request.vt_symbol for r in results] == ["NEW.NASDAQ", "IBM.NYSE"]
+        assert [r.vt_symbol for r in self.downloader.requests] == ["NEW.NASDAQ", "IBM.NYSE"]
+
+    def test_run_with_exhausted_time_budget_should_stop_early(self):
+        """测试时间预算用尽后应该停止下载"""
+        # Act
+        with patch("vnpy.dataloader.scheduler.monotonic", side_effect=[0.0, 100.0]):
+            results = self.scheduler.run(UNIVERSE, time_budget=10, max_workers=1)
+
+        # Assert
+        assert len(results) == 1
+
+    def test_run_to_lab_should_read_and_write_lab(self):
+        """测试下载到AlphaLab时应该从AlphaLab判断陈旧程度并写入AlphaLab，不读取数据库概览"""
+        # Arrange
+        self.manager.lab = Mock()
+        scheduler = StalenessScheduler(self.manager, to_lab=True)
+        ends = {"AAPL.NASDAQ": datetime(2024, 1, 10), "IBM.NYSE": datetime(2024, 1, 30)}
+
+        def get_lab_range(lab, vt_symbol, interval):
+            return (datetime(2023, 1, 1), ends[vt_symbol]) if vt_symbol in ends else None
+
+        # Act
+        with patch("vnpy.dataloader.scheduler.get_lab_range", side_effect=get_lab_range), \
+                patch.object(self.manager, "download_to_lab", return_value=[]) as download_to_lab:
+            scheduler.run(UNIVERSE, max_workers=2)
+
+        # Assert
+        self.manager.database.get_bar_overview.assert_not_called()
+        calls = [(c.args[0], c.kwargs["exchange"]) for c in download_to_lab.call_args_list]
+        assert calls == [
+            (["MSFT", "NEW"], Exchange.NASDAQ),
+            (["AAPL"], Exchange.NASDAQ),
+            (["IBM"], Exchange.NYSE),
+        ]
@@ -0,0 +1,140 @@
+"""
+BarWriteBuffer单元测试
+
+测试数据库写入缓冲的批量写入条件、stream模式选择以及StockDataManager的缓冲写入。
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from vnpy.trader.constant import Exchange
+from vnpy.dataloader.base import DownloadRequest, DataSource
+from vnpy.dataloader.manager import StockDataManager
+from vnpy.dataloader.writer import BarWriteBuffer
+
+from .conftest import StubStockDownloader
+
+
+def download(symbol: str, start: datetime, bar_count: int = 3):
+    """使用模拟下载器生成下载结果"""
+    return StubStockDownloader(bar_count).download_bars(DownloadRequest(symbol, Exchange.NASDAQ, start))
+
+
+class TestBarWriteBuffer:
+    """BarWriteBuffer测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.database = Mock()
+        self.database.save_bar_frame.return_value = True
+
+    def test_add_below_max_rows_should_not_write(self):
+        """测试缓冲数据量未达到上限时不应该写入数据库"""
+        # Arrange
+        buffer = BarWriteBuffer(self.database, max_rows=10, max_delay=0)
+
+        # Act
+        buffer.add(download("AAPL", datetime(2023, 1, 1)))
+
+        # Assert
+        self.database.save_bar_frame.assert_not_called()
+        assert buffer.buffer_rows == 3
+
+    def test_add_reaching_max_rows_should_write_each_symbol_once(self):
+        """测试数据量达到上限时应该按合约分别写入一次"""
+        # Arrange
+        buffer = BarWriteBuffer(self.database, max_rows=9, max_delay=0)
+
+        # Act
+        buffer.add(download("AAPL", datetime(2023, 1, 1)))
+        buffer.add(download("MSFT", datetime(2023, 1, 1)))
+        buffer.add(download("AAPL", datetime(2023, 1, 4)))
+
+        # Assert
+        assert self.database.save_bar_frame.call_count == 2
+        df, symbol, _, _, stream = self.database.save_bar_frame.call_args_list[0].args
+        assert symbol == "AAPL"
+        assert df["datetime"].dt.day().to_list() == [1, 2, 3, 4, 5, 6]
+        assert stream is False
+        assert buffer.get_stats()["write_count"] == 9
+
+    def test_add_after_max_delay_should_write(self):
+        """测试最早缓冲的数据超过等待时间时应该写入数据库"""
+        # Arrange
+        buffer = BarWriteBuffer(self.database, max_rows=100, max_delay=5)
+
+        # Act
+        with patch("vnpy.dataloader.writer.perf_counter", side_effect=[0.0, 1.0, 6.0, 6.0, 6.0, 6.0]):
+            buffer.add(download("AAPL", datetime(2023, 1, 1)))
+            buffer.add(download("AAPL", datetime(2023, 1, 4)))
+
+        # Assert
+        self.database.save_bar_frame.assert_called_once()
+
+    def test_flush_with_appended_data_should_use_stream(self):
+        """测试本次已写入数据之后追加的数据应该使用stream模式"""
+        # Arrange
+        buffer = BarWriteBuffer(self.database, max_rows=100, max_delay=0)
+
+        # Act
+        buffer.add(download("AAPL", datetime(2023, 1, 1)))
+        buffer.flush()
+        buffer.add(download("AAPL", datetime(2023, 1, 4)))
+        buffer.flush()
+        buffer.add(download("AAPL", datetime(2022, 12, 1)))
+        buffer.flush()
+
+        # Assert
+        streams = [call.args[4] for call in self.database.save_bar_frame.call_args_list]
+        assert streams == [False, True, False]
+
+    def test_flush_with_database_failure_should_count_failed_rows(self):
+        """测试数据库写入失败时应该统计失败数据量"""
+        # Arrange
+        self.database.save_bar_frame.side_effect = RuntimeError("locked")
+        buffer = BarWriteBuffer(self.database, max_rows=100, max_delay=0)
+        buffer.add(download("AAPL", datetime(2023, 1, 1)))
+
+        # Act
+        count = buffer.flush()
+
+        # Assert
+        assert count == 0
+        assert buffer.get_stats()["fail_count"] == 3
+
+
+class TestStockDataManagerBufferedWrites:
+    """StockDataManager缓冲写入测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.manager = StockDataManager()
+        self.manager.downloaders[DataSource.YFINANCE] = StubStockDownloader()
+        self.manager.database = Mock()
+        self.manager.database.save_bar_frame.return_value = True
+
+    def test_download_multiple_stocks_should_write_in_one_batch(self):
+        """测试批量下载应该在结束时一次性写入所有股票"""
+        # Act
+        self.manager.download_multiple_stocks(["AAPL", "MSFT", "GOOG"], exchange=Exchange.NASDAQ)
+
+        # Assert
+        assert self.manager.database.save_bar_frame.call_count == 3
+        assert self.manager.write_buffer is None
+
+    def test_iter_download_multiple_stocks_should_flush_after_pipeline(self):
+        """测试并发下载结束后缓冲中的数据应该全部写入"""
+        # Act
+        results = list(self.manager.iter_download_multiple_stocks(["AAPL", "MSFT"], exchange=Exchange.NASDAQ, max_workers=2))
+
+        # Assert
+        assert len(results) == 2
+        assert self.manager.database.save_bar_frame.call_count == 2
+
+    def test_download_stock_data_outside_batch_should_write_immediately(self):
+        """测试单只股票下载不应该使用写入缓冲"""
+        # Act
+        self.manager.download_stock_data("AAPL", exchange=Exchange.NASDAQ)
+
+        # Assert
+        self.manager.database.save_bar_data.assert_called_once()
@@ -450,4 +450,79 @@ class TestYfinanceExceptionScenarios:
         
         # Assert
         assert result.success is False
-        assert "Invalid symbol format" in result.error_msg 
\ No newline at end of file
+        assert "Invalid symbol format" in result.error_msg 
+
+
+class TestYfinanceBatchDownload:
+    """YfinanceStockDownloader批量下载测试类"""
+
+    def setup_method(self):
+        """每个测试方法执行前的准备工作"""
+        self.downloader = YfinanceStockDownloader()
+        self.downloader.yf = Mock()
+
+    def make_batch_frame(self, symbols, mock_yfinance_data):
+        """创建yf.download按股票分组返回的多层列DataFrame"""
+        return pd.concat({symbol: mock_yfinance_data for symbol in symbols}, axis=1)
+
+    def test_download_bars_batch_should_split_result_per_symbol(self, sample_download_request, mock_yfinance_data):
+        """测试合并请求的结果应该按股票代码拆分"""
+        # Arrange
+        self.downloader.yf.download.return_value = self.make_batch_frame(["AAPL", "MSFT"], mock_yfinance_data)
+        requests = [
+            sample_download_request,
+            DownloadRequest("MSFT", Exchange.NASDAQ, sample_download_request.start_date, sample_download_request.end_date),
+            DownloadRequest("GOOG", Exchange.NASDAQ, sample_download_request.start_date, sample_download_request.end_date),
+        ]
+
+        # Act
+        results = self.downloader.download_bars_batch(requests)
+
+        # Assert
+        self.downloader.yf.download.assert_called_once()
+        assert self.downloader.yf.download.call_args.kwargs["tickers"] == ["AAPL", "MSFT", "GOOG"]
+        assert [r.request.symbol for r in results] == ["AAPL", "MSFT", "GOOG"]
+        assert [r.total_count for r in results] == [3, 3, 0]
+        assert results[1].bars[0].symbol == "MSFT"
+        assert results[2].success is False
+
+    def test_download_bars_batch_should_group_by_batch_size_and_range(self, mock_yfinance_data):
+        """测试应该按时间范围和batch_size分组请求"""
+        # Arrange
+        self.downloader.batch_size = 2
+        self.downloader.yf.download.return_value = pd.DataFrame()
+        requests = [DownloadRequest(f"SYM{i}", Exchange.NASDAQ, datetime(2023, 1, 1)) for i in range(3)]
+        requests.append(DownloadRequest("AAPL", Exchange.NASDAQ, datetime(2023, 6, 1)))
+
+        # Act
+        results = self.downloader.download_bars_batch(requests)
+
+        # Assert
+        assert self.downloader.yf.download.call_count == 3
+        assert len(results) == 4
+
+    def test_download_bars_batch_with_exception_should_fail_every_request(self, sample_download_request):
+        """测试合并请求异常时组内所有请求都应该返回失败结果"""
+        # Arrange
+        self.downloader.yf.download.side_effect = Exception("Network error")
+        requests = [sample_download_request, DownloadRequest("MSFT", Exchange.NASDAQ, sample_download_request.start_date, sample_download_request.end_date)]
+
+        # Act
+        results = self.downloader.download_bars_batch(requests)
+
+        # Assert
+        assert all(not r.success for r in results)
+        assert "Network error" in results[1].error_msg
+
+    def test_download_bars_batch_with_invalid_request_should_not_be_batched(self, sample_download_request):
+        """测试校验失败的请求应该单独返回失败结果"""
+        # Arrange
+        self.downloader.yf.download.return_value = pd.DataFrame()
+        request = DownloadRequest("TEST", Exchange.SSE)
+
+        # Act
+        results = self.downloader.download_bars_batch([request])
+
+        # Assert
+        self.downloader.yf.download.assert_not_called()
+        assert "不支持的交易所" in results[0].error_msg
@@ -0,0 +1,5 @@
+"""
+event模块单元测试包
+
+包含事件引擎的单元测试。
+"""
@@ -0,0 +1,402 @@
+"""
+事件引擎单元测试
+
+测试单线程、分片和批量处理模式下的事件分发与顺序保证，以及运行统计、合并订阅和有界队列。
+"""
+
+from queue import Empty
+from threading import Event as Signal, Lock, Thread, current_thread
+from time import sleep
+from types import SimpleNamespace
+
+import pytest
+
+from vnpy.event import EVENT_STATS, ConflatedSubscription, Event, EventEngine, OverflowPolicy, get_vt_symbol_key
+from vnpy.event.engine import BoundedQueue
+from vnpy.event.stats import Histogram
+
+
+class EventCollector:
+    """记录收到的事件和处理线程，收到指定数量后通知"""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.events = []
+        self.threads = {}
+        self.lock = Lock()
+        self.finished = Signal()
+
+    def __call__(self, event: Event):
+        with self.lock:
+            self.events.append(event)
+            self.threads.setdefault(event.type, set()).add(current_thread().name)
+            if len(self.events) >= self.count:
+                self.finished.set()
+
+
+@pytest.fixture
+def run_engine():
+    """启动事件引擎，测试结束后停止"""
+    engines = []
+
+    def start(engine: EventEngine) -> EventEngine:
+        engine.start()
+        engines.append(engine)
+        return engine
+
+    yield start
+
+    for engine in engines:
+        engine.stop()
+
+
+class TestEventEngine:
+    """EventEngine测试类"""
+
+    def test_put_should_dispatch_to_type_and_general_handlers(self, run_engine):
+        """测试事件应该先分发给对应类型的处理函数，再分发给通用处理函数"""
+        # Arrange
+        engine = EventEngine()
+        calls = []
+        finished = Signal()
+
+        engine.register("eTest", lambda event: calls.append(("type", event.data)))
+        engine.register_general(lambda event: (calls.append(("general", event.data)), finished.set()))
+        run_engine(engine)
+
+        # Act
+        engine.put(Event("eTest", 1))
+        finished.wait(5)
+
+        # Assert
+        assert calls == [("type", 1), ("general", 1)]
+
+    def test_sharded_engine_should_keep_order_within_key(self, run_engine):
+        """测试分片模式下同一合约的事件应该在同一线程中按顺序处理"""
+        # Arrange
+        engine = EventEngine(shard_count=4, shard_key=get_vt_symbol_key)
+        collector = EventCollector(400)
+        engine.register("eTick.", collector)
+        run_engine(engine)
+
+        # Act
+        for i in range(100):
+            for vt_symbol in ["A.SSE", "B.SSE", "C.SSE", "D.SSE"]:
+                engine.put(Event("eTick.", SimpleNamespace(vt_symbol=vt_symbol, seq=i)))
+        collector.finished.wait(5)
+
+        # Assert
+        for vt_symbol in ["A.SSE", "B.SSE", "C.SSE", "D.SSE"]:
+            seqs = [e.data.seq for e in collector.events if e.data.vt_symbol == vt_symbol]
+            assert seqs == list(range(100))
+
+    def test_sharded_engine_should_route_by_type_by_default(self, run_engine):
+        """测试分片模式默认按事件类型路由，同一类型只在一个线程中处理"""
+        # Arrange
+        engine = EventEngine(shard_count=3)
+        collector = EventCollector(60)
+        for type in ["eA", "eB", "eC"]:
+            engine.register(type, collector)
+        run_engine(engine)
+
+        # Act
+        for i in range(20):
+            for type in ["eA", "eB", "eC"]:
+                engine.put(Event(type, i))
+        collector.finished.wait(5)
+
+        # Assert
+        assert all(len(names) == 1 for names in collector.threads.values())
+        assert [e.data for e in collector.events if e.type == "eB"] == list(range(20))
+
+    def test_batch_engine_should_process_all_events_in_order(self, run_engine):
+        """测试批量处理模式应该按顺序处理所有事件，包括等待后新放入的事件"""
+        # Arrange
+        engine = EventEngine(batch_size=16)
+        collector = EventCollector(1001)
+        engine.register("eTest", collector)
+        run_engine(engine)
+
+        # Act
+        for i in range(1000):
+            engine.put(Event("eTest", i))
+        engine.put(Event("eTest", 1000))
+        collector.finished.wait(5)
+
+        # Assert
+        assert [e.data for e in collector.events] == list(range(1001))
+
+    def test_handler_table_should_update_on_register_and_unregister(self):
+        """测试处理函数快照应该在注册和注销时重建，通用处理函数排在最后"""
+        # Arrange
+        engine = EventEngine()
+        calls = []
+
+        def type_handler(event):
+            calls.append("type")
+
+        def general_handler(event):
+            calls.append("general")
+
+        # Act
+        engine.register("eTest", type_handler)
+        engine.register_general(general_handler)
+        engine._process(Event("eTest"))
+        engine._process(Event("eOther"))
+
+        engine.unregister("eTest", type_handler)
+        engine.unregister_general(general_handler)
+        engine._process(Event("eTest"))
+
+        # Assert
+        assert calls == ["type", "general", "general"]
+        assert engine._handler_table == {}
+        assert engine._general_table == ()
+
+
+class TestEventStats:
+    """事件引擎运行统计测试类"""
+
+    def test_histogram_should_count_values_into_buckets(self):
+        """测试直方图应该按上界统计数量，超出最大上界的计入最后一个桶"""
+        # Arrange
+        histogram = Histogram((1, 10))
+
+        # Act
+        for value in [0, 1, 5, 20]:
+            histogram.add(value)
+
+        # Assert
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.max == 20
+
+    def test_get_stats_without_instrument_should_be_empty(self):
+        """测试未开启统计时应该返回空字典"""
+        # Assert
+        assert EventEngine().get_stats() == {}
+
+    def test_instrumented_engine_should_record_handler_stats(self, run_engine):
+        """测试开启统计后应该记录各处理函数调用次数、队列深度和事件等待时间"""
+        # Arrange
+        engine = EventEngine(instrument=True, shard_count=2)
+        collector = EventCollector(20)
+
+        def process_a_event(event):
+            pass
+
+        engine.register("eA", process_a_event)
+        engine.register("eA", collector)
+        engine.register("eB", collector)
+        run_engine(engine)
+
+        # Act
+        for _ in range(10):
+            engine.put(Event("eA"))
+            engine.put(Event("eB"))
+        collector.finished.wait(5)
+        sleep(0.1)
+        stats = engine.get_stats()
+
+        # Assert
+        counts = {handler["name"].split(".")[-1]: handler["count"] for handler in stats["handlers"]}
+        assert counts["process_a_event"] == 10
+        assert counts["EventCollector"] == 20
+        assert stats["event_age"]["count"] >= 20
+        assert sum(stats["queue_depth"]["counts"]) == stats["queue_depth"]["count"]
+
+        engine.reset_stats()
+        assert engine.get_stats()["handlers"] == []
+
+    def test_timer_should_put_stats_summary(self, run_engine):
+        """测试应该每隔summary_interval个定时事件推送一次统计汇总事件"""
+        # Arrange
+        engine = EventEngine(instrument=True, summary_interval=1)
+        collector = EventCollector(1)
+        engine.register(EVENT_STATS, collector)
+        run_engine(engine)
+
+        # Act
+        collector.finished.wait(5)
+
+        # Assert
+        assert "handlers" in collector.events[0].data
+
+
+class TestConflatedSubscription:
+    """合并订阅测试类"""
+
+    def test_slow_handler_should_only_see_newest_event_per_key(self):
+        """测试处理函数繁忙时同一键的待处理事件应该被合并，只处理最新事件"""
+        # Arrange
+        received = []
+        release = Signal()
+        started = Signal()
+
+        def handler(event):
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+            received.append((event.data.vt_symbol, event.data.seq))
+
+        subscription = ConflatedSubscription(handler)
+        subscription.start()
+
+        # Act
+        subscription(Event("eTick.", SimpleNamespace(vt_symbol="A.SSE", seq=0)))
+        started.wait(5)
+        for i in range(1, 100):
+            for vt_symbol in ["A.SSE", "B.SSE"]:
+                subscription(Event("eTick.", SimpleNamespace(vt_symbol=vt_symbol, seq=i)))
+        release.set()
+        sleep(0.2)
+        subscription.stop()
+
+        # Assert
+        assert received == [("A.SSE", 0), ("A.SSE", 99), ("B.SSE", 99)]
+        assert subscription.conflated_count == 98 * 2
+
+    def test_register_conflated_should_start_and_stop_with_engine(self, run_engine):
+        """测试合并订阅应该随事件引擎启动，注销后停止处理线程"""
+        # Arrange
+        engine = EventEngine()
+        collector = EventCollector(1)
+        engine.register_conflated("eTick.", collector)
+        run_engine(engine)
+
+        # Act
+        engine.put(Event("eTick.", SimpleNamespace(vt_symbol="A.SSE")))
+        collector.finished.wait(5)
+        subscription = engine._subscriptions[("eTick.", collector)]
+        engine.unregister_conflated("eTick.", collector)
+
+        # Assert
+        assert collector.events[0].data.vt_symbol == "A.SSE"
+        assert not subscription.active
+        assert "eTick." not in engine._handler_table
+
+
+def drain(queue: BoundedQueue) -> list:
+    """取出队列中所有事件的数据"""
+    items = []
+    while True:
+        try:
+            items.append(queue.get(block=False).data)
+        except Empty:
+            return items
+
+
+class TestBoundedQueue:
+    """有界队列和溢出策略测试类"""
+
+    def test_drop_newest_should_discard_incoming_event(self):
+        """测试丢弃最新策略应该丢弃队列满时放入的事件"""
+        # Arrange
+        queue = BoundedQueue(2, {"eA": OverflowPolicy.DROP_NEWEST})
+
+        # Act
+        for i in range(3):
+            queue.put(Event("eA", i))
+
+        # Assert
+        assert drain(queue) == [0, 1]
+        assert queue.dropped == {"eA": 1}
+
+    def test_drop_oldest_should_only_drop_same_type(self):
+        """测试丢弃最旧策略应该丢弃同类型最早的待处理事件，不影响其他类型"""
+        # Arrange
+        queue = BoundedQueue(3, {"eA": OverflowPolicy.DROP_OLDEST})
+
+        # Act
+        queue.put(Event("eB", "b"))
+        queue.put(Event("eA", 0))
+        queue.put(Event("eA", 1))
+        queue.put(Event("eA", 2))
+
+        # Assert
+        assert drain(queue) == ["b", 1, 2]
+        assert queue.dropped == {"eA": 1}
+        assert queue.qsize() == 0
+
+    def test_drop_oldest_should_keep_slots_bounded(self):
+        """测试丢弃最旧策略持续丢弃时不应该累积已丢弃事件的位置"""
+        # Arrange
+        queue = BoundedQueue(100, {"eA": OverflowPolicy.DROP_OLDEST})
+
+        # Act
+        for i in range(100_000):
+            queue.put(Event("eA", i))
+
+        # Assert
+        assert len(queue.slots) <= 2 * queue.max_size
+        assert queue.dropped == {"eA": 99_900}
+        assert drain(queue) == list(range(99_900, 100_000))
+
+    def test_conflate_should_replace_pending_event_in_place(self):
+        """测试合并策略应该用新事件替换同一合约尚未处理的事件，并保持原有位置"""
+        # Arrange
+        queue = BoundedQueue(10, {"eTick.": OverflowPolicy.CONFLATE})
+
+        def tick(vt_symbol, seq):
+            return Event("eTick.", SimpleNamespace(vt_symbol=vt_symbol, seq=seq))
+
+        # Act
+        queue.put(tick("A.SSE", 0))
+        queue.put(tick("B.SSE", 0))
+        queue.put(tick("A.SSE", 1))
+        first = queue.get(block=False).data
+        queue.put(tick("A.SSE", 2))
+
+        # Assert
+        assert (first.vt_symbol, first.seq) == ("A.SSE", 1)
+        assert [(d.vt_symbol, d.seq) for d in drain(queue)] == [("B.SSE", 0), ("A.SSE", 2)]
+        assert queue.conflated == {"eTick.": 1}
+
+    def test_block_should_wait_until_consumer_makes_room(self):
+        """测试阻塞策略应该等待消费者取出事件后再放入，并记录阻塞次数"""
+        # Arrange
+        queue = BoundedQueue(1, {})
+        queue.put(Event("eA", 0))
+        producer = Thread(target=queue.put, args=(Event("eA", 1),))
+
+        # Act
+        producer.start()
+        sleep(0.1)
+        blocked = producer.is_alive()
+        first = queue.get(timeout=1).data
+        producer.join(1)
+
+        # Assert
+        assert blocked
+        assert first == 0
+        assert drain(queue) == [1]
+        assert queue.blocked == {"eA": 1}
+
+    def test_get_should_raise_empty_after_timeout(self):
+        """测试队列为空时应该在超时后抛出Empty"""
+        # Assert
+        with pytest.raises(Empty):
+            BoundedQueue(1, {}).get(timeout=0.01)
+
+    def test_engine_dispatch_thread_should_not_block_on_own_queue(self, run_engine):
+        """测试处理函数向已满的队列放入事件时不应该阻塞事件引擎"""
+        # Arrange
+        engine = EventEngine(max_size=1)
+        collector = EventCollector(3)
+
+        def process_a_event(event):
+            engine.put(Event("eB", 1))
+            engine.put(Event("eB", 2))
+
+        engine.register("eA", process_a_event)
+        engine.register("eB", collector)
+        engine.register("eA", collector)
+        engine.set_overflow_policy("eC", OverflowPolicy.DROP_NEWEST)
+        run_engine(engine)
+
+        # Act
+        engine.put(Event("eA", 0))
+        collector.finished.wait(5)
+
+        # Assert
+        assert [e.data for e in collector.events] == [0, 1, 2]
+        assert engine.get_overflow_counts() == {"dropped": {}, "blocked": {}, "conflated": {}}
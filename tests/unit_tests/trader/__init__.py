@@ -0,0 +1,5 @@
+"""
+trader模块单元测试包
+
+包含trader模块中公共组件的单元测试。
+"""
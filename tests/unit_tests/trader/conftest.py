@@ -0,0 +1,54 @@
+"""
+trader模块测试配置文件
+
+定义了trader测试中使用的公共数据库桩。
+"""
+
+from vnpy.trader.database import BaseDatabase
+
+
+class MemoryDatabase(BaseDatabase):
+    """只在内存中保存K线和Tick数据的数据库，记录读取区间"""
+
+    def __init__(self):
+        self.bars = []
+        self.ticks = []
+        self.streams = []
+        self.loads = []
+
+    def save_bar_data(self, bars, stream=False):
+        self.bars.extend(bars)
+        self.streams.append(stream)
+        return True
+
+    def save_tick_data(self, ticks, stream=False):
+        self.ticks.extend(ticks)
+        return True
+
+    def load_bar_data(self, symbol, exchange, interval, start, end):
+        self.loads.append((start, end))
+        return [
+            bar for bar in self.bars
+            if bar.symbol == symbol and start <= bar.datetime.replace(tzinfo=None) <= end
+        ]
+
+    def load_tick_data(self, symbol, exchange, start, end):
+        self.loads.append((start, end))
+        return [
+            tick for tick in self.ticks
+            if tick.symbol == symbol and start <= tick.datetime.replace(tzinfo=None) <= end
+        ]
+
+    def delete_bar_data(self, symbol, exchange, interval):
+        count = len(self.bars)
+        self.bars = [bar for bar in self.bars if bar.symbol != symbol]
+        return count - len(self.bars)
+
+    def delete_tick_data(self, symbol, exchange):
+        return 0
+
+    def get_bar_overview(self):
+        return []
+
+    def get_tick_overview(self):
+        return []
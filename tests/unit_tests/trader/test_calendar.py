@@ -0,0 +1,94 @@
+"""
+交易日历单元测试
+
+测试交易日查找、区间查询、时间对齐、缺失检测以及按交易所注册日历。
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.calendar import TradingCalendar, get_calendar, set_calendar
+
+
+@pytest.fixture
+def calendar():
+    """2023年1月2日到1月13日的工作日，1月9日休市"""
+    return TradingCalendar.from_weekdays(date(2023, 1, 2), date(2023, 1, 13), holidays=[date(2023, 1, 9)])
+
+
+class TestTradingCalendar:
+    """TradingCalendar测试类"""
+
+    def test_from_weekdays_should_skip_weekends_and_holidays(self, calendar):
+        """测试工作日日历应该排除周末和节假日"""
+        # Assert
+        assert len(calendar) == 9
+        assert datetime(2023, 1, 6) in calendar
+        assert datetime(2023, 1, 7) not in calendar
+        assert date(2023, 1, 9) not in calendar
+
+    def test_init_should_sort_and_deduplicate(self):
+        """测试创建时应该排序去重"""
+        # Act
+        calendar = TradingCalendar([datetime(2023, 1, 3), datetime(2023, 1, 2), datetime(2023, 1, 3)])
+
+        # Assert
+        assert calendar.get_sessions() == [datetime(2023, 1, 2), datetime(2023, 1, 3)]
+
+    def test_next_and_previous_session_should_skip_non_sessions(self, calendar):
+        """测试前后交易日查找应该跳过周末和节假日"""
+        # Assert
+        assert calendar.next_session(datetime(2023, 1, 6)) == datetime(2023, 1, 10)
+        assert calendar.next_session(datetime(2023, 1, 6), inclusive=True) == datetime(2023, 1, 6)
+        assert calendar.previous_session(datetime(2023, 1, 10)) == datetime(2023, 1, 6)
+        assert calendar.previous_session(datetime(2023, 1, 2)) is None
+        assert calendar.next_session(datetime(2023, 1, 13)) is None
+
+    def test_get_sessions_should_include_both_ends(self, calendar):
+        """测试区间查询应该包含首尾交易日"""
+        # Act
+        sessions = calendar.get_sessions(datetime(2023, 1, 5), datetime(2023, 1, 10))
+
+        # Assert
+        assert sessions == [datetime(2023, 1, 5), datetime(2023, 1, 6), datetime(2023, 1, 10)]
+        assert calendar.count_sessions(datetime(2023, 1, 7), datetime(2023, 1, 9)) == 0
+
+    def test_align_should_map_to_sessions(self, calendar):
+        """测试时间对齐应该映射到前一个或后一个交易日，超出范围为NaT"""
+        # Arrange
+        dts = np.array([datetime(2023, 1, 7, 10), datetime(2023, 1, 3, 15), datetime(2023, 1, 1)], dtype="datetime64[us]")
+
+        # Act
+        previous = calendar.align(dts)
+        following = calendar.align(dts, method="next")
+
+        # Assert
+        assert previous[:2].tolist() == [datetime(2023, 1, 6), datetime(2023, 1, 3)]
+        assert np.isnat(previous[2])
+        assert following.tolist() == [datetime(2023, 1, 10), datetime(2023, 1, 4), datetime(2023, 1, 2)]
+
+    def test_get_missing_should_return_sessions_without_data(self, calendar):
+        """测试缺失检测应该返回没有数据的交易日"""
+        # Arrange
+        dts = np.array([datetime(2023, 1, d, 15) for d in (2, 3, 5, 6)], dtype="datetime64[us]")
+
+        # Act
+        missing = calendar.get_missing(dts, end=datetime(2023, 1, 10))
+
+        # Assert
+        assert missing.tolist() == [datetime(2023, 1, 4), datetime(2023, 1, 10)]
+
+    def test_set_calendar_should_register_by_exchange(self, calendar, monkeypatch):
+        """测试应该按交易所注册和获取日历"""
+        # Arrange
+        monkeypatch.setattr("vnpy.trader.calendar.calendars", {})
+
+        # Act
+        set_calendar(Exchange.NASDAQ, calendar)
+
+        # Assert
+        assert get_calendar(Exchange.NASDAQ) is calendar
+        assert get_calendar(Exchange.SSE) is None
@@ -0,0 +1,113 @@
+"""
+数据库DataFrame接口单元测试
+
+测试BaseDatabase默认的save_bar_frame和load_bar_frame适配实现，以及数据库模块的延迟导入。
+"""
+
+import subprocess
+import sys
+from datetime import datetime
+
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BAR_FRAME_COLUMNS, DB_TZ, get_db_tz
+from vnpy.trader.object import BarData
+
+from .conftest import MemoryDatabase
+
+
+def make_frame() -> pl.DataFrame:
+    """创建两根日线的DataFrame"""
+    return pl.DataFrame({
+        "datetime": [datetime(2023, 1, 2), datetime(2023, 1, 3)],
+        "open": [1.0, 2.0],
+        "high": [1.5, 2.5],
+        "low": [0.5, 1.5],
+        "close": [1.2, 2.2],
+        "volume": [100.0, 200.0],
+        "turnover": [0.0, 0.0],
+        "open_interest": [0.0, 0.0],
+    })
+
+
+class TestBarFrameAdapter:
+    """BaseDatabase DataFrame接口测试类"""
+
+    def test_save_bar_frame_should_convert_rows_to_bars(self):
+        """测试默认实现应该转换为数据库时区的BarData后调用save_bar_data"""
+        # Arrange
+        database = MemoryDatabase()
+
+        # Act
+        success = database.save_bar_frame(make_frame(), "AAPL", Exchange.NASDAQ, Interval.DAILY, stream=True)
+
+        # Assert
+        assert success
+        assert database.streams == [True]
+        assert [bar.close_price for bar in database.bars] == [1.2, 2.2]
+        assert database.bars[0].datetime == datetime(2023, 1, 2, tzinfo=DB_TZ)
+        assert database.bars[0].vt_symbol == "AAPL.NASDAQ"
+
+    def test_save_empty_frame_should_return_false(self):
+        """测试空DataFrame不应该写入"""
+        # Arrange
+        database = MemoryDatabase()
+
+        # Act
+        success = database.save_bar_frame(make_frame().head(0), "AAPL", Exchange.NASDAQ, Interval.DAILY)
+
+        # Assert
+        assert not success
+        assert database.streams == []
+
+    def test_load_bar_frame_should_round_trip(self):
+        """测试默认实现读取的DataFrame应该与写入的数据一致"""
+        # Arrange
+        database = MemoryDatabase()
+        database.save_bar_frame(make_frame(), "AAPL", Exchange.NASDAQ, Interval.DAILY)
+
+        # Act
+        df = database.load_bar_frame("AAPL", Exchange.NASDAQ, Interval.DAILY, datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        # Assert
+        assert df.columns == BAR_FRAME_COLUMNS
+        assert df.equals(make_frame().with_columns(pl.col("datetime").cast(pl.Datetime("us"))))
+
+    def test_load_bar_frame_without_data_should_keep_schema(self):
+        """测试没有数据时应该返回带列结构的空DataFrame"""
+        # Arrange
+        database = MemoryDatabase()
+        database.bars.append(BarData(
+            symbol="AAPL", exchange=Exchange.NASDAQ, datetime=datetime(2022, 1, 1), interval=Interval.DAILY, gateway_name="DB"
+        ))
+
+        # Act
+        df = database.load_bar_frame("AAPL", Exchange.NASDAQ, Interval.DAILY, datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        # Assert
+        assert df.is_empty()
+        assert df.schema["datetime"] == pl.Datetime("us")
+
+
+class TestLazyImport:
+    """数据库模块延迟导入测试类"""
+
+    def test_import_database_should_not_load_talib(self):
+        """测试导入数据库模块时不应该导入talib和数据库驱动"""
+        # Arrange
+        code = (
+            "import sys, vnpy.trader.database; "
+            "print(sorted({'talib', 'numpy', 'vnpy_sqlite'} & set(sys.modules)))"
+        )
+
+        # Act
+        process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        # Assert
+        assert process.stdout.strip() == "[]"
+
+    def test_db_tz_should_resolve_on_access(self):
+        """测试DB_TZ应该在访问时解析并与get_db_tz一致"""
+        # Assert
+        assert DB_TZ is get_db_tz()
@@ -0,0 +1,152 @@
+"""
+数据库K线缓存单元测试
+
+测试CachedDatabase的命中、部分重叠补读、LRU淘汰、写入删除失效以及命中率统计。
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.database_cache import CachedDatabase
+from vnpy.trader.object import BarData
+
+from .conftest import MemoryDatabase
+
+
+def make_bars(symbol: str, start: datetime, count: int) -> list[BarData]:
+    """创建连续日线数据"""
+    return [
+        BarData(
+            symbol=symbol,
+            exchange=Exchange.NASDAQ,
+            datetime=(start + timedelta(days=i)).replace(tzinfo=DB_TZ),
+            interval=Interval.DAILY,
+            close_price=float(i),
+            volume=100.0,
+            gateway_name="DB"
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def memory_database():
+    """保存AAPL在2023年1月1日起30根日线的内存数据库"""
+    database = MemoryDatabase()
+    database.bars.extend(make_bars("AAPL", datetime(2023, 1, 1), 30))
+    return database
+
+
+def load(database, start_day: int, end_day: int, symbol: str = "AAPL") -> list[BarData]:
+    """读取2023年1月中指定日期区间的日线"""
+    return database.load_bar_data(
+        symbol, Exchange.NASDAQ, Interval.DAILY, datetime(2023, 1, start_day), datetime(2023, 1, end_day)
+    )
+
+
+class TestCachedDatabase:
+    """CachedDatabase测试类"""
+
+    def test_load_within_cached_range_should_hit(self, memory_database):
+        """测试被已缓存区间覆盖的请求应该直接从缓存返回"""
+        # Arrange
+        database = CachedDatabase(memory_database)
+        load(database, 1, 20)
+
+        # Act
+        bars = load(database, 5, 10)
+
+        # Assert
+        assert len(memory_database.loads) == 1
+        assert [bar.close_price for bar in bars] == [4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+        assert bars[0].datetime == datetime(2023, 1, 5, tzinfo=DB_TZ)
+        assert bars[0].vt_symbol == "AAPL.NASDAQ"
+        assert database.get_stats()["hit_count"] == 1
+
+    def test_load_overlapping_range_should_only_fetch_missing_tail(self, memory_database):
+        """测试部分重叠的请求应该只从数据库补读缺失部分并合并"""
+        # Arrange
+        database = CachedDatabase(memory_database)
+        load(database, 1, 10)
+
+        # Act
+        bars = load(database, 5, 15)
+
+        # Assert
+        assert memory_database.loads[-1] == (datetime(2023, 1, 10), datetime(2023, 1, 15))
+        assert [bar.close_price for bar in bars] == [float(i) for i in range(4, 15)]
+        assert database.get_stats()["partial_count"] == 1
+
+        load(database, 1, 15)
+        assert len(memory_database.loads) == 2
+
+    def test_load_bar_frame_should_share_cache(self, memory_database):
+        """测试DataFrame读取应该使用同一份缓存"""
+        # Arrange
+        database = CachedDatabase(memory_database)
+        load(database, 1, 20)
+
+        # Act
+        df = database.load_bar_frame(
+            "AAPL", Exchange.NASDAQ, Interval.DAILY, datetime(2023, 1, 2), datetime(2023, 1, 3)
+        )
+
+        # Assert
+        assert df["close"].to_list() == [1.0, 2.0]
+        assert len(memory_database.loads) == 1
+
+    def test_save_and_delete_should_invalidate_contract(self, memory_database):
+        """测试写入或删除K线后应该丢弃对应合约的缓存"""
+        # Arrange
+        database = CachedDatabase(memory_database)
+        load(database, 1, 30)
+
+        # Act
+        database.save_bar_data(make_bars("AAPL", datetime(2023, 1, 31), 1))
+        bars = load(database, 1, 31)
+        database.delete_bar_data("AAPL", Exchange.NASDAQ, Interval.DAILY)
+        deleted = load(database, 1, 31)
+
+        # Assert
+        assert len(bars) == 31
+        assert deleted == []
+        assert len(memory_database.loads) == 3
+
+    def test_exceed_max_bytes_should_evict_least_recently_used(self, memory_database):
+        """测试超过内存上限时应该淘汰最久未使用的合约"""
+        # Arrange
+        memory_database.bars.extend(make_bars("MSFT", datetime(2023, 1, 1), 30))
+        memory_database.bars.extend(make_bars("TSLA", datetime(2023, 1, 1), 30))
+
+        database = CachedDatabase(memory_database, max_bytes=30 * 8 * 8 * 2)
+        load(database, 1, 30, "AAPL")
+        load(database, 1, 30, "MSFT")
+        load(database, 1, 30, "AAPL")
+
+        # Act
+        load(database, 1, 30, "TSLA")
+
+        # Assert
+        keys = [key[0] for key in database.entries]
+        assert keys == ["AAPL", "TSLA"]
+        assert database.total_bytes <= database.max_bytes
+
+    def test_get_stats_should_report_hit_rate(self, memory_database):
+        """测试统计信息应该包含命中率"""
+        # Arrange
+        database = CachedDatabase(memory_database)
+
+        # Act
+        load(database, 1, 10)
+        load(database, 2, 5)
+        load(database, 3, 6)
+        load(database, 4, 9)
+        stats = database.get_stats()
+
+        # Assert
+        assert stats["miss_count"] == 1
+        assert stats["hit_rate"] == 0.75
+        assert stats["entry_count"] == 1
@@ -0,0 +1,157 @@
+"""
+Tick数据流式读取单元测试
+
+测试BaseDatabase默认的按天分批读取，以及按合约和交易日分区的TickStore。
+"""
+
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import TickData
+from vnpy.trader.tick_store import TickStore
+
+from .conftest import MemoryDatabase
+
+
+def make_ticks(start: datetime, count: int, step: timedelta = timedelta(hours=8)) -> list[TickData]:
+    """创建固定间隔的Tick数据，最新价为序号"""
+    return [
+        TickData(
+            symbol="rb2401",
+            exchange=Exchange.SHFE,
+            datetime=(start + step * i).replace(tzinfo=DB_TZ),
+            last_price=float(i),
+            bid_price_1=float(i) - 1,
+            ask_volume_5=10.0,
+            gateway_name="DB"
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def tick_store(tmp_path):
+    """保存2023年1月2日起三天共9个Tick的存储"""
+    store = TickStore(tmp_path)
+    store.save_tick_data(make_ticks(datetime(2023, 1, 2), 9))
+    return store
+
+
+class TestIterTickData:
+    """BaseDatabase.iter_tick_data测试类"""
+
+    def test_default_iter_should_load_day_by_day(self):
+        """测试默认实现应该逐日读取并按固定数量分批"""
+        # Arrange
+        database = MemoryDatabase()
+        database.ticks.extend(make_ticks(datetime(2023, 1, 2), 9))
+
+        # Act
+        batches = list(database.iter_tick_data(
+            "rb2401", Exchange.SHFE, datetime(2023, 1, 2), datetime(2023, 1, 4, 12), batch_size=3
+        ))
+
+        # Assert
+        assert [len(batch) for batch in batches] == [3, 3, 2]
+        assert [tick.last_price for batch in batches for tick in batch] == [float(i) for i in range(8)]
+        assert len(database.loads) == 3
+        assert database.loads[-1] == (datetime(2023, 1, 4), datetime(2023, 1, 4, 12))
+
+
+class TestTickStore:
+    """TickStore测试类"""
+
+    def test_save_should_partition_by_day(self, tick_store, tmp_path):
+        """测试应该按交易所、合约和日期分别写入文件"""
+        # Assert
+        files = sorted(path.name for path in tmp_path.joinpath("SHFE", "rb2401").iterdir())
+        assert files == ["20230102.parquet", "20230103.parquet", "20230104.parquet"]
+
+    def test_iter_should_yield_fixed_size_batches_across_days(self, tick_store):
+        """测试分批读取应该跨日期拼接成固定数量的批次，并还原Tick字段"""
+        # Act
+        batches = list(tick_store.iter_tick_data(
+            "rb2401", Exchange.SHFE, datetime(2023, 1, 2, 8), datetime(2023, 1, 4), batch_size=3
+        ))
+
+        # Assert
+        ticks = [tick for batch in batches for tick in batch]
+        assert [len(batch) for batch in batches] == [3, 3]
+        assert [tick.last_price for tick in ticks] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        assert ticks[0].datetime == datetime(2023, 1, 2, 8, tzinfo=DB_TZ)
+        assert ticks[0].bid_price_1 == 0.0
+        assert ticks[0].ask_volume_5 == 10.0
+        assert ticks[0].vt_symbol == "rb2401.SHFE"
+
+    def test_parallel_iter_should_keep_order(self, tick_store):
+        """测试多线程预读时应该保持时间顺序"""
+        # Act
+        batches = tick_store.iter_tick_data(
+            "rb2401", Exchange.SHFE, datetime(2023, 1, 1), datetime(2023, 1, 31), batch_size=2, max_workers=3
+        )
+
+        # Assert
+        assert [tick.last_price for batch in batches for tick in batch] == [float(i) for i in range(9)]
+
+    def test_save_existing_day_should_replace_same_datetime(self, tick_store):
+        """测试写入已有日期时应该合并并覆盖相同时间的Tick"""
+        # Arrange
+        tick = make_ticks(datetime(2023, 1, 3), 1)[0]
+        tick.last_price = 100.0
+
+        # Act
+        tick_store.save_tick_data([tick])
+        ticks = tick_store.load_tick_data("rb2401", Exchange.SHFE, datetime(2023, 1, 3), datetime(2023, 1, 3, 23))
+
+        # Assert
+        assert [t.last_price for t in ticks] == [100.0, 4.0, 5.0]
+
+    def test_overview_and_delete(self, tick_store):
+        """测试概览应该统计数量和起止时间，删除后返回删除数量"""
+        # Act
+        overviews = tick_store.get_tick_overview()
+        count = tick_store.delete_tick_data("rb2401", Exchange.SHFE)
+
+        # Assert
+        assert overviews[0].count == 9
+        assert overviews[0].start == datetime(2023, 1, 2, tzinfo=DB_TZ)
+        assert overviews[0].end == datetime(2023, 1, 4, 16, tzinfo=DB_TZ)
+        assert count == 9
+        assert tick_store.get_days("rb2401", Exchange.SHFE) == []
+
+    def test_load_should_keep_name_and_localtime(self, tmp_path):
+        """测试读取应该还原名称和本地时间字段"""
+        # Arrange
+        store = TickStore(tmp_path)
+        tick = make_ticks(datetime(2023, 1, 2), 1)[0]
+        tick.name = "螺纹钢2401"
+        tick.localtime = datetime(2023, 1, 2, 0, 0, 1)
+
+        # Act
+        store.save_tick_data([tick])
+        ticks = store.load_tick_data("rb2401", Exchange.SHFE, datetime(2023, 1, 2), datetime(2023, 1, 3))
+
+        # Assert
+        assert ticks[0].name == "螺纹钢2401"
+        assert ticks[0].localtime == datetime(2023, 1, 2, 0, 0, 1)
+
+    def test_load_file_without_name_should_use_defaults(self, tick_store, tmp_path):
+        """测试读取不包含名称和本地时间列的旧文件应该使用默认值，并可以继续写入"""
+        # Arrange
+        file_path = tmp_path.joinpath("SHFE", "rb2401", "20230102.parquet")
+        pl.read_parquet(file_path).drop("name", "localtime").write_parquet(file_path)
+
+        tick = make_ticks(datetime(2023, 1, 2, 12), 1)[0]
+        tick.name = "螺纹钢2401"
+
+        # Act
+        tick_store.save_tick_data([tick])
+        ticks = tick_store.load_tick_data("rb2401", Exchange.SHFE, datetime(2023, 1, 2), datetime(2023, 1, 2, 23))
+
+        # Assert
+        assert [t.name for t in ticks] == ["", "", "螺纹钢2401", ""]
+        assert ticks[0].localtime is None
@@ -8,8 +8,6 @@ from multiprocessing.context import BaseContext
 import polars as pl
 import pandas as pd
 from tqdm import tqdm
-from alphalens.utils import get_clean_factor_and_forward_returns    # type: ignore
-from alphalens.tears import create_full_tear_sheet                  # type: ignore
 
 from ..logger import logger
 from .utility import (
@@ -184,6 +182,10 @@ class AlphaDataset:
         """
         Perform performance analysis for a feature
         """
+        # alphalens pulls in matplotlib, seaborn and scipy, only import when showing
+        from alphalens.utils import get_clean_factor_and_forward_returns    # type: ignore
+        from alphalens.tears import create_full_tear_sheet                  # type: ignore
+
         starts: list[datetime] = []
         ends: list[datetime] = []
 
@@ -217,6 +219,10 @@ class AlphaDataset:
         """
         Perform performance analysis for prediction signals
         """
+        # alphalens pulls in matplotlib, seaborn and scipy, only import when showing
+        from alphalens.utils import get_clean_factor_and_forward_returns
+        from alphalens.tears import create_full_tear_sheet
+
         # Get signal start and end times
         start: datetime = cast(datetime, signal["datetime"].min())
         end: datetime = cast(datetime, signal["datetime"].max())
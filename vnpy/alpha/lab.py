@@ -1,16 +1,21 @@
+import os
 import json
 import shelve
 import pickle
 from pathlib import Path
+from threading import Lock, get_ident
+from time import time_ns
 from datetime import datetime, timedelta
 from collections import defaultdict
 from functools import lru_cache
 
+import numpy as np
 import polars as pl
 
 from vnpy.trader.object import BarData
 from vnpy.trader.constant import Interval
 from vnpy.trader.utility import extract_vt_symbol
+from vnpy.trader.calendar import TradingCalendar
 
 from .logger import logger
 from .dataset import AlphaDataset, to_datetime
@@ -48,20 +53,21 @@ class AlphaLab:
             if not path.exists():
                 path.mkdir(parents=True)
 
+        # Serialize compaction and full rewrites of the same file
+        self.file_locks: defaultdict[Path, Lock] = defaultdict(Lock)
+        self.file_locks_lock: Lock = Lock()
+
     def save_bar_data(self, bars: list[BarData]) -> None:
         """Save bar data"""
         if not bars:
             return
 
-        # Get file path
         bar: BarData = bars[0]
+        vt_symbol: str = bar.vt_symbol
 
-        if bar.interval == Interval.DAILY:
-            file_path: Path = self.daily_path.joinpath(f"{bar.vt_symbol}.parquet")
-        elif bar.interval == Interval.MINUTE:
-            file_path = self.minute_path.joinpath(f"{bar.vt_symbol}.parquet")
-        elif bar.interval:
-            logger.error(f"Unsupported interval {bar.interval.value}")
+        interval: Interval | None = bar.interval
+        if not interval:
+            logger.error(f"Missing interval of {vt_symbol}")
             return
 
         data: list = []
@@ -78,20 +84,169 @@ class AlphaLab:
             }
             data.append(bar_data)
 
-        new_df: pl.DataFrame = pl.DataFrame(data)
+        self.save_bar_df(vt_symbol, interval, pl.DataFrame(data))
+
+    def save_bar_df(self, vt_symbol: str, interval: Interval, df: pl.DataFrame) -> None:
+        """Save bar data in DataFrame format"""
+        if df.is_empty():
+            return
+
+        # Get file path
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
+            logger.error(f"Unsupported interval {interval.value}")
+            return
+
+        with self.get_file_lock(file_path):
+            # Merge existing file and pending part files, new data takes priority
+            part_paths: list[Path] = self.get_part_paths(file_path)
+            old_paths: list[Path] = ([file_path] if file_path.exists() else []) + part_paths
+
+            new_df: pl.DataFrame = df
+
+            if old_paths:
+                old_df: pl.DataFrame = pl.concat(
+                    [pl.read_parquet(path) for path in old_paths],
+                    how="vertical_relaxed"
+                )
+
+                new_df = pl.concat([old_df, new_df], how="vertical_relaxed")
+
+                new_df = new_df.unique(subset=["datetime"], keep="last", maintain_order=True)
+
+                new_df = new_df.sort("datetime")
+
+            # Save to file
+            new_df.write_parquet(file_path)
+
+            for path in part_paths:
+                path.unlink(missing_ok=True)
+
+    def append_bar_df(self, vt_symbol: str, interval: Interval, df: pl.DataFrame) -> Path | None:
+        """
+        Append bar data as a new part file without reading existing data.
+
+        Part files are merged into the main file by compact_bar_data.
+        """
+        if df.is_empty():
+            return None
+
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
+            logger.error(f"Unsupported interval {interval.value}")
+            return None
+
+        part_folder: Path = self.get_part_folder(file_path)
+        part_folder.mkdir(exist_ok=True)
+
+        # Part names sort in write order, temp file keeps readers from seeing partial writes
+        name: str = f"{time_ns():020d}-{os.getpid()}-{get_ident()}"
+        temp_path: Path = part_folder.joinpath(f"{name}.tmp")
+        part_path: Path = part_folder.joinpath(f"{name}.parquet")
+
+        df.write_parquet(temp_path)
+        os.replace(temp_path, part_path)
+
+        return part_path
+
+    def compact_bar_data(self, vt_symbol: str, interval: Interval) -> int:
+        """
+        Merge pending part files into the main parquet file.
+
+        Returns the number of part files merged.
+        """
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
+            return 0
+
+        with self.get_file_lock(file_path):
+            part_paths: list[Path] = self.get_part_paths(file_path)
+            if not part_paths:
+                return 0
+
+            # Later files take priority for duplicated datetime
+            paths: list[Path] = ([file_path] if file_path.exists() else []) + part_paths
+
+            temp_path: Path = file_path.with_suffix(".tmp")
+
+            (
+                pl.concat([pl.scan_parquet(path) for path in paths], how="vertical_relaxed")
+                .unique(subset=["datetime"], keep="last", maintain_order=True)
+                .sort("datetime")
+                .sink_parquet(temp_path)
+            )
+
+            os.replace(temp_path, file_path)
+
+            for path in part_paths:
+                path.unlink(missing_ok=True)
+
+            return len(part_paths)
+
+    def get_bar_path(self, vt_symbol: str, interval: Interval) -> Path | None:
+        """Get main parquet file path of bar data"""
+        if interval == Interval.DAILY:
+            return self.daily_path.joinpath(f"{vt_symbol}.parquet")
+        elif interval == Interval.MINUTE:
+            return self.minute_path.joinpath(f"{vt_symbol}.parquet")
+        return None
+
+    def get_part_folder(self, file_path: Path) -> Path:
+        """Get folder of part files waiting to be compacted"""
+        return file_path.with_suffix(".parts")
 
-        # If file exists, read and merge
+    def get_part_paths(self, file_path: Path) -> list[Path]:
+        """Get part files of bar data in write order"""
+        part_folder: Path = self.get_part_folder(file_path)
+        if not part_folder.exists():
+            return []
+        return sorted(part_folder.glob("*.parquet"))
+
+    def get_bar_paths(self, vt_symbol: str, interval: Interval) -> list[Path]:
+        """
+        Get main file and part files of bar data.
+
+        Hold the file lock while reading the returned paths, otherwise
+        compact_bar_data may delete part files before they are read.
+        """
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
+            return []
+
+        paths: list[Path] = self.get_part_paths(file_path)
         if file_path.exists():
-            old_df: pl.DataFrame = pl.read_parquet(file_path)
+            paths.insert(0, file_path)
+        return paths
+
+    def get_file_lock(self, file_path: Path) -> Lock:
+        """Get lock of bar data file"""
+        with self.file_locks_lock:
+            return self.file_locks[file_path]
+
+    def read_bar_file(self, vt_symbol: str, interval: Interval) -> pl.DataFrame | None:
+        """Read bar data including part files not yet compacted"""
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
+            return None
 
-            new_df = pl.concat([old_df, new_df])
+        # Part files are merged and deleted by compact_bar_data under the same lock
+        with self.get_file_lock(file_path):
+            paths: list[Path] = self.get_bar_paths(vt_symbol, interval)
+            if not paths:
+                return None
 
-            new_df = new_df.unique(subset=["datetime"])
+            df: pl.DataFrame = pl.read_parquet(paths[0])
 
-            new_df = new_df.sort("datetime")
+            if len(paths) > 1:
+                df = pl.concat(
+                    [df] + [pl.read_parquet(path) for path in paths[1:]],
+                    how="vertical_relaxed"
+                )
 
-        # Save to file
-        new_df.write_parquet(file_path)
+        if len(paths) > 1:
+            df = df.unique(subset=["datetime"], keep="last", maintain_order=True).sort("datetime")
+
+        return df
 
     def load_bar_data(
         self,
@@ -108,24 +263,18 @@ class AlphaLab:
         start = to_datetime(start)
         end = to_datetime(end)
 
-        # Get folder path
-        if interval == Interval.DAILY:
-            folder_path: Path = self.daily_path
-        elif interval == Interval.MINUTE:
-            folder_path = self.minute_path
-        else:
+        # Get file path
+        file_path: Path | None = self.get_bar_path(vt_symbol, interval)
+        if not file_path:
             logger.error(f"Unsupported interval {interval.value}")
             return []
 
-        # Check if file exists
-        file_path: Path = folder_path.joinpath(f"{vt_symbol}.parquet")
-        if not file_path.exists():
+        # Open file
+        df: pl.DataFrame | None = self.read_bar_file(vt_symbol, interval)
+        if df is None:
             logger.error(f"File {file_path} does not exist")
             return []
 
-        # Open file
-        df: pl.DataFrame = pl.read_parquet(file_path)
-
         # Filter by date range
         df = df.filter((pl.col("datetime") >= start) & (pl.col("datetime") <= end))
 
@@ -172,12 +321,8 @@ class AlphaLab:
         start = to_datetime(start) - timedelta(days=extended_days)
         end = to_datetime(end) + timedelta(days=extended_days // 10)
 
-        # Get folder path
-        if interval == Interval.DAILY:
-            folder_path: Path = self.daily_path
-        elif interval == Interval.MINUTE:
-            folder_path = self.minute_path
-        else:
+        # Check interval
+        if interval not in (Interval.DAILY, Interval.MINUTE):
             logger.error(f"Unsupported interval {interval.value}")
             return None
 
@@ -185,15 +330,13 @@ class AlphaLab:
         dfs: list = []
 
         for vt_symbol in vt_symbols:
-            # Check if file exists
-            file_path: Path = folder_path.joinpath(f"{vt_symbol}.parquet")
-            if not file_path.exists():
+            # Open file
+            df: pl.DataFrame | None = self.read_bar_file(vt_symbol, interval)
+            if df is None:
+                file_path: Path | None = self.get_bar_path(vt_symbol, interval)
                 logger.error(f"File {file_path} does not exist")
                 continue
 
-            # Open file
-            df: pl.DataFrame = pl.read_parquet(file_path)
-
             # Filter by date range
             df = df.filter((pl.col("datetime") >= start) & (pl.col("datetime") <= end))
 
@@ -311,38 +454,29 @@ class AlphaLab:
             end
         )
 
-        # Get all trading dates and sort
-        trading_dates: list[datetime] = sorted(index_components.keys())
+        # Build membership matrix of components over sorted trading dates
+        calendar: TradingCalendar = TradingCalendar(list(index_components.keys()))
+        trading_dates: list[datetime] = calendar.get_sessions()
+
+        all_symbols: list[str] = sorted({s for vt_symbols in index_components.values() for s in vt_symbols})
+        symbol_index: dict[str, int] = {vt_symbol: i for i, vt_symbol in enumerate(all_symbols)}
+
+        membership: np.ndarray = np.zeros((len(all_symbols), len(trading_dates) + 2), dtype=np.int8)
+        for j, trading_date in enumerate(trading_dates, start=1):
+            rows: list[int] = [symbol_index[vt_symbol] for vt_symbol in index_components[trading_date]]
+            membership[rows, j] = 1
+
+        # Continuous holding periods start where membership turns on and end where it turns off
+        changes: np.ndarray = np.diff(membership, axis=1)
 
-        # Initialize component duration dictionary
         component_filters: dict[str, list[tuple[datetime, datetime]]] = defaultdict(list)
 
-        # Get all component symbols
-        all_symbols: set[str] = set()
-        for vt_symbols in index_components.values():
-            all_symbols.update(vt_symbols)
-
-        # Iterate through each component to identify its duration in the index
-        for vt_symbol in all_symbols:
-            period_start: datetime | None = None
-            period_end: datetime | None = None
-
-            # Iterate through each trading day to identify continuous holding periods
-            for trading_date in trading_dates:
-                if vt_symbol in index_components[trading_date]:
-                    if period_start is None:
-                        period_start = trading_date
-
-                    period_end = trading_date
-                else:
-                    if period_start and period_end:
-                        component_filters[vt_symbol].append((period_start, period_end))
-                        period_start = None
-                        period_end = None
-
-            # Handle the last holding period
-            if period_start and period_end:
-                component_filters[vt_symbol].append((period_start, period_end))
+        for vt_symbol, row in zip(all_symbols, changes, strict=True):
+            starts: np.ndarray = np.flatnonzero(row == 1)
+            ends: np.ndarray = np.flatnonzero(row == -1) - 1
+
+            for start_ix, end_ix in zip(starts, ends, strict=True):
+                component_filters[vt_symbol].append((trading_dates[start_ix], trading_dates[end_ix]))
 
         return component_filters
 
@@ -6,13 +6,12 @@ import traceback
 
 import numpy as np
 import polars as pl
-import plotly.graph_objects as go               # type: ignore
-from plotly.subplots import make_subplots       # type: ignore
 from tqdm import tqdm
 
 from vnpy.trader.constant import Direction, Offset, Interval, Status
 from vnpy.trader.object import OrderData, TradeData, BarData
 from vnpy.trader.utility import round_to, extract_vt_symbol
+from vnpy.trader.calendar import TradingCalendar
 
 from ..logger import logger
 from ..lab import AlphaLab
@@ -48,7 +47,7 @@ class BacktestingEngine:
 
         self.interval: Interval
         self.history_data: dict[tuple, BarData] = {}
-        self.dts: set[datetime] = set()
+        self.calendar: TradingCalendar = TradingCalendar()
 
         self.limit_order_count: int = 0
         self.limit_orders: dict[str, OrderData] = {}
@@ -122,10 +121,10 @@ class BacktestingEngine:
 
         # Clear previously loaded historical data
         self.history_data.clear()
-        self.dts.clear()
 
         # Load historical data for each symbol
         empty_symbols: list[str] = []
+        symbol_dts: list[np.ndarray] = []
         for vt_symbol in tqdm(self.vt_symbols, total=len(self.vt_symbols)):
             data: list[BarData] = self.lab.load_bar_data(
                 vt_symbol,
@@ -135,9 +134,10 @@ class BacktestingEngine:
             )
 
             for bar in data:
-                self.dts.add(bar.datetime)
                 self.history_data[(bar.datetime, vt_symbol)] = bar
 
+            symbol_dts.append(np.array([bar.datetime for bar in data], dtype="datetime64[us]"))
+
             data_count = len(data)
             if not data_count:
                 empty_symbols.append(vt_symbol)
@@ -145,6 +145,9 @@ class BacktestingEngine:
         if empty_symbols:
             logger.info(f"部分合约历史数据为空：{empty_symbols}")
 
+        # Build trading calendar from the union of bar datetimes
+        self.calendar = TradingCalendar(np.concatenate(symbol_dts) if symbol_dts else None)
+
         logger.info("所有历史数据加载完成")
 
     def run_backtesting(self) -> None:
@@ -153,11 +156,8 @@ class BacktestingEngine:
         logger.info("策略初始化完成")
 
         # Use remaining historical data for strategy backtesting
-        dts: list = list(self.dts)
-        dts.sort()
-
         logger.info("开始回放历史数据")
-        for dt in dts:
+        for dt in self.calendar.get_sessions():
             try:
                 self.new_bars(dt)
             except Exception:
@@ -403,6 +403,9 @@ class BacktestingEngine:
 
     def show_chart(self) -> None:
         """Display chart"""
+        import plotly.graph_objects as go               # type: ignore
+        from plotly.subplots import make_subplots       # type: ignore
+
         df: pl.DataFrame = self.daily_df
 
         fig = make_subplots(
@@ -439,6 +442,9 @@ class BacktestingEngine:
 
     def show_performance(self, benchmark_symbol: str) -> None:
         """Display performance metrics"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         # Load benchmark prices
         benchmark_bars: list[BarData] = self.lab.load_bar_data(benchmark_symbol, self.interval, self.start, self.end)
 
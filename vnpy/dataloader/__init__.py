@@ -14,18 +14,53 @@
 数据自动转换为vnpy格式并存储到数据库中。
 """
 
-from .base import BaseStockDownloader, DownloadRequest, DownloadResult
+from .base import BaseStockDownloader, DownloadRequest, DownloadResult, BarColumns, DataSource
 from .vnpy_downloader import VnpyStockDownloader  
 from .yfinance_downloader import YfinanceStockDownloader
 from .akshare_downloader import AkshareStockDownloader
 from .manager import StockDataManager
+from .pipeline import DownloadPipeline, RateLimiter
+from .incremental import IncrementalDownloader
+from .cache import ResponseCache
+from .writer import BarWriteBuffer
+from .resilience import RetryPolicy, CircuitBreaker, ResilientDownloader
+from .job import DownloadJob, DownloadJournal
+from .scheduler import StalenessScheduler
+from .lab_sink import LabBarSink
+from .quality import BarQualityChecker, QualityReport
+from .async_downloader import (
+    AsyncBaseStockDownloader,
+    ExecutorStockDownloader,
+    SyncStockDownloader,
+    AsyncStockDataManager
+)
 
 __all__ = [
     "BaseStockDownloader",
     "DownloadRequest", 
     "DownloadResult",
+    "BarColumns",
+    "DataSource",
     "VnpyStockDownloader",
     "YfinanceStockDownloader", 
     "AkshareStockDownloader",
-    "StockDataManager"
+    "StockDataManager",
+    "DownloadPipeline",
+    "RateLimiter",
+    "IncrementalDownloader",
+    "ResponseCache",
+    "BarWriteBuffer",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "ResilientDownloader",
+    "DownloadJob",
+    "DownloadJournal",
+    "AsyncBaseStockDownloader",
+    "ExecutorStockDownloader",
+    "SyncStockDownloader",
+    "AsyncStockDataManager",
+    "StalenessScheduler",
+    "LabBarSink",
+    "BarQualityChecker",
+    "QualityReport"
 ] 
\ No newline at end of file
@@ -5,14 +5,20 @@
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import pandas as pd
 
 from vnpy.trader.object import BarData
 from vnpy.trader.constant import Exchange, Interval
-from vnpy.trader.database import convert_tz
 
-from .base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSource
+from .base import (
+    BaseStockDownloader,
+    DownloadRequest,
+    DownloadResult,
+    DataSource,
+    convert_dataframe_to_bars,
+    convert_dataframe_to_columns
+)
 
 
 class AkshareStockDownloader(BaseStockDownloader):
@@ -76,64 +82,7 @@ class AkshareStockDownloader(BaseStockDownloader):
         Returns:
             List[BarData]: vnpy BarData列表
         """
-        bars = []
-        
-        if df is None or df.empty:
-            return bars
-            
-        for index, row in df.iterrows():
-            try:
-                # 处理日期时间
-                if 'date' in df.columns:
-                    date_str = str(row['date'])
-                elif 'Date' in df.columns:
-                    date_str = str(row['Date']) 
-                else:
-                    # 使用索引作为日期
-                    date_str = str(index)
-                
-                # 转换日期格式
-                if len(date_str) == 8:  # YYYYMMDD格式
-                    dt = datetime.strptime(date_str, '%Y%m%d')
-                elif len(date_str) == 10:  # YYYY-MM-DD格式
-                    dt = datetime.strptime(date_str, '%Y-%m-%d')
-                else:
-                    dt = pd.to_datetime(date_str)
-                    if hasattr(dt, 'to_pydatetime'):
-                        dt = dt.to_pydatetime()
-                        
-                # 转换为vnpy数据库时区
-                dt = convert_tz(dt)
-                
-                # 提取价格和成交量数据（支持不同的列名格式）
-                open_price = float(row.get('open', row.get('Open', 0)))
-                high_price = float(row.get('high', row.get('High', 0)))
-                low_price = float(row.get('low', row.get('Low', 0)))
-                close_price = float(row.get('close', row.get('Close', 0)))
-                volume = float(row.get('volume', row.get('Volume', 0)))
-                
-                # 创建BarData对象
-                bar = BarData(
-                    symbol=symbol,
-                    exchange=exchange,
-                    datetime=dt,
-                    interval=interval,
-                    volume=volume,
-                    turnover=0.0,  # akshare美股数据通常不包含成交额
-                    open_interest=0.0,  # 股票没有持仓量
-                    open_price=open_price,
-                    high_price=high_price,
-                    low_price=low_price,
-                    close_price=close_price,
-                    gateway_name="akshare"
-                )
-                bars.append(bar)
-                
-            except Exception as e:
-                print(f"转换akshare数据行失败: {e}, 行数据: {row}")
-                continue
-                
-        return bars
+        return convert_dataframe_to_bars(df, symbol, exchange, interval, "akshare")
         
     def download_bars(self, request: DownloadRequest) -> DownloadResult:
         """
@@ -180,38 +129,40 @@ class AkshareStockDownloader(BaseStockDownloader):
             
             # 使用akshare下载美股数据
             # akshare的美股数据接口可能有变化，这里使用常见的接口
-            try:
-                # 尝试使用美股历史数据接口
-                df = self.ak.stock_us_hist(symbol=request.symbol)
-            except AttributeError:
+            def fetch():
+                """下载美股历史数据"""
                 try:
-                    # 备用接口
-                    df = self.ak.stock_us_daily(symbol=request.symbol)
+                    # 尝试使用美股历史数据接口
+                    return self.ak.stock_us_hist(symbol=request.symbol)
                 except AttributeError:
-                    return DownloadResult(
-                        request=request,
-                        bars=[],
-                        success=False,
-                        error_msg="akshare美股数据接口不可用，请检查akshare版本"
-                    )
+                    # 备用接口
+                    return self.ak.stock_us_daily(symbol=request.symbol)
             
-            # 如果有时间范围限制，进行过滤
-            if request.start_date or request.end_date:
-                if 'date' in df.columns:
-                    df['date'] = pd.to_datetime(df['date'])
-                    if request.start_date:
-                        df = df[df['date'] >= request.start_date]
-                    if request.end_date:
-                        df = df[df['date'] <= request.end_date]
+            try:
+                # 设置了缓存时优先读取缓存
+                df = self.fetch_frame(request, fetch)
+            except AttributeError:
+                return DownloadResult(
+                    request=request,
+                    bars=[],
+                    success=False,
+                    error_msg="akshare美股数据接口不可用，请检查akshare版本"
+                )
+            
+            # 接口总是返回全部历史数据，按请求的时间范围截取
+            df = self._slice_frame(df, request)
                         
-            # 转换为vnpy格式
-            bars = self._convert_ak_data_to_vnpy(df, request.symbol, request.exchange, request.interval)
+            # 按列转换为vnpy格式，BarData在访问result.bars时才生成
+            columns = convert_dataframe_to_columns(
+                df, request.symbol, request.exchange, request.interval, "akshare"
+            )
             
             return DownloadResult(
                 request=request,
-                bars=bars,
-                success=True if bars else False,
-                error_msg="" if bars else "未获取到数据或股票代码不存在"
+                bars=None,
+                columns=columns,
+                success=columns is not None,
+                error_msg="" if columns is not None else "未获取到数据或股票代码不存在"
             )
             
         except Exception as e:
@@ -219,9 +170,48 @@ class AkshareStockDownloader(BaseStockDownloader):
                 request=request,
                 bars=[],
                 success=False,
-                error_msg=f"akshare数据下载失败: {str(e)}"
+                error_msg=f"akshare数据下载失败: {str(e)}",
+                retryable=True
             )
             
+    def get_cache_args(self, request: DownloadRequest) -> Tuple[str, str, str, Optional[datetime], Optional[datetime]]:
+        """
+        获取请求对应的缓存键参数
+
+        akshare美股接口只按股票代码请求全部历史数据，缓存键不包含时间范围，
+        不同时间范围的请求共用一份缓存后再各自截取。
+        """
+        return (DataSource.AKSHARE.value, request.symbol, request.interval.value, None, None)
+
+    def _slice_frame(self, df: pd.DataFrame, request: DownloadRequest) -> pd.DataFrame:
+        """
+        按请求的时间范围截取数据
+
+        Args:
+            df: akshare返回的全部历史数据
+            request: 下载请求
+
+        Returns:
+            pd.DataFrame: 时间范围内的数据
+        """
+        if not request.start_date and not request.end_date:
+            return df
+
+        date_column: Optional[str] = next((c for c in ("date", "日期") if c in df.columns), None)
+        if not date_column:
+            return df
+
+        dates: pd.Series = pd.to_datetime(df[date_column])
+        mask: pd.Series = pd.Series(True, index=df.index)
+
+        # 日线日期不含时区，按请求时间的本地日期比较
+        if request.start_date:
+            mask &= dates >= pd.Timestamp(request.start_date.replace(tzinfo=None))
+        if request.end_date:
+            mask &= dates <= pd.Timestamp(request.end_date.replace(tzinfo=None))
+
+        return df[mask]
+
     def get_supported_intervals(self) -> List[Interval]:
         """
         获取akshare支持的时间间隔
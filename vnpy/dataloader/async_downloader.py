@@ -0,0 +1,381 @@
+"""
+异步下载
+
+提供基于asyncio的下载器接口和批量下载运行器，单个事件循环中可以同时保持数百个请求。
+同步的第三方库通过有界线程池桥接，线程数量不随在途请求数增长；
+同时保留同步调用方式，便于现有代码继续使用。
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from vnpy.trader.constant import Exchange, Interval
+
+from .base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSource
+from .incremental import IncrementalDownloader
+from .manager import StockDataManager
+
+
+class AsyncBaseStockDownloader(ABC):
+    """异步股票数据下载器抽象基类"""
+
+    def __init__(self, name: str):
+        """初始化"""
+        self.name = name
+        self.source: Optional[DataSource] = None
+
+    @abstractmethod
+    async def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """
+        下载K线数据
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 下载结果
+        """
+        pass
+
+    async def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        并发下载多只股票的K线数据
+
+        Args:
+            requests: 下载请求列表
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        return list(await asyncio.gather(*(self.download_bars(request) for request in requests)))
+
+    def close(self) -> None:     # noqa: B027
+        """释放下载器占用的资源，默认无需释放"""
+        pass
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f"{self.name}({self.source})"
+
+
+class ExecutorStockDownloader(AsyncBaseStockDownloader):
+    """通过有界线程池将同步下载器桥接为异步下载器"""
+
+    def __init__(self, downloader: BaseStockDownloader, executor: Optional[ThreadPoolExecutor] = None, max_workers: int = 16):
+        """
+        初始化
+
+        Args:
+            downloader: 同步下载器
+            executor: 执行同步下载的线程池，多个下载器可以共用
+            max_workers: 未传入线程池时新建线程池的线程数
+        """
+        super().__init__(f"Async{downloader.name}")
+        self.source = downloader.source
+        self.downloader: BaseStockDownloader = downloader
+
+        self.own_executor: bool = executor is None
+        self.executor: ThreadPoolExecutor = executor or ThreadPoolExecutor(max_workers=max_workers)
+
+    async def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """在线程池中执行同步下载"""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.downloader.download_bars, request)
+
+    async def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """在线程池中执行同步下载器的合并请求"""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.downloader.download_bars_batch, requests)
+
+    def close(self) -> None:
+        """关闭自行创建的线程池"""
+        if self.own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SyncStockDownloader(BaseStockDownloader):
+    """将异步下载器包装为同步下载器，可直接用于StockDataManager"""
+
+    def __init__(self, downloader: AsyncBaseStockDownloader):
+        """
+        初始化
+
+        Args:
+            downloader: 异步下载器
+        """
+        super().__init__(f"Sync{downloader.name}")
+        self.source = downloader.source
+        self.downloader: AsyncBaseStockDownloader = downloader
+
+    def init_connection(self, **kwargs: Any) -> bool:
+        """异步下载器无需初始化连接"""
+        return True
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """在新的事件循环中执行异步下载"""
+        return asyncio.run(self.downloader.download_bars(request))
+
+    def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """在一个事件循环中并发执行全部异步下载"""
+        return asyncio.run(self.downloader.download_bars_batch(requests))
+
+    def is_support_interval(self, interval: Interval) -> bool:
+        """异步下载器自行校验时间间隔"""
+        return True
+
+    def get_supported_intervals(self) -> List[Interval]:
+        """获取支持的时间间隔"""
+        return list(Interval)
+
+    def get_supported_exchanges(self) -> List[Exchange]:
+        """获取支持的交易所"""
+        return list(Exchange)
+
+
+class AsyncRateLimiter:
+    """异步令牌桶限速器"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化
+
+        Args:
+            rate: 每秒允许的请求数
+            burst: 允许的突发请求数
+        """
+        self.rate: float = rate
+        self.capacity: float = float(max(burst, 1))
+        self.tokens: float = self.capacity
+        self.timestamp: Optional[float] = None
+
+    async def acquire(self) -> None:
+        """获取一个令牌，令牌不足时等待"""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        # 单线程事件循环中检查和扣减令牌之间没有await，不需要加锁
+        while True:
+            now: float = loop.time()
+            if self.timestamp is None:
+                self.timestamp = now
+
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncStockDataManager:
+    """
+    异步批量下载运行器
+
+    在一个事件循环中并发执行下载请求，沿用StockDataManager的数据库、
+    数据源并发数和频率限制设置，数据库写入在单独的线程中执行。
+    """
+
+    def __init__(self, manager: Optional[StockDataManager] = None, max_workers: int = 16):
+        """
+        初始化
+
+        Args:
+            manager: 同步数据管理器，默认新建
+            max_workers: 桥接同步下载器的共用线程池线程数
+        """
+        self.manager: StockDataManager = manager or StockDataManager()
+        self.max_workers: int = max_workers
+
+        self.downloaders: Dict[DataSource, AsyncBaseStockDownloader] = {}
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.write_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+    def add_downloader(self, source: DataSource, downloader: AsyncBaseStockDownloader) -> None:
+        """
+        设置数据源使用的异步下载器
+
+        Args:
+            source: 数据源
+            downloader: 异步下载器
+        """
+        self.downloaders[source] = downloader
+
+    def get_downloader(self, source: DataSource, incremental: bool = False) -> Optional[AsyncBaseStockDownloader]:
+        """
+        获取数据源对应的异步下载器，没有原生异步下载器时通过共用线程池桥接同步下载器
+
+        Args:
+            source: 数据源
+            incremental: 是否只下载本地缺失的数据，仅对桥接的同步下载器生效
+
+        Returns:
+            Optional[AsyncBaseStockDownloader]: 异步下载器，不支持的数据源返回None
+        """
+        if source in self.downloaders and not incremental:
+            return self.downloaders[source]
+
+        downloader: Optional[BaseStockDownloader] = self.manager.get_downloader(source, incremental)
+        if not downloader:
+            return None
+
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return ExecutorStockDownloader(downloader, self.executor)
+
+    async def iter_download_multiple_stocks(self,
+                                            symbols: List[str],
+                                            source: DataSource = DataSource.YFINANCE,
+                                            exchange: Exchange = Exchange.NYSE,
+                                            start_date: Optional[datetime] = None,
+                                            end_date: Optional[datetime] = None,
+                                            interval: Interval = Interval.DAILY,
+                                            save_to_db: bool = True,
+                                            max_concurrency: int = 256,
+                                            callback: Optional[Callable[[DownloadResult], None]] = None,
+                                            incremental: bool = False) -> AsyncIterator[DownloadResult]:
+        """
+        异步批量下载多个股票数据，按完成顺序逐个返回结果
+
+        同时在途的请求数不超过max_concurrency和set_source_limit设置的并发数，
+        请求按需创建，内存占用与股票数量无关。
+
+        Args:
+            symbols: 股票代码列表
+            source: 数据源
+            exchange: 交易所
+            start_date: 开始时间
+            end_date: 结束时间
+            interval: 时间间隔
+            save_to_db: 是否保存到数据库
+            max_concurrency: 最大在途请求数
+            callback: 每只股票下载完成时的回调函数
+            incremental: 是否只下载本地缺失的数据
+
+        Returns:
+            AsyncIterator[DownloadResult]: 下载结果异步迭代器
+        """
+        downloader: Optional[AsyncBaseStockDownloader] = self.get_downloader(source, incremental)
+
+        if not downloader:
+            for symbol in symbols:
+                yield DownloadResult(
+                    request=DownloadRequest(symbol, exchange, start_date, end_date, interval),
+                    bars=[],
+                    success=False,
+                    error_msg=f"不支持的数据源: {source}"
+                )
+            return
+
+        # 增量下载时桥接的是数据管理器的增量下载器，开始前刷新一次本地数据概览
+        if incremental:
+            incremental_downloader: Optional[BaseStockDownloader] = self.manager.get_downloader(source, True)
+            if isinstance(incremental_downloader, IncrementalDownloader):
+                incremental_downloader.reload_overviews()
+
+        source_limit: int = self.manager.source_limits.get(source, 0)
+        if source_limit:
+            max_concurrency = min(max_concurrency, source_limit)
+
+        rate: float = self.manager.rate_limits.get(source, 0)
+        limiter: Optional[AsyncRateLimiter] = AsyncRateLimiter(rate) if rate else None
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        async def download(symbol: str) -> DownloadResult:
+            """限速后下载单只股票，异常转换为失败结果"""
+            request: DownloadRequest = DownloadRequest(symbol, exchange, start_date, end_date, interval)
+
+            if limiter:
+                await limiter.acquire()
+
+            try:
+                return await downloader.download_bars(request)
+            except Exception as e:
+                return DownloadResult(
+                    request=request,
+                    bars=[],
+                    success=False,
+                    error_msg=f"数据下载异常: {e}",
+                    retryable=True
+                )
+
+        with self.manager.buffered_writes(save_to_db):
+            pending: Set[asyncio.Task] = set()
+            it = iter(symbols)
+
+            try:
+                while True:
+                    # 补充在途请求到并发上限
+                    for symbol in it:
+                        pending.add(asyncio.create_task(download(symbol)))
+                        if len(pending) >= max(max_concurrency, 1):
+                            break
+
+                    if not pending:
+                        break
+
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        result: DownloadResult = task.result()
+
+                        if save_to_db and result.success:
+                            await loop.run_in_executor(self.write_executor, self.manager.save_download_result, result)
+
+                        if result.success:
+                            print(f"✓ {result.request.symbol} 下载成功，数据量: {result.total_count}")
+                        else:
+                            print(f"✗ {result.request.symbol} 下载失败: {result.error_msg}")
+
+                        if callback:
+                            callback(result)
+
+                        yield result
+            finally:
+                for task in pending:
+                    task.cancel()
+
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+    async def download_multiple_stocks(self, symbols: List[str], **kwargs: Any) -> List[DownloadResult]:
+        """
+        异步批量下载多个股票数据
+
+        Args:
+            symbols: 股票代码列表
+            **kwargs: 其他参数，同iter_download_multiple_stocks
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，按完成顺序排列
+        """
+        return [result async for result in self.iter_download_multiple_stocks(symbols, **kwargs)]
+
+    def run(self, symbols: List[str], **kwargs: Any) -> List[DownloadResult]:
+        """
+        同步调用方式，在新的事件循环中执行批量下载
+
+        Args:
+            symbols: 股票代码列表
+            **kwargs: 其他参数，同iter_download_multiple_stocks
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，按完成顺序排列
+        """
+        return asyncio.run(self.download_multiple_stocks(symbols, **kwargs))
+
+    def close(self) -> None:
+        """关闭线程池和异步下载器"""
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+        self.write_executor.shutdown(wait=True)
+
+        for downloader in self.downloaders.values():
+            downloader.close()
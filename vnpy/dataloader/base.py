@@ -5,13 +5,40 @@
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, overload
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+from tzlocal import get_localzone_name
+
 from vnpy.trader.object import BarData
 from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import get_db_tz
+
+from .cache import ResponseCache
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+# 数据源列名到标准列名的映射（列名先统一转换为小写）
+COLUMN_ALIASES: Dict[str, str] = {
+    "date": "datetime",
+    "日期": "datetime",
+    "开盘": "open",
+    "最高": "high",
+    "最低": "low",
+    "收盘": "close",
+    "成交量": "volume",
+    "成交额": "turnover",
+}
+
+# 标准价格和成交量列
+BAR_FIELDS: List[str] = ["open", "high", "low", "close", "volume", "turnover", "open_interest"]
 
 
 class DataSource(Enum):
@@ -35,32 +62,491 @@ class DownloadRequest:
         self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
 
 
-@dataclass  
+@dataclass
+class BarColumns:
+    """按列存储的K线数据，避免为每根K线创建BarData对象"""
+    symbol: str                     # 股票代码
+    exchange: Exchange              # 交易所
+    interval: Interval              # 数据间隔
+    gateway_name: str               # 数据来源名称
+    datetime: np.ndarray            # 时间，datetime64[us]，数据库时区且不含时区信息
+    open: np.ndarray                # 开盘价
+    high: np.ndarray                # 最高价
+    low: np.ndarray                 # 最低价
+    close: np.ndarray               # 收盘价
+    volume: np.ndarray              # 成交量
+    turnover: np.ndarray            # 成交额
+    open_interest: np.ndarray       # 持仓量
+
+    def __len__(self) -> int:
+        """数据行数"""
+        return len(self.datetime)
+
+    @property
+    def vt_symbol(self) -> str:
+        """本地代码"""
+        return f"{self.symbol}.{self.exchange.value}"
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """
+        转换为列名到数组的字典，列名与AlphaLab的parquet文件一致
+
+        Returns:
+            Dict[str, np.ndarray]: 列数据
+        """
+        data: Dict[str, np.ndarray] = {"datetime": self.datetime}
+        for name in BAR_FIELDS:
+            data[name] = getattr(self, name)
+        return data
+
+    def to_polars(self) -> "pl.DataFrame":
+        """
+        转换为polars DataFrame（需要安装polars）
+
+        Returns:
+            pl.DataFrame: 列数据
+        """
+        import polars as pl
+
+        return pl.DataFrame(self.to_dict())
+
+    def to_bars(self) -> List[BarData]:
+        """
+        生成BarData列表
+
+        Returns:
+            List[BarData]: vnpy BarData列表
+        """
+        return [
+            BarData(
+                symbol=self.symbol,
+                exchange=self.exchange,
+                datetime=dt,
+                interval=self.interval,
+                volume=volume,
+                turnover=turnover,
+                open_interest=open_interest,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                gateway_name=self.gateway_name
+            )
+            for dt, open_price, high_price, low_price, close_price, volume, turnover, open_interest in zip(
+                self.datetime.astype("datetime64[us]").tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+                self.turnover.tolist(),
+                self.open_interest.tolist(),
+                strict=True
+            )
+        ]
+
+    def filter(self, mask: np.ndarray) -> "BarColumns":
+        """
+        按布尔掩码或索引筛选行
+
+        Args:
+            mask: 布尔掩码或索引数组
+
+        Returns:
+            BarColumns: 筛选后的列数据
+        """
+        return replace(self, **{name: array[mask] for name, array in self.to_dict().items()})
+
+    @classmethod
+    def concat(cls, columns_list: Sequence[Optional["BarColumns"]]) -> Optional["BarColumns"]:
+        """
+        合并多段列数据，按时间排序，重复时间保留后出现的数据
+
+        Args:
+            columns_list: 同一合约的列数据列表，可以包含None
+
+        Returns:
+            Optional[BarColumns]: 合并后的列数据，没有数据时返回None
+        """
+        valid: List[BarColumns] = [c for c in columns_list if c is not None and len(c)]
+        if not valid:
+            return None
+
+        first: BarColumns = valid[0]
+
+        data: Dict[str, np.ndarray] = {
+            name: np.concatenate([getattr(c, name) for c in valid])
+            for name in ["datetime"] + BAR_FIELDS
+        }
+
+        order: np.ndarray = np.argsort(data["datetime"], kind="stable")
+        dts: np.ndarray = data["datetime"][order]
+        keep: np.ndarray = np.append(dts[1:] != dts[:-1], True)
+        index: np.ndarray = order[keep]
+
+        return cls(
+            symbol=first.symbol,
+            exchange=first.exchange,
+            interval=first.interval,
+            gateway_name=first.gateway_name,
+            **{name: array[index] for name, array in data.items()}
+        )
+
+    @classmethod
+    def from_bars(cls, bars: List[BarData]) -> "BarColumns":
+        """
+        从BarData列表创建
+
+        Args:
+            bars: vnpy BarData列表，不能为空
+
+        Returns:
+            BarColumns: 列数据
+        """
+        bar: BarData = bars[0]
+        if not bar.interval:
+            raise ValueError(f"K线数据缺少时间间隔: {bar.vt_symbol}")
+
+        return cls(
+            symbol=bar.symbol,
+            exchange=bar.exchange,
+            interval=bar.interval,
+            gateway_name=bar.gateway_name,
+            datetime=np.array([b.datetime.replace(tzinfo=None) for b in bars], dtype="datetime64[us]"),
+            open=np.array([b.open_price for b in bars], dtype=float),
+            high=np.array([b.high_price for b in bars], dtype=float),
+            low=np.array([b.low_price for b in bars], dtype=float),
+            close=np.array([b.close_price for b in bars], dtype=float),
+            volume=np.array([b.volume for b in bars], dtype=float),
+            turnover=np.array([b.turnover for b in bars], dtype=float),
+            open_interest=np.array([b.open_interest for b in bars], dtype=float)
+        )
+
+
+class LazyBars:
+    """
+    DownloadResult.bars字段描述符
+
+    只有列数据时，在首次访问bars时才由columns生成BarData列表。
+    """
+
+    @overload
+    def __get__(self, result: None, owner: type) -> "LazyBars": ...
+
+    @overload
+    def __get__(self, result: "DownloadResult", owner: type) -> List[BarData]: ...
+
+    def __get__(self, result: Optional["DownloadResult"], owner: type) -> Any:
+        """获取BarData列表"""
+        # 通过类访问时抛出AttributeError，dataclass不会将描述符作为bars的默认值
+        if result is None:
+            raise AttributeError("bars")
+
+        if result._bars is None:
+            result._bars = result.columns.to_bars() if result.columns is not None else []
+        return result._bars
+
+    def __set__(self, result: "DownloadResult", bars: Optional[List[BarData]]) -> None:
+        """设置BarData列表，None表示由列数据生成"""
+        result._bars = bars
+
+
+@dataclass
 class DownloadResult:
-    """数据下载结果"""
-    request: DownloadRequest        # 原始请求
-    bars: List[BarData]            # 下载的K线数据
-    success: bool                  # 是否成功
-    error_msg: str = ""            # 错误信息
-    total_count: int = 0           # 总数据量
-    
-    def __post_init__(self):
+    """
+    数据下载结果
+
+    下载器可以只填充columns列数据，bars在首次访问时才由columns生成BarData列表。
+    """
+    request: DownloadRequest                # 原始请求
+    bars: LazyBars = LazyBars()             # 下载的K线数据，传入None时由columns生成
+    success: bool = False                   # 是否成功
+    error_msg: str = ""                     # 错误信息
+    total_count: int = 0                    # 总数据量
+    columns: Optional[BarColumns] = None    # 按列存储的K线数据
+    retryable: bool = False                 # 失败是否由临时性错误导致，可以重试
+    ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = field(default_factory=list)  # 实际下载的时间范围，为空时为请求范围
+    _bars: Optional[List[BarData]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
         """后处理"""
-        if self.bars:
-            self.total_count = len(self.bars)
-            self.success = True
+        if self._bars:
+            self.total_count = len(self._bars)
+        elif self.columns is not None:
+            self.total_count = len(self.columns)
         else:
-            self.success = False
+            self.total_count = 0
+
+        # 有数据即为成功，没有数据时保留调用方传入的状态（如增量下载时本地数据已是最新）
+        if self.total_count:
+            self.success = True
+
+    def get_columns(self) -> Optional[BarColumns]:
+        """
+        获取按列存储的K线数据，只有BarData列表时按需转换
+
+        Returns:
+            Optional[BarColumns]: 列数据，没有数据时返回None
+        """
+        if self.columns is None and self._bars:
+            self.columns = BarColumns.from_bars(self._bars)
+        return self.columns
 
 
 class BaseStockDownloader(ABC):
     """股票数据下载器抽象基类"""
+
+    # 每次请求的最大时间跨度，超过时拆分为多段请求，未设置的时间间隔不拆分
+    chunk_sizes: Dict[Interval, timedelta] = {}
+
+    # 分段下载的并发线程数
+    chunk_workers: int = 4
+
+    # 批量下载时单次请求包含的最大股票数量
+    batch_size: int = 1
     
     def __init__(self, name: str):
         """初始化"""
         self.name = name
-        self.source = None
-        
+        self.source: Optional[DataSource] = None
+        self.cache: Optional[ResponseCache] = None
+
+    def set_cache(self, cache: Optional[ResponseCache]) -> None:
+        """
+        设置数据源响应缓存
+
+        Args:
+            cache: ResponseCache实例，None表示关闭缓存
+        """
+        self.cache = cache
+
+    def fetch_frame(self, request: DownloadRequest, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        请求数据源原始数据，设置了缓存时优先读取缓存
+
+        Args:
+            request: 下载请求
+            fetch: 实际请求数据源的函数
+
+        Returns:
+            pd.DataFrame: 数据源返回的原始数据
+        """
+        if not self.cache:
+            return fetch()
+        return self.cache.get_or_fetch(*self.get_cache_args(request), fetch)
+
+    def lookup_frame(self, request: DownloadRequest) -> Optional[pd.DataFrame]:
+        """
+        读取请求对应的缓存数据
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            Optional[pd.DataFrame]: 缓存的原始数据，未设置缓存或未命中时返回None
+        """
+        if not self.cache:
+            return None
+        return self.cache.lookup(*self.get_cache_args(request))
+
+    def store_frame(self, request: DownloadRequest, df: pd.DataFrame) -> None:
+        """
+        将请求对应的原始数据写入缓存，未设置缓存时忽略
+
+        Args:
+            request: 下载请求
+            df: 数据源返回的原始数据
+        """
+        if self.cache:
+            self.cache.store(*self.get_cache_args(request), df)
+
+    def get_cache_args(self, request: DownloadRequest) -> Tuple[str, str, str, Optional[datetime], Optional[datetime]]:
+        """获取请求对应的缓存键参数"""
+        return (
+            self.source.value if self.source else self.name,
+            request.symbol,
+            request.interval.value,
+            request.start_date,
+            request.end_date,
+        )
+
+    def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        批量下载多只股票的K线数据
+
+        默认逐个调用download_bars，支持单次请求多只股票的数据源可以重载该函数。
+
+        Args:
+            requests: 下载请求列表
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        return [self.download_bars(request) for request in requests]
+
+    def get_chunk_size(self, interval: Interval) -> Optional[timedelta]:
+        """
+        获取指定时间间隔每次请求的最大时间跨度
+
+        Args:
+            interval: 时间间隔
+
+        Returns:
+            Optional[timedelta]: 最大时间跨度，None表示不拆分
+        """
+        return self.chunk_sizes.get(interval)
+
+    def split_request(self, request: DownloadRequest) -> List[DownloadRequest]:
+        """
+        按数据源的时间跨度限制将请求拆分为多段连续的请求
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            List[DownloadRequest]: 按时间顺序排列的分段请求，不需要拆分时只包含原请求
+        """
+        chunk_size: Optional[timedelta] = self.get_chunk_size(request.interval)
+        if not chunk_size or not request.start_date:
+            return [request]
+
+        end: datetime = request.end_date or datetime.now(request.start_date.tzinfo)
+        if end - request.start_date <= chunk_size:
+            return [request]
+
+        requests: List[DownloadRequest] = []
+        chunk_start: datetime = request.start_date
+
+        while chunk_start < end:
+            chunk_end: datetime = min(chunk_start + chunk_size, end)
+            requests.append(replace(request, start_date=chunk_start, end_date=chunk_end))
+            chunk_start = chunk_end
+
+        return requests
+
+    def download_bars_chunked(self,
+                              request: DownloadRequest,
+                              max_workers: int = 0,
+                              sink: Optional[Callable[[DownloadResult], bool]] = None) -> DownloadResult:
+        """
+        拆分请求并行下载，按时间顺序去重拼接
+
+        同时在途和等待拼接的分段数量不超过max_workers的两倍。设置sink时每段数据拼接后
+        立即交给sink处理（如写入数据库）且不在内存中保留，内存占用与总时间跨度无关。
+
+        可重试的分段失败或sink写入失败时停止拼接后续分段，返回失败结果并在error_msg中列出
+        失败分段的时间区间，已拼接的数据只包含失败分段之前的连续部分，不会在本地数据中留下缺口。
+        不可重试的分段失败视为该时间段没有数据（如上市之前），跳过后继续拼接。
+
+        Args:
+            request: 下载请求
+            max_workers: 并发线程数，0表示使用chunk_workers
+            sink: 按时间顺序接收每段去重后下载结果的函数，返回是否写入成功
+
+        Returns:
+            DownloadResult: 下载结果，设置sink时只包含数据总量而不包含数据
+        """
+        requests: List[DownloadRequest] = self.split_request(request)
+        max_workers = max_workers or self.chunk_workers
+        window: int = max_workers * 2
+
+        futures: Dict[Future, int] = {}
+        pending: Dict[int, DownloadResult] = {}
+        kept: List[BarColumns] = []
+        errors: List[str] = []
+        failed: List[str] = []
+
+        next_submit: int = 0
+        next_emit: int = 0
+        total_count: int = 0
+        last_dt: Optional[np.datetime64] = None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while next_emit < len(requests) and not failed:
+                # 补充在途请求，等待拼接的结果也计入窗口
+                while next_submit < len(requests) and len(futures) + len(pending) < window:
+                    future: Future = executor.submit(self.download_bars, requests[next_submit])
+                    futures[future] = next_submit
+                    next_submit += 1
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index: int = futures.pop(future)
+                    try:
+                        pending[index] = future.result()
+                    except Exception as e:
+                        pending[index] = DownloadResult(
+                            request=requests[index],
+                            bars=[],
+                            success=False,
+                            error_msg=f"数据下载异常: {e}",
+                            retryable=True
+                        )
+
+                # 按时间顺序拼接已完成的连续分段
+                while next_emit in pending and not failed:
+                    chunk: DownloadRequest = requests[next_emit]
+                    result: DownloadResult = pending.pop(next_emit)
+                    next_emit += 1
+
+                    if not result.success:
+                        if result.retryable:
+                            failed.append(f"[{chunk.start_date}, {chunk.end_date}] {result.error_msg}")
+                        elif result.error_msg:
+                            errors.append(result.error_msg)
+                        continue
+
+                    columns: Optional[BarColumns] = BarColumns.concat([result.get_columns()])
+                    if columns is not None and last_dt is not None:
+                        columns = columns.filter(columns.datetime > last_dt)
+
+                    if columns is None or not len(columns):
+                        continue
+
+                    if sink:
+                        chunk_result = DownloadResult(request=result.request, bars=None, columns=columns, success=True)
+                        if not sink(chunk_result):
+                            failed.append(f"[{chunk.start_date}, {chunk.end_date}] 数据写入失败")
+                            continue
+                    else:
+                        kept.append(columns)
+
+                    last_dt = columns.datetime[-1]
+                    total_count += len(columns)
+
+            # 出现失败后取消尚未开始的分段请求
+            for future in futures:
+                future.cancel()
+
+        if failed:
+            error_msg: str = "分段下载失败: " + "; ".join(failed)
+        elif total_count:
+            error_msg = ""
+        else:
+            error_msg = "; ".join(dict.fromkeys(errors))
+
+        if sink:
+            result = DownloadResult(
+                request=request,
+                bars=[],
+                success=total_count > 0 and not failed,
+                error_msg=error_msg,
+                retryable=bool(failed)
+            )
+            result.total_count = total_count
+            return result
+
+        columns = BarColumns.concat(kept)
+        result = DownloadResult(
+            request=request,
+            bars=None,
+            columns=columns,
+            error_msg=error_msg,
+            retryable=bool(failed)
+        )
+        result.success = columns is not None and not failed
+        return result
+
     @abstractmethod
     def init_connection(self, **kwargs) -> bool:
         """
@@ -147,4 +633,139 @@ class BaseStockDownloader(ABC):
         
     def __str__(self) -> str:
         """字符串表示"""
-        return f"{self.name}({self.source})" 
\ No newline at end of file
+        return f"{self.name}({self.source})"
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    统一DataFrame列名为小写标准列名
+
+    Args:
+        df: 数据源返回的DataFrame
+
+    Returns:
+        pd.DataFrame: 列名标准化后的DataFrame
+    """
+    columns: Dict[str, str] = {}
+    for column in df.columns:
+        name: str = str(column).strip().lower()
+        columns[column] = COLUMN_ALIASES.get(name, name)
+
+    return df.rename(columns=columns)
+
+
+def convert_datetime_array(values, naive_tz: Optional[str] = None) -> np.ndarray:
+    """
+    将整列时间戳一次性转换为数据库时区的datetime64数组
+
+    Args:
+        values: 时间戳序列或索引，支持datetime、字符串和YYYYMMDD格式整数
+        naive_tz: 无时区时间戳所属的时区，默认为本地时区
+
+    Returns:
+        np.ndarray: 不含时区信息的datetime64[us]数组，无法解析的值为NaT
+    """
+    series: pd.Series = pd.Series(values)
+
+    if series.dtype.kind in "iu":
+        dt_index = pd.DatetimeIndex(pd.to_datetime(series.astype(str), format="%Y%m%d", errors="coerce"))
+    else:
+        dt_index = pd.DatetimeIndex(pd.to_datetime(series, errors="coerce"))
+
+    if dt_index.tz is None:
+        dt_index = dt_index.tz_localize(
+            naive_tz or get_localzone_name(),
+            ambiguous="NaT",
+            nonexistent="shift_forward"
+        )
+
+    dt_index = dt_index.tz_convert(get_db_tz()).tz_localize(None)
+    return dt_index.to_numpy().astype("datetime64[us]")
+
+
+def convert_dataframe_to_columns(
+    df: Optional[pd.DataFrame],
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    gateway_name: str,
+    naive_tz: Optional[str] = None
+) -> Optional[BarColumns]:
+    """
+    按列将数据源DataFrame转换为BarColumns
+
+    时间优先取datetime/date列，不存在时使用索引。缺失的价格和成交量列按0处理，
+    无法解析时间的行会被丢弃。
+
+    Args:
+        df: 数据源返回的DataFrame
+        symbol: 股票代码
+        exchange: 交易所
+        interval: 时间间隔
+        gateway_name: 数据来源名称
+        naive_tz: 无时区时间戳所属的时区，默认为本地时区
+
+    Returns:
+        Optional[BarColumns]: 列数据，没有有效数据时返回None
+    """
+    if df is None or df.empty:
+        return None
+
+    df = normalize_columns(df)
+
+    if "datetime" in df.columns:
+        dts: np.ndarray = convert_datetime_array(df["datetime"], naive_tz)
+    else:
+        dts = convert_datetime_array(df.index, naive_tz)
+
+    mask: np.ndarray = ~np.isnat(dts)
+    if not mask.any():
+        return None
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name in BAR_FIELDS:
+        if name in df.columns:
+            arrays[name] = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)[mask]
+        else:
+            arrays[name] = np.zeros(mask.sum())
+
+    return BarColumns(
+        symbol=symbol,
+        exchange=exchange,
+        interval=interval,
+        gateway_name=gateway_name,
+        datetime=dts[mask],
+        **arrays
+    )
+
+
+def convert_dataframe_to_bars(
+    df: Optional[pd.DataFrame],
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    gateway_name: str,
+    naive_tz: Optional[str] = None
+) -> List[BarData]:
+    """
+    按列批量将数据源DataFrame转换为vnpy BarData列表
+
+    Args:
+        df: 数据源返回的DataFrame
+        symbol: 股票代码
+        exchange: 交易所
+        interval: 时间间隔
+        gateway_name: 数据来源名称
+        naive_tz: 无时区时间戳所属的时区，默认为本地时区
+
+    Returns:
+        List[BarData]: vnpy BarData列表
+    """
+    columns: Optional[BarColumns] = convert_dataframe_to_columns(
+        df, symbol, exchange, interval, gateway_name, naive_tz
+    )
+
+    if columns is None:
+        return []
+
+    return columns.to_bars()
@@ -0,0 +1,761 @@
+"""
+数据下载性能基准测试
+
+使用本地模拟下载器和合成数据测量下载和数据转换的性能，无需网络连接。
+
+运行方式:
+    python -m vnpy.dataloader.benchmark download --symbols 200 --latency 0.05 --workers 16
+    python -m vnpy.dataloader.benchmark convert --rows 1000000
+    python -m vnpy.dataloader.benchmark async --symbols 1000 --latency 0.2 --concurrency 500
+    python -m vnpy.dataloader.benchmark ingest --symbols 50 --rows 20000 --workers 8 --json
+    python -m vnpy.dataloader.benchmark startup --repeat 5 --top 10
+"""
+
+import asyncio
+import json
+import sqlite3
+import subprocess
+import sys
+import threading
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Tuple, TypedDict
+
+import numpy as np
+import pandas as pd
+
+from vnpy.trader.object import BarData
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import convert_tz
+
+from .base import (
+    BaseStockDownloader,
+    DownloadRequest,
+    DownloadResult,
+    BarColumns,
+    DataSource,
+    convert_dataframe_to_bars,
+    convert_dataframe_to_columns
+)
+from .manager import StockDataManager
+from .async_downloader import AsyncBaseStockDownloader, AsyncStockDataManager
+from .quality import BarQualityChecker
+from .writer import BarWriteBuffer
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+class StageResult(TypedDict):
+    """入库阶段的测试结果"""
+    stage: str                          # 阶段名称
+    bars: int                           # 处理的K线数量
+    seconds: float                      # 耗时（秒）
+    bars_per_second: float              # 每秒处理的K线数量
+    peak_rss_mb: Optional[float]        # 峰值RSS（MB）
+
+
+class ScalingResult(StageResult, total=False):
+    """按线程数扩展的入库测试结果"""
+    workers: int                        # 线程数
+
+
+class IngestResult(TypedDict):
+    """入库基准测试结果"""
+    symbols: int                        # 股票数量
+    rows: int                           # 每只股票的数据行数
+    bars: int                           # K线总数
+    stages: List[StageResult]           # 各阶段结果
+    scaling: List[ScalingResult]        # 扩展曲线
+
+
+class ImportRecord(TypedDict):
+    """单个模块的导入耗时"""
+    module: str                         # 模块名称
+    self_seconds: float                 # 自身耗时（秒）
+    cumulative_seconds: float           # 累计耗时（秒）
+
+
+class ModuleStartupResult(TypedDict):
+    """入口模块的冷启动测试结果"""
+    module: str                         # 入口模块名称
+    seconds: float                      # 进程耗时（秒）
+    import_seconds: float               # 扣除解释器启动后的导入耗时（秒）
+    imported_modules: int               # 导入的模块数量
+    slowest: List[ImportRecord]         # 导入最慢的模块
+
+
+class StartupResult(TypedDict):
+    """冷启动基准测试结果"""
+    python_seconds: float               # 解释器启动耗时（秒）
+    repeat: int                         # 重复次数
+    modules: List[ModuleStartupResult]  # 各入口模块结果
+
+
+class FakeStockDownloader(BaseStockDownloader):
+    """模拟网络延迟的本地下载器"""
+
+    def __init__(self, latency: float = 0.05, bar_count: int = 250):
+        """
+        初始化
+
+        Args:
+            latency: 每次请求的模拟延迟（秒）
+            bar_count: 每次请求返回的K线数量
+        """
+        super().__init__("FakeStockDownloader")
+        self.source = DataSource.YFINANCE
+        self.latency: float = latency
+        self.bar_count: int = bar_count
+
+    def init_connection(self, **kwargs: Any) -> bool:
+        """初始化连接"""
+        return True
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """
+        生成模拟K线数据
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 下载结果
+        """
+        sleep(self.latency)
+
+        start: datetime = request.start_date or datetime(2020, 1, 1)
+        bars: List[BarData] = [
+            BarData(
+                symbol=request.symbol,
+                exchange=request.exchange,
+                datetime=start + timedelta(days=i),
+                interval=request.interval,
+                volume=1000.0,
+                open_price=100.0,
+                high_price=101.0,
+                low_price=99.0,
+                close_price=100.5,
+                gateway_name="fake"
+            )
+            for i in range(self.bar_count)
+        ]
+
+        return DownloadResult(request=request, bars=bars, success=True)
+
+
+class FakeAsyncStockDownloader(AsyncBaseStockDownloader):
+    """模拟网络延迟的异步本地下载器"""
+
+    def __init__(self, latency: float = 0.05, bar_count: int = 250):
+        """
+        初始化
+
+        Args:
+            latency: 每次请求的模拟延迟（秒）
+            bar_count: 每次请求返回的K线数量
+        """
+        super().__init__("FakeAsyncStockDownloader")
+        self.source = DataSource.YFINANCE
+        self.downloader: FakeStockDownloader = FakeStockDownloader(0, bar_count)
+        self.latency: float = latency
+
+    async def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """等待模拟延迟后生成K线数据"""
+        await asyncio.sleep(self.latency)
+        return self.downloader.download_bars(request)
+
+
+def benchmark_download(symbol_count: int, latency: float, max_workers: int) -> None:
+    """
+    对比顺序下载和并发下载的耗时
+
+    Args:
+        symbol_count: 股票数量
+        latency: 每次请求的模拟延迟（秒）
+        max_workers: 并发下载线程数
+    """
+    manager = StockDataManager()
+    manager.downloaders[DataSource.YFINANCE] = FakeStockDownloader(latency)
+
+    symbols: List[str] = [f"SYM{i}" for i in range(symbol_count)]
+
+    for workers in [1, max_workers]:
+        start: float = perf_counter()
+
+        # 屏蔽逐只股票的下载日志输出
+        with redirect_stdout(StringIO()):
+            results: List[DownloadResult] = manager.download_multiple_stocks(
+                symbols,
+                source=DataSource.YFINANCE,
+                exchange=Exchange.NASDAQ,
+                interval=Interval.DAILY,
+                save_to_db=False,
+                max_workers=workers
+            )
+
+        cost: float = perf_counter() - start
+
+        print(f"workers={workers}: {len(results)}只股票, 耗时{cost:.2f}秒, {len(results) / cost:.1f}只/秒")
+
+
+def generate_yf_frame(rows: int) -> pd.DataFrame:
+    """
+    生成yfinance格式的合成分钟线数据
+
+    Args:
+        rows: 数据行数
+
+    Returns:
+        pd.DataFrame: 以带时区时间戳为索引的OHLCV数据
+    """
+    rng = np.random.default_rng(0)
+    close: np.ndarray = 100 + rng.standard_normal(rows).cumsum() * 0.01
+
+    index = pd.date_range("2020-01-02 09:30", periods=rows, freq="min", tz="America/New_York")
+
+    return pd.DataFrame(
+        {
+            "Open": close + 0.01,
+            "High": close + 0.05,
+            "Low": close - 0.05,
+            "Close": close,
+            "Volume": rng.integers(100, 10000, rows).astype(float),
+        },
+        index=index
+    )
+
+
+def legacy_convert(df: pd.DataFrame, symbol: str, exchange: Exchange, interval: Interval) -> List[BarData]:
+    """逐行转换的旧实现（iterrows），作为对比基准"""
+    bars: List[BarData] = []
+
+    for timestamp, row in df.iterrows():
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize("UTC")
+        timestamp = timestamp.tz_convert("America/New_York")
+
+        bar = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=convert_tz(timestamp.to_pydatetime()),
+            interval=interval,
+            volume=float(row.get("Volume", 0)),
+            turnover=0.0,
+            open_interest=0.0,
+            open_price=float(row.get("Open", 0)),
+            high_price=float(row.get("High", 0)),
+            low_price=float(row.get("Low", 0)),
+            close_price=float(row.get("Close", 0)),
+            gateway_name="yfinance"
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def benchmark_convert(rows: int, skip_legacy: bool = False) -> None:
+    """
+    对比逐行转换和按列批量转换的速度
+
+    Args:
+        rows: 合成数据行数
+        skip_legacy: 是否跳过耗时较长的逐行转换
+    """
+    df: pd.DataFrame = generate_yf_frame(rows)
+
+    converters: list = [
+        ("vectorized", lambda: convert_dataframe_to_bars(
+            df, "SYM", Exchange.NASDAQ, Interval.MINUTE, "yfinance", naive_tz="UTC"
+        )),
+        ("columns", lambda: convert_dataframe_to_columns(
+            df, "SYM", Exchange.NASDAQ, Interval.MINUTE, "yfinance", naive_tz="UTC"
+        )),
+    ]
+    if not skip_legacy:
+        converters.insert(0, ("iterrows", lambda: legacy_convert(df, "SYM", Exchange.NASDAQ, Interval.MINUTE)))
+
+    for name, func in converters:
+        start: float = perf_counter()
+        count: int = len(func())
+        cost: float = perf_counter() - start
+
+        print(f"{name}: {count}行, 耗时{cost:.2f}秒, {count / cost:,.0f}行/秒")
+
+
+def benchmark_async(symbol_count: int, latency: float, max_workers: int, concurrency: int) -> None:
+    """
+    对比线程池并发下载和异步并发下载的耗时及线程数
+
+    Args:
+        symbol_count: 股票数量
+        latency: 每次请求的模拟延迟（秒）
+        max_workers: 线程池并发下载线程数
+        concurrency: 异步下载最大在途请求数
+    """
+    manager = StockDataManager()
+    manager.downloaders[DataSource.YFINANCE] = FakeStockDownloader(latency)
+
+    symbols: List[str] = [f"SYM{i}" for i in range(symbol_count)]
+    kwargs: dict = {"exchange": Exchange.NASDAQ, "interval": Interval.DAILY, "save_to_db": False}
+
+    def run_threads() -> List[DownloadResult]:
+        return manager.download_multiple_stocks(symbols, max_workers=max_workers, **kwargs)
+
+    runner = AsyncStockDataManager(manager)
+    runner.add_downloader(DataSource.YFINANCE, FakeAsyncStockDownloader(latency))
+
+    def run_async() -> List[DownloadResult]:
+        return runner.run(symbols, max_concurrency=concurrency, **kwargs)
+
+    for name, func in [(f"threads={max_workers}", run_threads), (f"asyncio={concurrency}", run_async)]:
+        peak_threads: int = threading.active_count()
+        stop: threading.Event = threading.Event()
+
+        def watch(stop: threading.Event = stop) -> None:
+            nonlocal peak_threads
+            while not stop.wait(0.01):
+                peak_threads = max(peak_threads, threading.active_count())
+
+        watcher: threading.Thread = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+
+        start: float = perf_counter()
+        with redirect_stdout(StringIO()):
+            results: List[DownloadResult] = func()
+        cost: float = perf_counter() - start
+
+        stop.set()
+        watcher.join()
+
+        # 峰值线程数不含监视线程本身
+        print(
+            f"{name}: {len(results)}只股票, 耗时{cost:.2f}秒, "
+            f"{len(results) / cost:.1f}只/秒, 峰值线程数{peak_threads - 1}"
+        )
+
+    runner.close()
+
+
+class SqliteBarTarget:
+    """写入本地SQLite文件的K线数据库，表结构与vnpy_sqlite的dbbardata一致"""
+
+    def __init__(self, path: Path):
+        """
+        初始化
+
+        Args:
+            path: 数据库文件路径
+        """
+        self.connection: sqlite3.Connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS dbbardata ("
+            "symbol TEXT, exchange TEXT, datetime TIMESTAMP, interval TEXT, "
+            "volume REAL, turnover REAL, open_interest REAL, "
+            "open_price REAL, high_price REAL, low_price REAL, close_price REAL, "
+            "UNIQUE(symbol, exchange, interval, datetime))"
+        )
+        self.lock: threading.Lock = threading.Lock()
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """批量写入K线数据"""
+        rows: list = [
+            (
+                bar.symbol, bar.exchange.value, bar.datetime.replace(tzinfo=None),
+                bar.interval.value if bar.interval else None,
+                bar.volume, bar.turnover, bar.open_interest,
+                bar.open_price, bar.high_price, bar.low_price, bar.close_price
+            )
+            for bar in bars
+        ]
+
+        return self._insert(rows)
+
+    def save_bar_frame(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """直接从DataFrame的列批量写入，不生成BarData"""
+        n: int = len(df)
+
+        rows = zip(
+            [symbol] * n, [exchange.value] * n, df["datetime"].to_list(), [interval.value] * n,
+            df["volume"].to_list(), df["turnover"].to_list(), df["open_interest"].to_list(),
+            df["open"].to_list(), df["high"].to_list(), df["low"].to_list(), df["close"].to_list(),
+            strict=True
+        )
+
+        return self._insert(rows)
+
+    def _insert(self, rows: Iterable[tuple]) -> bool:
+        """在一个事务中写入数据行"""
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO dbbardata VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+
+        return True
+
+    def close(self) -> None:
+        """关闭连接"""
+        self.connection.close()
+
+
+def get_peak_rss() -> Optional[float]:
+    """
+    获取进程峰值内存占用
+
+    Returns:
+        Optional[float]: 峰值RSS（MB），不支持resource模块的平台返回None
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux单位为KB，macOS单位为字节
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def measure_stage(name: str, count: int, func: Callable[[], object]) -> StageResult:
+    """
+    测量单个阶段的耗时和峰值内存
+
+    Args:
+        name: 阶段名称
+        count: 处理的K线数量
+        func: 执行阶段的函数
+
+    Returns:
+        StageResult: 阶段名称、K线数量、耗时、每秒K线数量和峰值RSS
+    """
+    start: float = perf_counter()
+    func()
+    cost: float = perf_counter() - start
+
+    return {
+        "stage": name,
+        "bars": count,
+        "seconds": cost,
+        "bars_per_second": count / cost if cost else 0.0,
+        "peak_rss_mb": get_peak_rss(),
+    }
+
+
+def run_ingest_benchmark(
+    symbol_count: int,
+    rows: int,
+    max_workers: int,
+    target_dir: Path
+) -> IngestResult:
+    """
+    测量数据入库各阶段的吞吐量以及按线程数的扩展情况
+
+    Args:
+        symbol_count: 股票数量
+        rows: 每只股票的合成分钟线行数
+        max_workers: 扩展测试的最大线程数
+        target_dir: SQLite和parquet文件的写入目录
+
+    Returns:
+        IngestResult: 测试参数、各阶段结果和扩展曲线
+    """
+    from vnpy.alpha.lab import AlphaLab
+
+    symbols: List[str] = [f"SYM{i}" for i in range(symbol_count)]
+    frame: pd.DataFrame = generate_yf_frame(rows)
+    total: int = symbol_count * rows
+
+    def convert(symbol: str) -> BarColumns:
+        columns: Optional[BarColumns] = convert_dataframe_to_columns(
+            frame, symbol, Exchange.NASDAQ, Interval.MINUTE, "yfinance", naive_tz="UTC"
+        )
+        if columns is None:
+            raise ValueError(f"合成数据转换失败: {symbol}")
+        return columns
+
+    columns_list: List[BarColumns] = []
+    checker: BarQualityChecker = BarQualityChecker(check_gaps=False)
+    target: SqliteBarTarget = SqliteBarTarget(target_dir.joinpath("benchmark.db"))
+    lab = AlphaLab(str(target_dir.joinpath("lab")))
+
+    def save_database() -> None:
+        buffer: BarWriteBuffer = BarWriteBuffer(target, max_rows=total + 1, max_delay=0)
+        for columns in columns_list:
+            buffer.add(DownloadResult(request=DownloadRequest(columns.symbol), bars=None, success=True, columns=columns))
+        buffer.flush()
+
+    def save_parquet() -> None:
+        for columns in columns_list:
+            lab.save_bar_df(columns.vt_symbol, columns.interval, columns.to_polars())
+
+    stages: List[StageResult] = [
+        measure_stage("convert", total, lambda: columns_list.extend(convert(symbol) for symbol in symbols)),
+        measure_stage("validate", total, lambda: [checker.check(columns) for columns in columns_list]),
+        measure_stage("database_save", total, save_database),
+        measure_stage("parquet_save", total, save_parquet),
+    ]
+
+    target.close()
+
+    # 转换、检查和parquet写入在线程池中按股票并行执行，每种线程数写入新的目录
+    def ingest(symbol: str) -> None:
+        clean, _ = checker.check(convert(symbol))
+        if clean is None:
+            return
+        scaling_lab.save_bar_df(clean.vt_symbol, clean.interval, clean.to_polars())
+
+    scaling: List[ScalingResult] = []
+    workers: int = 1
+
+    while True:
+        scaling_lab = AlphaLab(str(target_dir.joinpath(f"lab_{workers}")))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            stage: StageResult = measure_stage(
+                "ingest", total, lambda: list(executor.map(ingest, symbols))
+            )
+
+        scaling.append({**stage, "workers": workers})
+
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+    return {
+        "symbols": symbol_count,
+        "rows": rows,
+        "bars": total,
+        "stages": stages,
+        "scaling": scaling,
+    }
+
+
+def benchmark_ingest(symbol_count: int, rows: int, max_workers: int, output_json: bool = False) -> None:
+    """
+    测量转换、检查、数据库写入和parquet写入的吞吐量
+
+    Args:
+        symbol_count: 股票数量
+        rows: 每只股票的合成分钟线行数
+        max_workers: 扩展测试的最大线程数
+        output_json: 是否以JSON格式输出结果
+    """
+    with TemporaryDirectory() as temp_dir:
+        with redirect_stdout(StringIO()):
+            results: IngestResult = run_ingest_benchmark(symbol_count, rows, max_workers, Path(temp_dir))
+
+    if output_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{symbol_count}只股票 x {rows}行 = {results['bars']:,}根K线")
+
+    for stage in results["stages"]:
+        print(
+            f"{stage['stage']}: 耗时{stage['seconds']:.2f}秒, {stage['bars_per_second']:,.0f}根/秒, "
+            f"峰值RSS {stage['peak_rss_mb'] or 0:.0f}MB"
+        )
+
+    for stage in results["scaling"]:
+        print(f"workers={stage['workers']}: 耗时{stage['seconds']:.2f}秒, {stage['bars_per_second']:,.0f}根/秒")
+
+
+# 命令行工具、优化和数据集子进程启动时导入的主要模块
+STARTUP_MODULES: List[str] = [
+    "vnpy.event",
+    "vnpy.trader.utility",
+    "vnpy.trader.database",
+    "vnpy.trader.engine",
+    "vnpy.alpha",
+    "vnpy.dataloader",
+]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    解析python -X importtime输出的各模块导入耗时
+
+    Args:
+        output: 子进程的标准错误输出
+
+    Returns:
+        List[ImportRecord]: 模块名称、自身耗时和累计耗时（秒）
+    """
+    records: List[ImportRecord] = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        fields: List[str] = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        records.append({
+            "module": fields[2].strip(),
+            "self_seconds": int(fields[0]) / 1_000_000,
+            "cumulative_seconds": int(fields[1]) / 1_000_000,
+        })
+
+    return records
+
+
+def measure_cold_import(module: str, repeat: int) -> Tuple[float, List[ImportRecord]]:
+    """
+    在新的解释器进程中导入模块，测量最短耗时
+
+    Args:
+        module: 模块名称，为空时只启动解释器
+        repeat: 重复次数
+
+    Returns:
+        Tuple[float, List[ImportRecord]]: 最短进程耗时（秒）和该次运行的导入耗时记录
+    """
+    best: float = 0.0
+    records: List[ImportRecord] = []
+
+    for i in range(repeat):
+        code: str = f"import {module}" if module else "pass"
+
+        start: float = perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        cost: float = perf_counter() - start
+
+        if not i or cost < best:
+            best = cost
+            records = parse_importtime(process.stderr)
+
+    return best, records
+
+
+def run_startup_benchmark(modules: List[str], repeat: int, top: int) -> StartupResult:
+    """
+    测量各入口模块的冷启动导入耗时，并列出导入最慢的模块
+
+    Args:
+        modules: 入口模块列表
+        repeat: 每个模块的重复次数，取最短耗时
+        top: 每个入口模块列出的最慢模块数量
+
+    Returns:
+        StartupResult: 解释器启动耗时和各入口模块的导入耗时及导入分析
+    """
+    baseline, _ = measure_cold_import("", repeat)
+    results: List[ModuleStartupResult] = []
+
+    for module in modules:
+        cost, records = measure_cold_import(module, repeat)
+        records.sort(key=lambda record: record["self_seconds"], reverse=True)
+
+        results.append({
+            "module": module,
+            "seconds": cost,
+            "import_seconds": max(cost - baseline, 0.0),
+            "imported_modules": len(records),
+            "slowest": records[:top],
+        })
+
+    return {
+        "python_seconds": baseline,
+        "repeat": repeat,
+        "modules": results,
+    }
+
+
+def benchmark_startup(modules: List[str], repeat: int, top: int, output_json: bool = False) -> None:
+    """
+    输出入口模块冷启动导入耗时
+
+    Args:
+        modules: 入口模块列表
+        repeat: 每个模块的重复次数
+        top: 每个入口模块列出的最慢模块数量
+        output_json: 是否以JSON格式输出结果
+    """
+    results: StartupResult = run_startup_benchmark(modules, repeat, top)
+
+    if output_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"解释器启动耗时{results['python_seconds'] * 1000:.0f}毫秒")
+
+    for result in results["modules"]:
+        print(
+            f"{result['module']}: 导入耗时{result['import_seconds'] * 1000:.0f}毫秒, "
+            f"共导入{result['imported_modules']}个模块"
+        )
+
+        for record in result["slowest"]:
+            print(
+                f"    {record['module']}: 自身{record['self_seconds'] * 1000:.1f}毫秒, "
+                f"累计{record['cumulative_seconds'] * 1000:.1f}毫秒"
+            )
+
+
+def main() -> None:
+    """命令行入口"""
+    parser = ArgumentParser(description="dataloader性能基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    download_parser = subparsers.add_parser("download", help="顺序与并发批量下载对比")
+    download_parser.add_argument("--symbols", type=int, default=200, help="股票数量")
+    download_parser.add_argument("--latency", type=float, default=0.05, help="模拟请求延迟（秒）")
+    download_parser.add_argument("--workers", type=int, default=16, help="并发下载线程数")
+
+    convert_parser = subparsers.add_parser("convert", help="DataFrame到BarData转换速度对比")
+    convert_parser.add_argument("--rows", type=int, default=1_000_000, help="合成数据行数")
+    convert_parser.add_argument("--skip-legacy", action="store_true", help="跳过逐行转换的旧实现")
+
+    async_parser = subparsers.add_parser("async", help="线程池与asyncio并发下载对比")
+    async_parser.add_argument("--symbols", type=int, default=1000, help="股票数量")
+    async_parser.add_argument("--latency", type=float, default=0.2, help="模拟请求延迟（秒）")
+    async_parser.add_argument("--workers", type=int, default=16, help="线程池并发下载线程数")
+    async_parser.add_argument("--concurrency", type=int, default=500, help="异步最大在途请求数")
+
+    ingest_parser = subparsers.add_parser("ingest", help="转换、检查、数据库和parquet写入吞吐量")
+    ingest_parser.add_argument("--symbols", type=int, default=50, help="股票数量")
+    ingest_parser.add_argument("--rows", type=int, default=20_000, help="每只股票的合成分钟线行数")
+    ingest_parser.add_argument("--workers", type=int, default=8, help="扩展测试的最大线程数")
+    ingest_parser.add_argument("--json", action="store_true", help="以JSON格式输出结果")
+
+    startup_parser = subparsers.add_parser("startup", help="入口模块冷启动导入耗时")
+    startup_parser.add_argument("--modules", nargs="+", default=STARTUP_MODULES, help="入口模块")
+    startup_parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最短耗时")
+    startup_parser.add_argument("--top", type=int, default=10, help="列出导入最慢的模块数量")
+    startup_parser.add_argument("--json", action="store_true", help="以JSON格式输出结果")
+
+    args = parser.parse_args()
+
+    if args.command == "download":
+        benchmark_download(args.symbols, args.latency, args.workers)
+    elif args.command == "convert":
+        benchmark_convert(args.rows, args.skip_legacy)
+    elif args.command == "async":
+        benchmark_async(args.symbols, args.latency, args.workers, args.concurrency)
+    elif args.command == "ingest":
+        benchmark_ingest(args.symbols, args.rows, args.workers, args.json)
+    elif args.command == "startup":
+        benchmark_startup(args.modules, args.repeat, args.top, args.json)
+
+
+if __name__ == "__main__":
+    main()
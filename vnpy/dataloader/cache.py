@@ -0,0 +1,295 @@
+"""
+数据源响应缓存
+
+将数据源返回的原始DataFrame以parquet格式缓存到本地磁盘，
+按(数据源, 股票代码, 时间间隔, 开始时间, 结束时间)作为键，
+支持过期时间和按总大小淘汰最久未使用的缓存文件。
+
+缓存文件的大小和访问顺序保存在内存索引中，只在创建时扫描一次缓存目录，
+写入时根据索引中的总大小判断是否需要淘汰，不再重新扫描目录。
+"""
+
+import os
+from collections import OrderedDict
+from hashlib import sha1
+from pathlib import Path
+from threading import Lock, get_ident
+from time import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from vnpy.trader.utility import get_folder_path
+
+
+class ResponseCache:
+    """数据源响应磁盘缓存"""
+
+    def __init__(self,
+                 cache_path: Optional[Union[str, Path]] = None,
+                 ttl: float = 24 * 60 * 60,
+                 max_bytes: int = 1024 * 1024 * 1024):
+        """
+        初始化
+
+        Args:
+            cache_path: 缓存目录，默认为.vntrader/dataloader_cache
+            ttl: 缓存有效期（秒），0表示永不过期
+            max_bytes: 缓存目录最大字节数，超过后淘汰最久未使用的文件
+        """
+        if cache_path:
+            self.cache_path: Path = Path(cache_path)
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+        else:
+            self.cache_path = get_folder_path("dataloader_cache")
+
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self.lock: Lock = Lock()
+
+        # 缓存键到文件字节数的索引，按访问时间从旧到新排列
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.total_bytes: int = 0
+        self.load_index()
+
+    def make_key(self, source: str, symbol: str, interval: str, start: object, end: object) -> str:
+        """
+        生成缓存键
+
+        Args:
+            source: 数据源名称
+            symbol: 股票代码
+            interval: 时间间隔
+            start: 开始时间
+            end: 结束时间
+
+        Returns:
+            str: 缓存键
+        """
+        text: str = "|".join(str(part) for part in (source, symbol, interval, start, end))
+        return sha1(text.encode("utf-8")).hexdigest()
+
+    def get_file_path(self, key: str) -> Path:
+        """获取缓存键对应的文件路径"""
+        return self.cache_path.joinpath(f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        读取缓存，过期或不存在时返回None
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[pd.DataFrame]: 缓存的数据
+        """
+        file_path: Path = self.get_file_path(key)
+
+        try:
+            stat: os.stat_result = file_path.stat()
+        except FileNotFoundError:
+            self.discard(key)
+            return None
+
+        now: float = time()
+
+        # 修改时间即写入时间，用于判断是否过期
+        if self.ttl and now - stat.st_mtime > self.ttl:
+            file_path.unlink(missing_ok=True)
+            self.discard(key)
+            return None
+
+        try:
+            df: pd.DataFrame = pd.read_parquet(file_path)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            self.discard(key)
+            return None
+
+        # 访问时间用于重新创建时恢复淘汰顺序
+        os.utime(file_path, (now, stat.st_mtime))
+        self.track(key, stat.st_size)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        写入缓存，空数据不缓存
+
+        Args:
+            key: 缓存键
+            df: 数据源返回的数据
+        """
+        if df is None or df.empty:
+            return
+
+        file_path: Path = self.get_file_path(key)
+        temp_path: Path = self.cache_path.joinpath(f"{key}.{os.getpid()}.{get_ident()}.tmp")
+
+        try:
+            df.to_parquet(temp_path)
+            os.replace(temp_path, file_path)
+            size: int = file_path.stat().st_size
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            print(f"写入数据缓存失败: {e}")
+            return
+
+        self.track(key, size)
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def get_or_fetch(self,
+                     source: str,
+                     symbol: str,
+                     interval: str,
+                     start: object,
+                     end: object,
+                     fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        优先读取缓存，未命中时调用fetch获取数据并写入缓存
+
+        Args:
+            source: 数据源名称
+            symbol: 股票代码
+            interval: 时间间隔
+            start: 开始时间
+            end: 结束时间
+            fetch: 请求数据源的函数
+
+        Returns:
+            pd.DataFrame: 数据源返回的数据
+        """
+        df: Optional[pd.DataFrame] = self.lookup(source, symbol, interval, start, end)
+        if df is not None:
+            return df
+
+        df = fetch()
+        self.store(source, symbol, interval, start, end, df)
+        return df
+
+    def lookup(self, source: str, symbol: str, interval: str, start: object, end: object) -> Optional[pd.DataFrame]:
+        """
+        读取缓存并更新命中统计
+
+        Args:
+            source: 数据源名称
+            symbol: 股票代码
+            interval: 时间间隔
+            start: 开始时间
+            end: 结束时间
+
+        Returns:
+            Optional[pd.DataFrame]: 缓存的数据，未命中时返回None
+        """
+        df: Optional[pd.DataFrame] = self.get(self.make_key(source, symbol, interval, start, end))
+
+        with self.lock:
+            if df is not None:
+                self.hit_count += 1
+            else:
+                self.miss_count += 1
+
+        return df
+
+    def store(self, source: str, symbol: str, interval: str, start: object, end: object, df: pd.DataFrame) -> None:
+        """
+        按请求参数写入缓存
+
+        Args:
+            source: 数据源名称
+            symbol: 股票代码
+            interval: 时间间隔
+            start: 开始时间
+            end: 结束时间
+            df: 数据源返回的数据
+        """
+        self.put(self.make_key(source, symbol, interval, start, end), df)
+
+    def load_index(self) -> None:
+        """扫描缓存目录重建内存索引，删除过期文件，总大小超过上限时淘汰最久未使用的文件"""
+        now: float = time()
+        files: List[Tuple[float, str, int]] = []
+
+        with os.scandir(self.cache_path) as it:
+            for entry in it:
+                if not entry.name.endswith(".parquet"):
+                    continue
+
+                stat: os.stat_result = entry.stat()
+                if self.ttl and now - stat.st_mtime > self.ttl:
+                    Path(entry.path).unlink(missing_ok=True)
+                    continue
+
+                files.append((stat.st_atime, entry.name[:-len(".parquet")], stat.st_size))
+
+        files.sort()
+
+        with self.lock:
+            self.entries = OrderedDict((key, size) for _, key, size in files)
+            self.total_bytes = sum(self.entries.values())
+
+        self.evict()
+
+    def track(self, key: str, size: int) -> None:
+        """在索引中记录缓存文件并标记为最近使用"""
+        with self.lock:
+            self.total_bytes += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+
+    def discard(self, key: str) -> None:
+        """从索引中移除已删除的缓存文件"""
+        with self.lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+
+    def evict(self) -> None:
+        """总大小超过上限时按索引中的访问顺序淘汰最久未使用的文件"""
+        evicted: List[str] = []
+
+        with self.lock:
+            while self.total_bytes > self.max_bytes and self.entries:
+                key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                evicted.append(key)
+
+        for key in evicted:
+            self.get_file_path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """清空缓存文件和统计"""
+        for file_path in self.cache_path.glob("*.parquet"):
+            file_path.unlink(missing_ok=True)
+
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def get_size(self) -> int:
+        """获取缓存文件总字节数"""
+        with self.lock:
+            return self.total_bytes
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, float]: 命中次数、未命中次数、命中率和缓存大小
+        """
+        with self.lock:
+            hit_count: int = self.hit_count
+            miss_count: int = self.miss_count
+
+        total: int = hit_count + miss_count
+
+        return {
+            "hit_count": hit_count,
+            "miss_count": miss_count,
+            "hit_rate": hit_count / total if total else 0.0,
+            "size": self.get_size(),
+        }
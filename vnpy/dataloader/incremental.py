@@ -0,0 +1,339 @@
+"""
+增量下载
+
+根据数据库K线概览或AlphaLab的parquet文件判断本地已有数据的时间范围，
+只下载请求区间中缺失的部分，再将各段结果合并为一个下载结果。
+"""
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BarOverview, BaseDatabase, convert_tz, get_db_tz
+from vnpy.trader.calendar import TradingCalendar, get_calendar
+
+from .base import BarColumns, BaseStockDownloader, DownloadRequest, DownloadResult
+
+if TYPE_CHECKING:
+    from vnpy.alpha.lab import AlphaLab
+
+
+# K线间隔对应的时间长度
+INTERVAL_DELTA: Dict[Interval, timedelta] = {
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(weeks=1),
+}
+
+
+def to_db_datetime(dt: Optional[datetime]) -> Optional[datetime]:
+    """
+    转换为数据库时区且不含时区信息的时间，便于和本地数据比较
+
+    Args:
+        dt: 时间，可以带时区
+
+    Returns:
+        Optional[datetime]: 数据库时区时间
+    """
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return convert_tz(dt)
+
+
+def compute_missing_ranges(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    stored: Optional[Tuple[datetime, datetime]],
+    interval: Interval,
+    calendar: Optional[TradingCalendar] = None
+) -> List[Tuple[Optional[datetime], Optional[datetime]]]:
+    """
+    计算请求区间中本地数据没有覆盖的部分
+
+    本地数据视为[stored_start, stored_end]之间的连续区间，因此缺口最多为头尾两段。
+    start为None时表示不限制开始时间，此时不补充头部数据。头部缺口的结束时间为stored_start，
+    数据源通常不包含结束时间当天的数据，重复的首根K线在保存时覆盖。
+
+    Args:
+        start: 请求开始时间
+        end: 请求结束时间，None表示到最新
+        stored: 本地数据的(开始时间, 结束时间)，数据库时区
+        interval: K线间隔
+        calendar: 交易日历，设置后跳过日历覆盖范围内没有交易日的缺口（如周末）
+
+    Returns:
+        List[Tuple[Optional[datetime], Optional[datetime]]]: 需要下载的(开始时间, 结束时间)列表
+    """
+    if not stored:
+        return [(start, end)]
+
+    stored_start, stored_end = stored
+    delta: timedelta = INTERVAL_DELTA.get(interval, timedelta(days=1))
+
+    db_start: Optional[datetime] = to_db_datetime(start)
+    db_end: Optional[datetime] = to_db_datetime(end)
+
+    ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = []
+
+    # 头部缺口
+    if db_start and db_start < stored_start:
+        head_end: datetime = min(stored_start, db_end) if db_end else stored_start
+        if head_end > db_start and has_sessions(calendar, db_start, head_end):
+            ranges.append((start, head_end.replace(tzinfo=get_db_tz())))
+
+    # 尾部缺口
+    if db_end is None or db_end > stored_end:
+        tail_start: datetime = max(stored_end + delta, db_start) if db_start else stored_end + delta
+        if (db_end is None or tail_start <= db_end) and has_sessions(calendar, tail_start, db_end):
+            ranges.append((tail_start.replace(tzinfo=get_db_tz()), end))
+
+    return ranges
+
+
+def has_sessions(calendar: Optional[TradingCalendar], start: datetime, end: Optional[datetime]) -> bool:
+    """
+    检查时间区间内是否可能有交易，只有交易日历完整覆盖区间且区间内没有交易日时返回False
+
+    Args:
+        calendar: 交易日历，None表示不检查
+        start: 开始时间，数据库时区
+        end: 结束时间，None表示到当前时间
+
+    Returns:
+        bool: 是否需要下载
+    """
+    if not calendar or not len(calendar):
+        return True
+
+    # 日内数据按交易日判断，开始时间取当天零点
+    first: datetime = start.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    last: datetime = end.replace(tzinfo=None) if end else datetime.now(get_db_tz()).replace(tzinfo=None)
+
+    if calendar.sessions[-1] < np.datetime64(last, "us"):
+        return True
+
+    return calendar.count_sessions(first, last) > 0
+
+
+def get_lab_range(lab: "AlphaLab", vt_symbol: str, interval: Interval) -> Optional[Tuple[datetime, datetime]]:
+    """
+    读取AlphaLab中parquet文件的数据时间范围
+
+    Args:
+        lab: AlphaLab实例
+        vt_symbol: 本地代码
+        interval: K线间隔，仅支持日线和分钟线
+
+    Returns:
+        Optional[Tuple[datetime, datetime]]: (开始时间, 结束时间)，没有数据时返回None
+    """
+    import polars as pl
+
+    file_path: Optional[Path] = lab.get_bar_path(vt_symbol, interval)
+    if not file_path:
+        return None
+
+    # 包含尚未合并的分段文件，持有文件锁避免读取期间分段文件被合并删除
+    with lab.get_file_lock(file_path):
+        paths: List[Path] = lab.get_bar_paths(vt_symbol, interval)
+        if not paths:
+            return None
+
+        df: pl.DataFrame = pl.concat([pl.scan_parquet(path) for path in paths], how="vertical_relaxed").select(
+            pl.col("datetime").min().alias("start"),
+            pl.col("datetime").max().alias("end")
+        ).collect()
+
+    start, end = df.row(0)
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+class IncrementalDownloader(BaseStockDownloader):
+    """
+    只下载本地缺失数据的下载器包装
+
+    已有数据的范围应该从下载结果写入的位置读取：保存到数据库时传入database，
+    写入AlphaLab时传入lab，否则写入位置的数据不会前进，每次都会重复下载。
+    """
+
+    def __init__(
+        self,
+        downloader: BaseStockDownloader,
+        database: Optional[BaseDatabase] = None,
+        lab: Optional["AlphaLab"] = None
+    ) -> None:
+        """
+        初始化
+
+        Args:
+            downloader: 实际执行下载的下载器
+            database: 用于查询K线概览的数据库
+            lab: AlphaLab实例，设置后根据parquet文件判断已有数据
+        """
+        super().__init__(f"Incremental{downloader.name}")
+        self.source = downloader.source
+        self.downloader: BaseStockDownloader = downloader
+        self.database: Optional[BaseDatabase] = database
+        self.lab: Optional["AlphaLab"] = lab
+
+        # 沿用被包装下载器的分段和合并请求设置，缺失区间仍按数据源限制拆分和合并
+        self.chunk_sizes = downloader.chunk_sizes
+        self.chunk_workers = downloader.chunk_workers
+        self.batch_size = downloader.batch_size
+
+        self.overviews: Optional[Dict[Tuple[str, Optional[Exchange], Optional[Interval]], BarOverview]] = None
+
+    def init_connection(self, **kwargs) -> bool:
+        """初始化被包装下载器的连接"""
+        return self.downloader.init_connection(**kwargs)
+
+    def reload_overviews(self) -> None:
+        """重新加载数据库K线概览"""
+        self.overviews = {}
+
+        if not self.database:
+            return
+
+        for overview in self.database.get_bar_overview():
+            self.overviews[(overview.symbol, overview.exchange, overview.interval)] = overview
+
+    def get_stored_range(self, request: DownloadRequest) -> Optional[Tuple[datetime, datetime]]:
+        """
+        查询本地已有数据的时间范围
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            Optional[Tuple[datetime, datetime]]: (开始时间, 结束时间)，没有数据时返回None
+        """
+        if self.lab:
+            return get_lab_range(self.lab, request.vt_symbol, request.interval)
+
+        if self.overviews is None:
+            self.reload_overviews()
+
+        overviews = self.overviews or {}
+        overview: Optional[BarOverview] = overviews.get((request.symbol, request.exchange, request.interval))
+        if not overview or not overview.count or not overview.start or not overview.end:
+            return None
+        return overview.start, overview.end
+
+    def get_missing_requests(self, request: DownloadRequest) -> List[DownloadRequest]:
+        """
+        将请求拆分为本地数据没有覆盖的缺失区间请求
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            List[DownloadRequest]: 缺失区间的下载请求，本地数据已覆盖请求区间时为空
+        """
+        stored: Optional[Tuple[datetime, datetime]] = self.get_stored_range(request)
+        ranges = compute_missing_ranges(
+            request.start_date, request.end_date, stored, request.interval, get_calendar(request.exchange)
+        )
+
+        return [replace(request, start_date=start, end_date=end) for start, end in ranges]
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """
+        只下载缺失区间并合并结果
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 合并后的下载结果，本地数据已覆盖请求区间时返回成功的空结果
+        """
+        requests: List[DownloadRequest] = self.get_missing_requests(request)
+        if not requests:
+            return DownloadResult(request=request, bars=[], success=True)
+
+        results: List[DownloadResult] = [self.downloader.download_bars(r) for r in requests]
+        return merge_results(request, results)
+
+    def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        批量增量下载，所有请求的缺失区间一起交给被包装下载器
+
+        本地数据结束时间相同的股票尾部缺口也相同，仍然可以使用数据源的多股票合并请求。
+
+        Args:
+            requests: 下载请求列表
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        missing: List[List[DownloadRequest]] = [self.get_missing_requests(request) for request in requests]
+
+        flat: List[DownloadRequest] = [r for request_missing in missing for r in request_missing]
+        flat_results: List[DownloadResult] = self.downloader.download_bars_batch(flat) if flat else []
+
+        results: List[DownloadResult] = []
+        n: int = 0
+
+        for request, request_missing in zip(requests, missing, strict=True):
+            if not request_missing:
+                results.append(DownloadResult(request=request, bars=[], success=True))
+                continue
+
+            results.append(merge_results(request, flat_results[n:n + len(request_missing)]))
+            n += len(request_missing)
+
+        return results
+
+    def is_support_interval(self, interval: Interval) -> bool:
+        """检查被包装下载器是否支持指定的时间间隔"""
+        return self.downloader.is_support_interval(interval)
+
+    def get_supported_intervals(self) -> List[Interval]:
+        """获取被包装下载器支持的时间间隔"""
+        return self.downloader.get_supported_intervals()
+
+    def get_supported_exchanges(self) -> List[Exchange]:
+        """获取被包装下载器支持的交易所"""
+        return self.downloader.get_supported_exchanges()
+
+
+def merge_results(request: DownloadRequest, results: List[DownloadResult]) -> DownloadResult:
+    """
+    合并同一合约多段下载结果
+
+    Args:
+        request: 原始下载请求
+        results: 各段下载结果
+
+    Returns:
+        DownloadResult: 合并后的下载结果，任一段有数据即为成功，ranges记录实际下载的各段时间范围
+    """
+    ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = [
+        (r.request.start_date, r.request.end_date) for r in results
+    ]
+
+    if len(results) == 1:
+        result: DownloadResult = results[0]
+        result.request = request
+        result.ranges = ranges
+        return result
+
+    columns: Optional[BarColumns] = BarColumns.concat([r.get_columns() for r in results])
+    error_msg: str = "; ".join(r.error_msg for r in results if not r.success and r.error_msg)
+
+    return DownloadResult(
+        request=request,
+        bars=None,
+        columns=columns,
+        success=columns is not None,
+        error_msg=error_msg,
+        retryable=columns is None and any(r.retryable for r in results),
+        ranges=ranges
+    )
@@ -0,0 +1,334 @@
+"""
+可恢复的批量下载任务
+
+将批量下载拆分为(股票代码, 时间间隔, 时间范围)下载单元，已完成的单元记录在
+.vntrader/dataloader_jobs下的JSONL日志中，任务中断后重新运行时跳过已完成的单元。
+运行期间定期输出进度、预计剩余时间和各数据源的下载速度。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Set, Union
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.utility import get_folder_path
+
+from .base import DownloadRequest, DownloadResult, DataSource
+from .manager import StockDataManager
+
+
+class DownloadJournal:
+    """下载单元完成记录，每行一条JSON记录，只追加写入"""
+
+    def __init__(self, name: str, journal_path: Optional[Union[str, Path]] = None):
+        """
+        初始化
+
+        Args:
+            name: 任务名称
+            journal_path: 日志文件路径，默认为.vntrader/dataloader_jobs/<任务名称>.jsonl
+        """
+        if journal_path:
+            self.journal_path: Path = Path(journal_path)
+        else:
+            self.journal_path = get_folder_path("dataloader_jobs").joinpath(f"{name}.jsonl")
+
+        self.completed: Set[str] = set()
+        self.lock: Lock = Lock()
+
+        self.load()
+
+    @staticmethod
+    def make_key(source: DataSource, request: DownloadRequest) -> str:
+        """
+        生成下载单元的键
+
+        未指定结束时间的请求以当天日期作为结束时间，每天运行时视为新的下载单元，
+        同一天内中断后重新运行仍可跳过已完成的单元。
+
+        Args:
+            source: 数据源
+            request: 下载请求
+
+        Returns:
+            str: 下载单元键
+        """
+        start: str = request.start_date.isoformat() if request.start_date else ""
+        if request.end_date:
+            end: str = request.end_date.isoformat()
+        else:
+            end = datetime.now().date().isoformat()
+        return "|".join((source.value, request.vt_symbol, request.interval.value, start, end))
+
+    def load(self) -> None:
+        """读取日志中已完成的下载单元"""
+        self.completed.clear()
+
+        if not self.journal_path.exists():
+            return
+
+        with open(self.journal_path, encoding="UTF-8") as f:
+            for line in f:
+                # 进程中断时最后一行可能不完整
+                try:
+                    record: dict = json.loads(line)
+                except ValueError:
+                    continue
+
+                if record.get("success"):
+                    self.completed.add(record["key"])
+
+    def is_completed(self, key: str) -> bool:
+        """检查下载单元是否已完成"""
+        return key in self.completed
+
+    def record(self, source: DataSource, result: DownloadResult, saved: bool = True) -> None:
+        """
+        记录下载单元结果，成功的单元之后将被跳过
+
+        Args:
+            source: 数据源
+            result: 下载结果
+            saved: 下载数据是否已确认写入，未写入时记录为失败
+        """
+        key: str = self.make_key(source, result.request)
+        success: bool = result.success and saved
+
+        record: dict = {
+            "key": key,
+            "success": success,
+            "count": result.total_count,
+            "error_msg": result.error_msg if saved else "数据保存失败",
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+
+        with self.lock:
+            with open(self.journal_path, mode="a", encoding="UTF-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            if success:
+                self.completed.add(key)
+
+    def reset(self) -> None:
+        """删除日志，之后所有下载单元都将重新下载"""
+        with self.lock:
+            self.journal_path.unlink(missing_ok=True)
+            self.completed.clear()
+
+
+class JobProgress:
+    """下载任务进度统计"""
+
+    def __init__(self, total: int, skipped: int = 0):
+        """
+        初始化
+
+        Args:
+            total: 下载单元总数
+            skipped: 之前已完成而跳过的单元数
+        """
+        self.total: int = total
+        self.skipped: int = skipped
+        self.done: int = 0
+        self.failed: int = 0
+
+        self.start_time: float = monotonic()
+        self.source_counts: Dict[DataSource, int] = {}
+
+    def update(self, source: DataSource, result: DownloadResult) -> None:
+        """记录一个下载单元结果"""
+        self.done += 1
+
+        if result.success:
+            self.source_counts[source] = self.source_counts.get(source, 0) + result.total_count
+        else:
+            self.failed += 1
+
+    def mark_failed(self, source: DataSource, result: DownloadResult) -> None:
+        """将已统计为成功但未能保存的下载单元改为失败"""
+        self.failed += 1
+        self.source_counts[source] = self.source_counts.get(source, 0) - result.total_count
+
+    def get_elapsed(self) -> float:
+        """获取已运行秒数"""
+        return monotonic() - self.start_time
+
+    def get_eta(self) -> Optional[float]:
+        """
+        根据已完成单元的速度估算剩余秒数
+
+        Returns:
+            Optional[float]: 剩余秒数，尚无完成单元时返回None
+        """
+        if not self.done:
+            return None
+
+        remaining: int = self.total - self.skipped - self.done
+        return remaining * self.get_elapsed() / self.done
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        获取进度统计
+
+        Returns:
+            Dict[str, object]: 单元总数、已跳过、已完成、失败数、已运行秒数、预计剩余秒数和各数据源每秒下载数据量
+        """
+        elapsed: float = self.get_elapsed()
+
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "done": self.done,
+            "failed": self.failed,
+            "elapsed": elapsed,
+            "eta": self.get_eta(),
+            "throughput": {
+                source.value: count / elapsed if elapsed else 0.0
+                for source, count in self.source_counts.items()
+            },
+        }
+
+    def __str__(self) -> str:
+        """进度描述"""
+        finished: int = self.skipped + self.done
+        percent: float = finished / self.total * 100 if self.total else 100.0
+
+        eta: Optional[float] = self.get_eta()
+        eta_text: str = f"{int(eta) // 60:02d}:{int(eta) % 60:02d}" if eta is not None else "--:--"
+
+        elapsed: float = self.get_elapsed()
+        speeds: str = ", ".join(
+            f"{source.value}: {count / elapsed if elapsed else 0:,.0f}条/秒"
+            for source, count in self.source_counts.items()
+        )
+
+        return (
+            f"进度: {finished}/{self.total} ({percent:.1f}%), 失败: {self.failed}, "
+            f"预计剩余: {eta_text}" + (f", {speeds}" if speeds else "")
+        )
+
+
+class DownloadJob:
+    """可恢复的批量下载任务"""
+
+    def __init__(self,
+                 manager: StockDataManager,
+                 name: str,
+                 journal_path: Optional[Union[str, Path]] = None,
+                 checkpoint_size: int = 100,
+                 report_interval: float = 10.0):
+        """
+        初始化
+
+        Args:
+            manager: 执行下载的数据管理器
+            name: 任务名称，同名任务共用完成记录
+            journal_path: 日志文件路径，默认为.vntrader/dataloader_jobs/<任务名称>.jsonl
+            checkpoint_size: 每批下载的股票数量，每批数据写入数据库后才记录为已完成
+            report_interval: 输出进度的间隔秒数
+        """
+        self.manager: StockDataManager = manager
+        self.journal: DownloadJournal = DownloadJournal(name, journal_path)
+        self.checkpoint_size: int = max(checkpoint_size, 1)
+        self.report_interval: float = report_interval
+
+        self.progress: Optional[JobProgress] = None
+        self.report_time: float = 0
+
+    def run(self,
+            symbols: List[str],
+            source: DataSource = DataSource.YFINANCE,
+            exchange: Exchange = Exchange.NYSE,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            interval: Interval = Interval.DAILY,
+            save_to_db: bool = True,
+            max_workers: int = 1,
+            incremental: bool = False) -> List[DownloadResult]:
+        """
+        运行下载任务，跳过之前已完成的下载单元
+
+        未指定结束时间时按运行当天区分下载单元，不同日期的运行不会跳过之前已完成的
+        单元，例如每天运行的增量下载任务；同一天内需要重新下载时调用journal.reset()。
+
+        Args:
+            symbols: 股票代码列表
+            source: 数据源
+            exchange: 交易所
+            start_date: 开始时间
+            end_date: 结束时间
+            interval: 时间间隔
+            save_to_db: 是否保存到数据库
+            max_workers: 下载线程数
+            incremental: 是否只下载本地缺失的数据
+
+        Returns:
+            List[DownloadResult]: 本次运行的下载结果列表
+        """
+        pending: List[str] = [
+            symbol for symbol in symbols
+            if not self.journal.is_completed(
+                self.journal.make_key(source, DownloadRequest(symbol, exchange, start_date, end_date, interval))
+            )
+        ]
+
+        self.progress = JobProgress(len(symbols), len(symbols) - len(pending))
+        self.report_time = monotonic()
+
+        if len(pending) < len(symbols):
+            print(f"跳过已完成的下载单元: {len(symbols) - len(pending)}")
+
+        results: List[DownloadResult] = []
+        progress: JobProgress = self.progress
+
+        for n in range(0, len(pending), self.checkpoint_size):
+            self.manager.write_failures.clear()
+
+            batch_results: List[DownloadResult] = self.manager.download_multiple_stocks(
+                symbols=pending[n:n + self.checkpoint_size],
+                source=source,
+                exchange=exchange,
+                start_date=start_date,
+                end_date=end_date,
+                interval=interval,
+                save_to_db=save_to_db,
+                max_workers=max_workers,
+                callback=lambda result: self.on_result(source, result),
+                incremental=incremental
+            )
+
+            # 本批写入缓冲已全部写入数据库，只有确认保存成功的单元记录为已完成
+            for result in batch_results:
+                saved: bool = not save_to_db or not self.is_write_failed(result)
+                if result.success and not saved:
+                    progress.mark_failed(source, result)
+
+                self.journal.record(source, result, saved)
+
+            results.extend(batch_results)
+
+        print(progress)
+        return results
+
+    def is_write_failed(self, result: DownloadResult) -> bool:
+        """检查下载结果的数据是否保存失败"""
+        request: DownloadRequest = result.request
+        return (request.symbol, request.exchange, request.interval) in self.manager.write_failures
+
+    def on_result(self, source: DataSource, result: DownloadResult) -> None:
+        """更新进度，到达输出间隔时输出进度"""
+        if not self.progress:
+            return
+        self.progress.update(source, result)
+
+        now: float = monotonic()
+        if now - self.report_time >= self.report_interval:
+            self.report_time = now
+            print(self.progress)
+
+    def reset(self) -> None:
+        """清除完成记录"""
+        self.journal.reset()
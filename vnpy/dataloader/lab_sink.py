@@ -0,0 +1,150 @@
+"""
+AlphaLab流式写入
+
+将下载结果按段直接追加为AlphaLab中每只股票的parquet分段文件，不读取和重写已有数据，
+分段文件之后在后台合并到主文件。配合分段下载使用时内存占用与历史数据长度无关。
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+from vnpy.trader.constant import Interval
+
+from .base import BarColumns, BaseStockDownloader, DownloadRequest, DownloadResult
+from .quality import BarQualityChecker
+
+
+class LabBarSink:
+    """AlphaLab K线分段文件写入器"""
+
+    def __init__(self, lab, checker: Optional[BarQualityChecker] = None):
+        """
+        初始化
+
+        Args:
+            lab: AlphaLab实例
+            checker: 写入前执行的数据质量检查
+        """
+        self.lab = lab
+        self.checker: Optional[BarQualityChecker] = checker
+
+        # 写入过分段文件、等待合并的(本地代码, 时间间隔)
+        self.pending: Set[Tuple[str, Interval]] = set()
+
+        self.write_count: int = 0
+        self.part_count: int = 0
+        self.lock: Lock = Lock()
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def write(self, result: DownloadResult) -> bool:
+        """
+        将下载结果追加为分段文件，可以作为download_bars_chunked的sink或DownloadPipeline的writer
+
+        Args:
+            result: 下载结果
+
+        Returns:
+            bool: 是否写入了数据
+        """
+        if not result.success or not result.total_count:
+            return False
+
+        if self.checker:
+            result = self.checker.check_result(result)
+            if not result.success:
+                return False
+
+        columns: Optional[BarColumns] = result.get_columns()
+        if columns is None or not len(columns):
+            return False
+
+        part_path = self.lab.append_bar_df(columns.vt_symbol, columns.interval, columns.to_polars())
+        if not part_path:
+            return False
+
+        with self.lock:
+            self.pending.add((columns.vt_symbol, columns.interval))
+            self.write_count += len(columns)
+            self.part_count += 1
+
+        return True
+
+    def __call__(self, result: DownloadResult) -> bool:
+        """同write"""
+        return self.write(result)
+
+    def download(self, downloader: BaseStockDownloader, request: DownloadRequest) -> DownloadResult:
+        """
+        下载并写入AlphaLab，需要分段下载时每段到达后立即写入
+
+        Args:
+            downloader: 下载器
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 下载结果，分段下载时只包含数据总量而不包含数据
+        """
+        if len(downloader.split_request(request)) > 1:
+            return downloader.download_bars_chunked(request, sink=self.write)
+
+        result: DownloadResult = downloader.download_bars(request)
+        self.write(result)
+        return result
+
+    def compact(self) -> int:
+        """
+        将等待合并的分段文件合并到主文件
+
+        Returns:
+            int: 合并的分段文件数量
+        """
+        with self.lock:
+            pending: List[Tuple[str, Interval]] = list(self.pending)
+            self.pending.clear()
+
+        count: int = 0
+
+        for vt_symbol, interval in pending:
+            try:
+                count += self.lab.compact_bar_data(vt_symbol, interval)
+            except Exception as e:
+                print(f"分段文件合并失败: {vt_symbol}, 错误: {e}")
+
+                with self.lock:
+                    self.pending.add((vt_symbol, interval))
+
+        return count
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取写入统计
+
+        Returns:
+            Dict[str, int]: 写入数据量、分段文件数量和等待合并的股票数量
+        """
+        with self.lock:
+            return {
+                "write_count": self.write_count,
+                "part_count": self.part_count,
+                "pending_count": len(self.pending),
+            }
+
+    def compact_async(self) -> Future:
+        """
+        在后台线程中合并分段文件
+
+        Returns:
+            Future: 合并任务，结果为合并的分段文件数量
+        """
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        return self.executor.submit(self.compact)
+
+    def close(self) -> None:
+        """等待后台合并完成"""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -4,8 +4,10 @@
 统一管理多个数据源的股票数据下载和数据库存储功能。
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, Generator, Iterator, List, Dict, Optional, Set, Tuple
 from enum import Enum
 
 from vnpy.trader.database import get_database
@@ -16,6 +18,13 @@ from .base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSour
 from .vnpy_downloader import VnpyStockDownloader
 from .yfinance_downloader import YfinanceStockDownloader
 from .akshare_downloader import AkshareStockDownloader
+from .pipeline import DownloadPipeline
+from .incremental import IncrementalDownloader
+from .cache import ResponseCache
+from .writer import BarWriteBuffer, BufferKey
+from .resilience import CircuitBreaker, ResilientDownloader, RetryPolicy
+from .lab_sink import LabBarSink
+from .quality import BarQualityChecker
 
 
 class StockDataManager:
@@ -25,6 +34,18 @@ class StockDataManager:
         """初始化"""
         self.downloaders: Dict[DataSource, BaseStockDownloader] = {}
         self.database = None
+        self.source_limits: Dict[DataSource, int] = {}
+        self.rate_limits: Dict[DataSource, float] = {}
+        self.lab = None
+        self.lab_sink: Optional[LabBarSink] = None
+        self.cache: Optional[ResponseCache] = None
+        self.incremental_downloaders: Dict[Tuple[DataSource, bool], IncrementalDownloader] = {}
+        self.write_buffer_rows: int = 100_000
+        self.write_buffer_delay: float = 5.0
+        self.write_buffer: Optional[BarWriteBuffer] = None
+        # 保存失败的合约，由调用方在确认写入结果前清空
+        self.write_failures: Set[BufferKey] = set()
+        self.quality_checker: Optional[BarQualityChecker] = None
         self._init_downloaders()
         
     def _init_downloaders(self) -> None:
@@ -67,6 +88,268 @@ class StockDataManager:
             
         downloader = self.downloaders[source]
         return downloader.init_connection(**kwargs)
+
+    def set_source_limit(self, source: DataSource, concurrency: int = 0, rate: float = 0) -> None:
+        """
+        设置数据源的并发下载限制，仅对并发下载模式生效
+
+        Args:
+            source: 数据源类型
+            concurrency: 最大并发请求数，0表示不限制
+            rate: 每秒最大请求数，0表示不限制
+        """
+        self.source_limits[source] = concurrency
+        self.rate_limits[source] = rate
+
+    def enable_cache(self,
+                     cache_path: Optional[str] = None,
+                     ttl: float = 24 * 60 * 60,
+                     max_bytes: int = 1024 * 1024 * 1024) -> ResponseCache:
+        """
+        为所有下载器启用数据源响应磁盘缓存
+
+        Args:
+            cache_path: 缓存目录，默认为.vntrader/dataloader_cache
+            ttl: 缓存有效期（秒），0表示永不过期
+            max_bytes: 缓存目录最大字节数
+
+        Returns:
+            ResponseCache: 缓存对象，可通过get_stats()查看命中率
+        """
+        self.cache = ResponseCache(cache_path, ttl, max_bytes)
+
+        for downloader in self.downloaders.values():
+            downloader.set_cache(self.cache)
+
+        return self.cache
+
+    def disable_cache(self) -> None:
+        """关闭所有下载器的数据源响应缓存"""
+        self.cache = None
+
+        for downloader in self.downloaders.values():
+            downloader.set_cache(None)
+
+    def enable_resilience(self,
+                          source: DataSource,
+                          policy: Optional[RetryPolicy] = None,
+                          breaker: Optional[CircuitBreaker] = None,
+                          fallback: Optional[DataSource] = None) -> Optional[ResilientDownloader]:
+        """
+        为数据源启用重试、熔断和备用数据源
+
+        Args:
+            source: 数据源类型
+            policy: 重试策略，默认最多尝试3次
+            breaker: 熔断器，默认连续失败5次后熔断60秒
+            fallback: 备用数据源，主数据源熔断或重试耗尽时使用
+
+        Returns:
+            Optional[ResilientDownloader]: 容错下载器，可通过get_stats()查看重试和熔断次数
+        """
+        downloader = self.downloaders.get(source)
+        if not downloader:
+            print(f"不支持的数据源: {source}")
+            return None
+
+        if isinstance(downloader, ResilientDownloader):
+            downloader = downloader.downloader
+
+        fallback_downloader = self.downloaders.get(fallback) if fallback else None
+
+        resilient_downloader = ResilientDownloader(downloader, policy, breaker, fallback_downloader)
+        self.downloaders[source] = resilient_downloader
+        return resilient_downloader
+
+    def disable_resilience(self, source: DataSource) -> None:
+        """
+        关闭数据源的重试、熔断和备用数据源
+
+        Args:
+            source: 数据源类型
+        """
+        downloader = self.downloaders.get(source)
+        if isinstance(downloader, ResilientDownloader):
+            self.downloaders[source] = downloader.downloader
+
+    def set_write_buffer(self, max_rows: int = 100_000, max_delay: float = 5.0) -> None:
+        """
+        设置批量下载时的数据库写入缓冲
+
+        Args:
+            max_rows: 缓冲数据量达到该值时写入数据库，0表示每只股票下载后立即写入
+            max_delay: 最早缓冲的数据等待超过该秒数时写入数据库，0表示不按时间写入
+        """
+        self.write_buffer_rows = max_rows
+        self.write_buffer_delay = max_delay
+
+    @contextmanager
+    def buffered_writes(self, enabled: bool = True) -> Iterator[Optional[BarWriteBuffer]]:
+        """
+        在上下文中将save_download_result的数据写入缓冲，退出时写入剩余数据并输出写入速度
+
+        Args:
+            enabled: 是否启用写入缓冲
+
+        Returns:
+            Iterator[Optional[BarWriteBuffer]]: 写入缓冲，未启用时为None
+        """
+        # 已处于缓冲上下文中时沿用外层缓冲
+        if not enabled or self.write_buffer or not self.write_buffer_rows:
+            yield self.write_buffer
+            return
+
+        if not self.database:
+            self.init_database()
+
+        if not self.database:
+            yield None
+            return
+
+        self.write_buffer = BarWriteBuffer(self.database, self.write_buffer_rows, self.write_buffer_delay)
+
+        try:
+            yield self.write_buffer
+        finally:
+            buffer: BarWriteBuffer = self.write_buffer
+            self.write_buffer = None
+            buffer.flush()
+            self.write_failures.update(buffer.failed_keys)
+
+            stats: dict = buffer.get_stats()
+            print(
+                f"数据库写入完成: 数据量: {stats['write_count']}, 失败: {stats['fail_count']}, "
+                f"写入次数: {stats['flush_count']}, 速度: {stats['rows_per_second']:,.0f}条/秒"
+            )
+
+    def set_quality_checker(self, checker: Optional[BarQualityChecker]) -> None:
+        """
+        设置数据质量检查，下载结果在保存到数据库或AlphaLab之前先检查和清洗
+
+        Args:
+            checker: 数据质量检查器，None表示不检查
+        """
+        self.quality_checker = checker
+
+    def set_lab(self, lab) -> None:
+        """
+        设置AlphaLab，download_to_lab增量下载时根据其parquet文件判断已有数据，
+        保存到数据库的下载仍然使用数据库K线概览
+
+        Args:
+            lab: AlphaLab实例，None表示使用数据库
+        """
+        if self.lab_sink:
+            self.lab_sink.close()
+            self.lab_sink = None
+
+        self.lab = lab
+        self.incremental_downloaders.clear()
+
+    def get_downloader(self,
+                       source: DataSource,
+                       incremental: bool = False,
+                       to_lab: bool = False) -> Optional[BaseStockDownloader]:
+        """
+        获取数据源对应的下载器
+
+        Args:
+            source: 数据源类型
+            incremental: 是否返回只下载缺失数据的增量下载器
+            to_lab: 下载结果是否写入AlphaLab，增量下载器从写入位置判断已有数据
+
+        Returns:
+            Optional[BaseStockDownloader]: 下载器，不支持的数据源返回None
+        """
+        if incremental:
+            return self.get_incremental_downloader(source, to_lab)
+        return self.downloaders.get(source)
+
+    def get_incremental_downloader(self, source: DataSource, to_lab: bool = False) -> Optional[IncrementalDownloader]:
+        """
+        获取数据源对应的增量下载器
+
+        Args:
+            source: 数据源类型
+            to_lab: 下载结果是否写入AlphaLab，增量下载器从写入位置判断已有数据
+
+        Returns:
+            Optional[IncrementalDownloader]: 增量下载器，不支持的数据源返回None
+        """
+        downloader = self.downloaders.get(source)
+        if not downloader:
+            return None
+
+        key: Tuple[DataSource, bool] = (source, to_lab)
+        incremental_downloader = self.incremental_downloaders.get(key)
+        if not incremental_downloader or incremental_downloader.downloader is not downloader:
+            if to_lab:
+                incremental_downloader = IncrementalDownloader(downloader, lab=self.lab)
+            else:
+                if not self.database:
+                    self.init_database()
+                incremental_downloader = IncrementalDownloader(downloader, self.database)
+
+            self.incremental_downloaders[key] = incremental_downloader
+
+        return incremental_downloader
+
+    def save_download_result(self, result: DownloadResult) -> bool:
+        """
+        将下载结果保存到数据库
+
+        Args:
+            result: 下载结果
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if not result.success or not result.total_count:
+            return False
+
+        request: DownloadRequest = result.request
+        key: BufferKey = (request.symbol, request.exchange, request.interval)
+
+        if self.quality_checker:
+            result = self.quality_checker.check_result(result)
+            if not result.success:
+                print(f"✗ {result.request.symbol} {result.error_msg}")
+                self.write_failures.add(key)
+                return False
+
+        if not self.database:
+            self.init_database()
+
+        if not self.database:
+            self.write_failures.add(key)
+            return False
+
+        # 批量下载时写入缓冲，由缓冲按数据量或时间批量保存
+        if self.write_buffer:
+            return self.write_buffer.add(result)
+
+        symbol: str = result.request.symbol
+
+        try:
+            # 列数据通过数据库的DataFrame写入接口保存，不生成BarData
+            columns = result.columns
+            if columns is not None:
+                success = self.database.save_bar_frame(
+                    columns.to_polars(), columns.symbol, columns.exchange, columns.interval
+                )
+            else:
+                success = self.database.save_bar_data(result.bars)
+
+            if success:
+                print(f"数据已保存到数据库: {symbol}, 数量: {result.total_count}")
+            else:
+                print(f"数据保存失败: {symbol}")
+                self.write_failures.add(key)
+            return success
+        except Exception as e:
+            print(f"数据保存异常: {symbol}, 错误: {e}")
+            self.write_failures.add(key)
+            return False
         
     def download_stock_data(self, 
                            symbol: str,
@@ -75,7 +358,8 @@ class StockDataManager:
                            start_date: Optional[datetime] = None,
                            end_date: Optional[datetime] = None,
                            interval: Interval = Interval.DAILY,
-                           save_to_db: bool = True) -> DownloadResult:
+                           save_to_db: bool = True,
+                           incremental: bool = False) -> DownloadResult:
         """
         下载单个股票数据
         
@@ -87,20 +371,20 @@ class StockDataManager:
             end_date: 结束时间  
             interval: 时间间隔
             save_to_db: 是否保存到数据库
+            incremental: 是否只下载本地缺失的数据
             
         Returns:
             DownloadResult: 下载结果
         """
         # 检查数据源是否可用
-        if source not in self.downloaders:
+        downloader = self.get_downloader(source, incremental)
+        if not downloader:
             return DownloadResult(
                 request=DownloadRequest(symbol, exchange, start_date, end_date, interval),
                 bars=[],
                 success=False,
                 error_msg=f"不支持的数据源: {source}"
             )
-            
-        downloader = self.downloaders[source]
         
         # 创建下载请求
         request = DownloadRequest(
@@ -111,23 +395,16 @@ class StockDataManager:
             interval=interval
         )
         
+        # 需要分段下载时每段数据到达后立即保存，不在内存中保留全部数据
+        if save_to_db and len(downloader.split_request(request)) > 1:
+            return downloader.download_bars_chunked(request, sink=self.save_download_result)
+        
         # 执行下载
         result = downloader.download_bars(request)
         
         # 保存到数据库
-        if save_to_db and result.success and result.bars:
-            if not self.database:
-                self.init_database()
-                
-            if self.database:
-                try:
-                    success = self.database.save_bar_data(result.bars)
-                    if success:
-                        print(f"数据已保存到数据库: {symbol}, 数量: {len(result.bars)}")
-                    else:
-                        print(f"数据保存失败: {symbol}")
-                except Exception as e:
-                    print(f"数据保存异常: {symbol}, 错误: {e}")
+        if save_to_db:
+            self.save_download_result(result)
                     
         return result
         
@@ -138,7 +415,11 @@ class StockDataManager:
                                 start_date: Optional[datetime] = None,
                                 end_date: Optional[datetime] = None,
                                 interval: Interval = Interval.DAILY,
-                                save_to_db: bool = True) -> List[DownloadResult]:
+                                save_to_db: bool = True,
+                                max_workers: int = 1,
+                                callback: Optional[Callable[[DownloadResult], None]] = None,
+                                incremental: bool = False,
+                                batch: bool = False) -> List[DownloadResult]:
         """
         批量下载多个股票数据
         
@@ -150,31 +431,313 @@ class StockDataManager:
             end_date: 结束时间
             interval: 时间间隔
             save_to_db: 是否保存到数据库
+            max_workers: 下载线程数，大于1时使用并发下载模式
+            callback: 每只股票下载完成时的回调函数
+            incremental: 是否只下载本地缺失的数据
+            batch: 是否使用数据源的多股票合并请求，仅在max_workers为1时生效
             
         Returns:
-            List[DownloadResult]: 下载结果列表
+            List[DownloadResult]: 下载结果列表，并发模式下按完成顺序排列
         """
-        results = []
-        
-        for symbol in symbols:
-            print(f"正在下载 {symbol} 数据...")
-            result = self.download_stock_data(
-                symbol=symbol,
+        if max_workers > 1:
+            return list(self.iter_download_multiple_stocks(
+                symbols=symbols,
+                source=source,
+                exchange=exchange,
+                start_date=start_date,
+                end_date=end_date,
+                interval=interval,
+                save_to_db=save_to_db,
+                max_workers=max_workers,
+                callback=callback,
+                incremental=incremental
+            ))
+
+        # 增量下载时每批开始前刷新一次本地数据概览
+        if incremental:
+            incremental_downloader = self.get_incremental_downloader(source)
+            if incremental_downloader:
+                incremental_downloader.reload_overviews()
+
+        if batch and source in self.downloaders:
+            return self.download_stocks_batch(
+                symbols=symbols,
                 source=source,
                 exchange=exchange,
                 start_date=start_date,
                 end_date=end_date,
                 interval=interval,
-                save_to_db=save_to_db
+                save_to_db=save_to_db,
+                callback=callback,
+                incremental=incremental
             )
-            results.append(result)
+
+        results = []
+        
+        with self.buffered_writes(save_to_db):
+            for symbol in symbols:
+                print(f"正在下载 {symbol} 数据...")
+                result = self.download_stock_data(
+                    symbol=symbol,
+                    source=source,
+                    exchange=exchange,
+                    start_date=start_date,
+                    end_date=end_date,
+                    interval=interval,
+                    save_to_db=save_to_db,
+                    incremental=incremental
+                )
+                results.append(result)
             
+                if result.success:
+                    print(f"✓ {symbol} 下载成功，数据量: {result.total_count}")
+                else:
+                    print(f"✗ {symbol} 下载失败: {result.error_msg}")
+
+                if callback:
+                    callback(result)
+                
+        return results
+
+    def download_stocks_batch(self,
+                              symbols: List[str],
+                              source: DataSource = DataSource.YFINANCE,
+                              exchange: Exchange = Exchange.NYSE,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None,
+                              interval: Interval = Interval.DAILY,
+                              save_to_db: bool = True,
+                              callback: Optional[Callable[[DownloadResult], None]] = None,
+                              incremental: bool = False) -> List[DownloadResult]:
+        """
+        使用数据源的多股票合并请求批量下载
+
+        股票按下载器的batch_size分组，每组调用一次download_bars_batch，
+        不支持合并请求的数据源逐只下载。
+
+        Args:
+            symbols: 股票代码列表
+            source: 数据源
+            exchange: 交易所
+            start_date: 开始时间
+            end_date: 结束时间
+            interval: 时间间隔
+            save_to_db: 是否保存到数据库
+            callback: 每只股票下载完成时的回调函数
+            incremental: 是否只下载本地缺失的数据
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与股票代码一一对应
+        """
+        downloader = self.get_downloader(source, incremental)
+        if not downloader:
+            return [
+                DownloadResult(
+                    request=DownloadRequest(symbol, exchange, start_date, end_date, interval),
+                    bars=[],
+                    success=False,
+                    error_msg=f"不支持的数据源: {source}"
+                )
+                for symbol in symbols
+            ]
+
+        batch_size: int = max(downloader.batch_size, 1)
+        results: List[DownloadResult] = []
+
+        with self.buffered_writes(save_to_db):
+            for n in range(0, len(symbols), batch_size):
+                requests = [
+                    DownloadRequest(symbol, exchange, start_date, end_date, interval)
+                    for symbol in symbols[n:n + batch_size]
+                ]
+                print(f"正在下载 {len(requests)} 只股票数据...")
+
+                for result in downloader.download_bars_batch(requests):
+                    if save_to_db:
+                        self.save_download_result(result)
+
+                    if result.success:
+                        print(f"✓ {result.request.symbol} 下载成功，数据量: {result.total_count}")
+                    else:
+                        print(f"✗ {result.request.symbol} 下载失败: {result.error_msg}")
+
+                    if callback:
+                        callback(result)
+
+                    results.append(result)
+
+        return results
+
+    def download_to_lab(self,
+                        symbols: List[str],
+                        source: DataSource = DataSource.YFINANCE,
+                        exchange: Exchange = Exchange.NYSE,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        interval: Interval = Interval.DAILY,
+                        max_workers: int = 4,
+                        incremental: bool = False,
+                        compact: bool = True) -> List[DownloadResult]:
+        """
+        下载多个股票数据并直接写入AlphaLab
+
+        每段数据到达后立即追加为分段文件，不在内存中拼接完整历史，
+        全部下载完成后在后台线程中将分段文件合并到主文件。
+
+        Args:
+            symbols: 股票代码列表
+            source: 数据源
+            exchange: 交易所
+            start_date: 开始时间
+            end_date: 结束时间
+            interval: 时间间隔
+            max_workers: 同时下载的股票数量
+            incremental: 是否只下载本地缺失的数据
+            compact: 是否在后台合并分段文件，可通过lab_sink.close()等待合并完成
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与股票代码一一对应，分段下载的结果不包含数据
+        """
+        if not self.lab:
+            print("未设置AlphaLab，无法写入")
+            return []
+
+        downloader = self.get_downloader(source, incremental, to_lab=True)
+        if not downloader:
+            return [
+                DownloadResult(
+                    request=DownloadRequest(symbol, exchange, start_date, end_date, interval),
+                    bars=[],
+                    success=False,
+                    error_msg=f"不支持的数据源: {source}"
+                )
+                for symbol in symbols
+            ]
+
+        if isinstance(downloader, IncrementalDownloader):
+            downloader.reload_overviews()
+
+        if not self.lab_sink:
+            self.lab_sink = LabBarSink(self.lab)
+        self.lab_sink.checker = self.quality_checker
+        sink: LabBarSink = self.lab_sink
+
+        def download(symbol: str) -> DownloadResult:
+            """下载单只股票并写入分段文件"""
+            request = DownloadRequest(symbol, exchange, start_date, end_date, interval)
+            result = sink.download(downloader, request)
+
             if result.success:
                 print(f"✓ {symbol} 下载成功，数据量: {result.total_count}")
             else:
                 print(f"✗ {symbol} 下载失败: {result.error_msg}")
-                
+
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            results: List[DownloadResult] = list(executor.map(download, symbols))
+
+        if compact:
+            sink.compact_async()
+
         return results
+
+    def iter_download_multiple_stocks(self,
+                                      symbols: List[str],
+                                      source: DataSource = DataSource.YFINANCE,
+                                      exchange: Exchange = Exchange.NYSE,
+                                      start_date: Optional[datetime] = None,
+                                      end_date: Optional[datetime] = None,
+                                      interval: Interval = Interval.DAILY,
+                                      save_to_db: bool = True,
+                                      max_workers: int = 8,
+                                      callback: Optional[Callable[[DownloadResult], None]] = None,
+                                      incremental: bool = False) -> Iterator[DownloadResult]:
+        """
+        并发批量下载多个股票数据，按完成顺序逐个返回结果
+
+        下载在有界线程池中执行，受set_source_limit设置的并发数和频率限制，
+        下载成功的结果由独立的写入线程保存到数据库。
+
+        Args:
+            symbols: 股票代码列表
+            source: 数据源
+            exchange: 交易所
+            start_date: 开始时间
+            end_date: 结束时间
+            interval: 时间间隔
+            save_to_db: 是否保存到数据库
+            max_workers: 下载线程数
+            callback: 每只股票下载完成时的回调函数
+            incremental: 是否只下载本地缺失的数据
+
+        Returns:
+            Iterator[DownloadResult]: 下载结果迭代器
+        """
+        requests: List[DownloadRequest] = [
+            DownloadRequest(symbol, exchange, start_date, end_date, interval)
+            for symbol in symbols
+        ]
+
+        return self.iter_download_requests(requests, source, save_to_db, max_workers, callback, incremental)
+
+    def iter_download_requests(self,
+                               requests: List[DownloadRequest],
+                               source: DataSource = DataSource.YFINANCE,
+                               save_to_db: bool = True,
+                               max_workers: int = 8,
+                               callback: Optional[Callable[[DownloadResult], None]] = None,
+                               incremental: bool = False) -> Generator[DownloadResult, None, None]:
+        """
+        并发执行下载请求，按完成顺序逐个返回结果
+
+        请求按列表顺序开始执行，提前结束迭代时取消尚未开始的请求。
+
+        Args:
+            requests: 下载请求列表，可以包含不同交易所的股票
+            source: 数据源
+            save_to_db: 是否保存到数据库
+            max_workers: 下载线程数
+            callback: 每只股票下载完成时的回调函数
+            incremental: 是否只下载本地缺失的数据
+
+        Returns:
+            Generator[DownloadResult, None, None]: 下载结果迭代器
+        """
+        downloaders: Dict[DataSource, BaseStockDownloader] = dict(self.downloaders)
+
+        if incremental:
+            incremental_downloader = self.get_incremental_downloader(source)
+            if incremental_downloader:
+                incremental_downloader.reload_overviews()
+                downloaders[source] = incremental_downloader
+
+        pipeline = DownloadPipeline(
+            downloaders=downloaders,
+            max_workers=max_workers,
+            source_limits=self.source_limits,
+            rate_limits=self.rate_limits,
+            writer=self.save_download_result if save_to_db else None
+        )
+
+        tasks = [(source, request) for request in requests]
+
+        with self.buffered_writes(save_to_db):
+            results = pipeline.run(tasks, callback)
+
+            # 先结束流水线等待写入线程退出，再写入缓冲中剩余的数据
+            try:
+                for result in results:
+                    symbol = result.request.symbol
+
+                    if result.success:
+                        print(f"✓ {symbol} 下载成功，数据量: {result.total_count}")
+                    else:
+                        print(f"✗ {symbol} 下载失败: {result.error_msg}")
+
+                    yield result
+            finally:
+                results.close()
         
     def validate_download_request(self, 
                                  symbol: str,
@@ -0,0 +1,194 @@
+"""
+并发下载流水线
+
+在有界线程池中并发执行下载请求，支持按数据源限制并发数和请求频率，
+下载完成的结果交给独立的写入线程持久化，同时按完成顺序返回给调用方。
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from queue import Queue
+from threading import Lock, Semaphore, Thread
+from time import monotonic, sleep
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+from .base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSource
+
+
+class RateLimiter:
+    """令牌桶限速器"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化
+
+        Args:
+            rate: 每秒允许的请求数
+            burst: 允许的突发请求数
+        """
+        self.rate: float = rate
+        self.capacity: float = float(max(burst, 1))
+        self.tokens: float = self.capacity
+        self.timestamp: float = monotonic()
+        self.lock: Lock = Lock()
+
+    def acquire(self) -> None:
+        """获取一个令牌，令牌不足时阻塞等待"""
+        while True:
+            with self.lock:
+                now: float = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+                self.timestamp = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait: float = (1 - self.tokens) / self.rate
+
+            sleep(wait)
+
+
+class DownloadPipeline:
+    """并发下载流水线"""
+
+    def __init__(self,
+                 downloaders: Dict[DataSource, BaseStockDownloader],
+                 max_workers: int = 8,
+                 source_limits: Optional[Dict[DataSource, int]] = None,
+                 rate_limits: Optional[Dict[DataSource, float]] = None,
+                 writer: Optional[Callable[[DownloadResult], object]] = None,
+                 writer_queue_size: int = 100):
+        """
+        初始化
+
+        Args:
+            downloaders: 数据源到下载器的映射
+            max_workers: 下载线程池大小
+            source_limits: 每个数据源的最大并发请求数
+            rate_limits: 每个数据源每秒最大请求数
+            writer: 持久化下载结果的函数，在独立写入线程中调用
+            writer_queue_size: 待写入结果队列长度，队列满时下载线程等待写入
+        """
+        self.downloaders: Dict[DataSource, BaseStockDownloader] = downloaders
+        self.max_workers: int = max(max_workers, 1)
+        self.writer: Optional[Callable[[DownloadResult], object]] = writer
+        self.writer_queue_size: int = writer_queue_size
+
+        self.semaphores: Dict[DataSource, Semaphore] = {
+            source: Semaphore(limit)
+            for source, limit in (source_limits or {}).items() if limit > 0
+        }
+        self.limiters: Dict[DataSource, RateLimiter] = {
+            source: RateLimiter(rate)
+            for source, rate in (rate_limits or {}).items() if rate > 0
+        }
+
+    def _download(self, source: DataSource, request: DownloadRequest) -> DownloadResult:
+        """
+        在工作线程中执行单个下载请求
+
+        Args:
+            source: 数据源
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 下载结果
+        """
+        downloader: Optional[BaseStockDownloader] = self.downloaders.get(source)
+        if not downloader:
+            return DownloadResult(
+                request=request,
+                bars=[],
+                success=False,
+                error_msg=f"不支持的数据源: {source}"
+            )
+
+        semaphore: Optional[Semaphore] = self.semaphores.get(source)
+        limiter: Optional[RateLimiter] = self.limiters.get(source)
+
+        if semaphore:
+            semaphore.acquire()
+
+        try:
+            if limiter:
+                limiter.acquire()
+
+            return downloader.download_bars(request)
+        except Exception as e:
+            return DownloadResult(
+                request=request,
+                bars=[],
+                success=False,
+                error_msg=f"数据下载异常: {e}",
+                retryable=True
+            )
+        finally:
+            if semaphore:
+                semaphore.release()
+
+    def _run_writer(self, queue: Queue) -> None:
+        """
+        写入线程主循环，收到None时退出
+
+        Args:
+            queue: 待写入结果队列
+        """
+        writer: Optional[Callable[[DownloadResult], object]] = self.writer
+        if not writer:
+            return
+
+        while True:
+            result: Optional[DownloadResult] = queue.get()
+            if result is None:
+                break
+
+            try:
+                writer(result)
+            except Exception as e:
+                print(f"数据写入异常: {result.request.vt_symbol}, 错误: {e}")
+
+    def run(self,
+            tasks: Iterable[Tuple[DataSource, DownloadRequest]],
+            callback: Optional[Callable[[DownloadResult], None]] = None) -> Generator[DownloadResult, None, None]:
+        """
+        执行下载任务，按完成顺序逐个返回结果
+
+        Args:
+            tasks: (数据源, 下载请求)列表
+            callback: 每个结果完成时的回调函数
+
+        Returns:
+            Generator[DownloadResult, None, None]: 下载结果迭代器
+        """
+        queue: Optional[Queue] = None
+        writer_thread: Optional[Thread] = None
+
+        if self.writer:
+            queue = Queue(maxsize=self.writer_queue_size)
+            writer_thread = Thread(target=self._run_writer, args=(queue,), daemon=True)
+            writer_thread.start()
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            futures: List[Future] = [
+                executor.submit(self._download, source, request)
+                for source, request in tasks
+            ]
+
+            for future in as_completed(futures):
+                result: DownloadResult = future.result()
+
+                if queue and result.success:
+                    queue.put(result)
+
+                if callback:
+                    callback(result)
+
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+            if queue and writer_thread:
+                queue.put(None)
+                writer_thread.join()
@@ -0,0 +1,348 @@
+"""
+数据质量检查
+
+在下载结果保存之前按列执行去重排序、价格和成交量检查、OHLC一致性检查、
+对照交易日历的缺失检测以及拆股复权，并为每只股票生成质量报告。
+"""
+
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from vnpy.trader.calendar import TradingCalendar
+
+from .base import BarColumns, DownloadResult
+from .incremental import to_db_datetime
+
+
+# 质量报告中最多保留的缺失交易日数量
+MAX_MISSING_DATES: int = 20
+
+
+@dataclass
+class QualityReport:
+    """单只股票的数据质量报告，多次检查的结果累加"""
+    vt_symbol: str                      # 本地代码
+    total_count: int = 0                # 检查的数据量
+    clean_count: int = 0                # 清洗后的数据量
+    unsorted_count: int = 0             # 时间倒序的数据量
+    duplicate_count: int = 0            # 重复时间的数据量
+    invalid_price_count: int = 0        # 价格为0、负数或缺失的数据量
+    invalid_volume_count: int = 0       # 成交量为负数或缺失的数据量
+    ohlc_error_count: int = 0           # 最高价、最低价与开盘价、收盘价矛盾的数据量
+    missing_count: int = 0              # 缺失的交易日数量
+    missing_dates: List[date] = field(default_factory=list)    # 缺失的交易日（最多保留MAX_MISSING_DATES个）
+    split_count: int = 0                # 复权调整的数据量
+
+    @property
+    def dropped_count(self) -> int:
+        """清洗时删除的数据量"""
+        return self.total_count - self.clean_count
+
+    def merge(self, other: "QualityReport") -> None:
+        """
+        累加另一次检查的结果
+
+        Args:
+            other: 同一只股票的质量报告
+        """
+        for name in (
+            "total_count", "clean_count", "unsorted_count", "duplicate_count", "invalid_price_count",
+            "invalid_volume_count", "ohlc_error_count", "missing_count", "split_count"
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+        space: int = MAX_MISSING_DATES - len(self.missing_dates)
+        self.missing_dates.extend(other.missing_dates[:space])
+
+    def is_clean(self) -> bool:
+        """是否没有发现任何问题"""
+        return not (
+            self.unsorted_count or self.duplicate_count or self.invalid_price_count
+            or self.invalid_volume_count or self.ohlc_error_count or self.missing_count
+        )
+
+    def __str__(self) -> str:
+        """报告描述"""
+        text: str = (
+            f"{self.vt_symbol}: 数据量: {self.total_count}, 有效: {self.clean_count}, "
+            f"倒序: {self.unsorted_count}, 重复: {self.duplicate_count}, "
+            f"价格异常: {self.invalid_price_count}, 成交量异常: {self.invalid_volume_count}, "
+            f"OHLC矛盾: {self.ohlc_error_count}, 缺失交易日: {self.missing_count}, "
+            f"复权调整: {self.split_count}"
+        )
+
+        if self.missing_dates:
+            text += f", 首批缺失: {', '.join(d.isoformat() for d in self.missing_dates[:5])}"
+
+        return text
+
+
+class BarQualityChecker:
+    """按列执行的K线数据质量检查和清洗"""
+
+    def __init__(self,
+                 calendar: Optional[Union[TradingCalendar, Sequence[Union[date, datetime]]]] = None,
+                 fix_ohlc: bool = True,
+                 check_gaps: bool = True):
+        """
+        初始化
+
+        Args:
+            calendar: 交易日历或交易日列表，用于检测缺失交易日，默认使用周一到周五（不含节假日）
+            fix_ohlc: OHLC矛盾时是否修正最高价和最低价，否则删除该行
+            check_gaps: 是否检测缺失交易日
+        """
+        self.calendar: Optional[np.ndarray] = None
+        if calendar is not None:
+            self.set_calendar(calendar)
+
+        self.fix_ohlc: bool = fix_ohlc
+        self.check_gaps: bool = check_gaps
+
+        # 本地代码到按除权日排序的(除权日数组, 拆股比例数组)
+        self.splits: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self.reports: Dict[str, QualityReport] = {}
+        self.lock: Lock = Lock()
+
+    def set_calendar(self, calendar: Union[TradingCalendar, Sequence[Union[date, datetime]]]) -> None:
+        """
+        设置交易日历
+
+        Args:
+            calendar: 交易日历或交易日列表
+        """
+        if isinstance(calendar, TradingCalendar):
+            days: np.ndarray = calendar.sessions.astype("datetime64[D]")
+        else:
+            days = np.array([d.date() if isinstance(d, datetime) else d for d in calendar], dtype="datetime64[D]")
+
+        self.calendar = np.unique(days)
+
+    def set_splits(self, vt_symbol: str, splits: Dict[Union[date, datetime], float]) -> None:
+        """
+        设置股票的拆股记录，除权日之前的价格除以拆股比例、成交量乘以拆股比例
+
+        Args:
+            vt_symbol: 本地代码
+            splits: 除权日到拆股比例的映射，如1拆4为4.0，4合1为0.25
+        """
+        if not splits:
+            self.splits.pop(vt_symbol, None)
+            return
+
+        items: list = sorted(
+            (np.datetime64(d.date() if isinstance(d, datetime) else d, "D"), ratio)
+            for d, ratio in splits.items()
+        )
+
+        dates: np.ndarray = np.array([d for d, _ in items], dtype="datetime64[D]")
+        ratios: np.ndarray = np.array([ratio for _, ratio in items], dtype=float)
+        self.splits[vt_symbol] = (dates, ratios)
+
+    def check(
+        self,
+        columns: BarColumns,
+        start: Optional[datetime] = None,
+        ranges: Optional[List[Tuple[Optional[datetime], Optional[datetime]]]] = None
+    ) -> Tuple[Optional[BarColumns], QualityReport]:
+        """
+        检查并清洗列数据
+
+        缺失检测的范围从start到最后一根K线，最后一根K线之后的交易日可能尚未发布数据，不计为缺失。
+
+        Args:
+            columns: 列数据
+            start: 缺失检测的开始时间，默认为第一根K线时间
+            ranges: 实际下载的时间范围，设置后只检测范围内的交易日（如增量下载的头尾缺口）
+
+        Returns:
+            Tuple[Optional[BarColumns], QualityReport]: 清洗后的列数据（没有有效数据时为None）和质量报告
+        """
+        report: QualityReport = QualityReport(columns.vt_symbol, total_count=len(columns))
+        if not len(columns):
+            return None, report
+
+        # 排序去重，重复时间保留后出现的数据
+        dts: np.ndarray = columns.datetime
+        report.unsorted_count = int(np.count_nonzero(dts[1:] < dts[:-1]))
+
+        merged: Optional[BarColumns] = BarColumns.concat([columns])
+        if merged is None:
+            return None, report
+
+        clean: BarColumns = merged
+        report.duplicate_count = len(columns) - len(clean)
+
+        # 价格必须为正，成交量不能为负
+        prices: np.ndarray = np.vstack([clean.open, clean.high, clean.low, clean.close])
+        price_valid: np.ndarray = np.all(np.isfinite(prices) & (prices > 0), axis=0)
+        volume_valid: np.ndarray = np.isfinite(clean.volume) & (clean.volume >= 0)
+
+        report.invalid_price_count = int(np.count_nonzero(~price_valid))
+        report.invalid_volume_count = int(np.count_nonzero(price_valid & ~volume_valid))
+
+        valid: np.ndarray = price_valid & volume_valid
+        if not valid.all():
+            clean = clean.filter(valid)
+            prices = prices[:, valid]
+
+        # 最高价不低于其他价格，最低价不高于其他价格
+        price_max: np.ndarray = prices.max(axis=0)
+        price_min: np.ndarray = prices.min(axis=0)
+        ohlc_error: np.ndarray = (clean.high < price_max) | (clean.low > price_min)
+        report.ohlc_error_count = int(np.count_nonzero(ohlc_error))
+
+        if report.ohlc_error_count:
+            if self.fix_ohlc:
+                clean.high = price_max
+                clean.low = price_min
+            else:
+                clean = clean.filter(~ohlc_error)
+
+        if len(clean) and self.check_gaps:
+            self._check_gaps(clean, start, report, ranges)
+
+        if len(clean) and columns.vt_symbol in self.splits:
+            report.split_count = self._adjust_splits(clean)
+
+        report.clean_count = len(clean)
+
+        with self.lock:
+            if columns.vt_symbol in self.reports:
+                self.reports[columns.vt_symbol].merge(report)
+            else:
+                self.reports[columns.vt_symbol] = replace(report, missing_dates=list(report.missing_dates))
+
+        return (clean if len(clean) else None), report
+
+    def _check_gaps(
+        self,
+        columns: BarColumns,
+        start: Optional[datetime],
+        report: QualityReport,
+        ranges: Optional[List[Tuple[Optional[datetime], Optional[datetime]]]] = None
+    ) -> None:
+        """对照交易日历检测没有任何数据的交易日"""
+        days: np.ndarray = np.unique(columns.datetime.astype("datetime64[D]"))
+
+        first: np.datetime64 = min(np.datetime64(start.date(), "D"), days[0]) if start else days[0]
+        last: np.datetime64 = days[-1]
+
+        if self.calendar is not None:
+            left, right = np.searchsorted(self.calendar, [first, last + 1])
+            expected: np.ndarray = self.calendar[left:right]
+        else:
+            expected = np.arange(first, last + 1, dtype="datetime64[D]")
+            expected = expected[np.is_busday(expected)]
+
+        # 只检测实际下载的范围，范围之间是本地已有的数据，数据源通常不包含结束时间当天的数据
+        if ranges:
+            inside: np.ndarray = np.zeros(len(expected), dtype=bool)
+            for range_start, range_end in ranges:
+                low: np.datetime64 = np.datetime64(range_start.date(), "D") if range_start else first
+                high: np.datetime64 = np.datetime64(range_end.date(), "D") if range_end else last + 1
+                inside |= (expected >= low) & (expected < high)
+            expected = expected[inside]
+
+        missing: np.ndarray = np.setdiff1d(expected, days, assume_unique=True)
+
+        report.missing_count = len(missing)
+        report.missing_dates = missing[:MAX_MISSING_DATES].astype(object).tolist()
+
+    def _adjust_splits(self, columns: BarColumns) -> int:
+        """按拆股记录向前复权，返回调整的数据量"""
+        dates, ratios = self.splits[columns.vt_symbol]
+
+        # 每根K线的复权因子为其之后所有拆股比例的乘积
+        suffix: np.ndarray = np.append(np.cumprod(ratios[::-1])[::-1], 1.0)
+        index: np.ndarray = np.searchsorted(dates, columns.datetime.astype("datetime64[D]"), side="right")
+        factors: np.ndarray = suffix[index]
+
+        adjusted: np.ndarray = factors != 1.0
+        if not adjusted.any():
+            return 0
+
+        columns.open = columns.open / factors
+        columns.high = columns.high / factors
+        columns.low = columns.low / factors
+        columns.close = columns.close / factors
+        columns.volume = columns.volume * factors
+
+        return int(np.count_nonzero(adjusted))
+
+    def check_result(self, result: DownloadResult) -> DownloadResult:
+        """
+        检查并清洗下载结果
+
+        Args:
+            result: 下载结果
+
+        Returns:
+            DownloadResult: 清洗后的下载结果，没有有效数据时返回失败结果
+        """
+        if not result.success or not result.total_count:
+            return result
+
+        columns: Optional[BarColumns] = result.get_columns()
+        if columns is None:
+            return result
+
+        request = result.request
+
+        # 增量下载的结果只包含缺失区间的数据，缺失检测限定在实际下载的范围内
+        ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = [
+            (to_db_datetime(range_start), to_db_datetime(range_end)) for range_start, range_end in result.ranges
+        ]
+        start: Optional[datetime] = ranges[0][0] if ranges else to_db_datetime(request.start_date)
+
+        clean, report = self.check(columns, start, ranges)
+
+        if clean is None:
+            return DownloadResult(
+                request=request,
+                bars=[],
+                success=False,
+                error_msg=f"数据质量检查后没有有效数据，删除: {report.dropped_count}"
+            )
+
+        # 没有任何修改时沿用原结果，避免重新生成BarData
+        if not (report.dropped_count or report.unsorted_count or report.ohlc_error_count or report.split_count):
+            return result
+
+        return DownloadResult(request=request, bars=None, success=True, columns=clean, ranges=result.ranges)
+
+    def __call__(self, result: DownloadResult) -> DownloadResult:
+        """同check_result"""
+        return self.check_result(result)
+
+    def get_report(self, vt_symbol: str) -> Optional[QualityReport]:
+        """获取股票的累计质量报告"""
+        with self.lock:
+            return self.reports.get(vt_symbol)
+
+    def get_reports(self) -> List[QualityReport]:
+        """获取全部股票的累计质量报告"""
+        with self.lock:
+            return list(self.reports.values())
+
+    def clear_reports(self) -> None:
+        """清空质量报告"""
+        with self.lock:
+            self.reports.clear()
+
+    def print_reports(self, only_issues: bool = True) -> None:
+        """
+        输出质量报告
+
+        Args:
+            only_issues: 是否只输出发现问题的股票
+        """
+        for report in self.get_reports():
+            if only_issues and report.is_clean():
+                continue
+            print(report)
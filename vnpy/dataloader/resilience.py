@@ -0,0 +1,298 @@
+"""
+下载容错
+
+为下载器增加临时性错误重试（指数退避加随机抖动）、按数据源的熔断器，
+以及数据源持续失败时切换到备用数据源的能力。
+"""
+
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Dict, List, Optional
+
+from vnpy.trader.constant import Exchange, Interval
+
+from .base import BaseStockDownloader, DownloadRequest, DownloadResult
+from .cache import ResponseCache
+
+
+class RetryPolicy:
+    """指数退避重试策略"""
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 1.0,
+                 max_delay: float = 30.0,
+                 multiplier: float = 2.0,
+                 jitter: float = 0.5):
+        """
+        初始化
+
+        Args:
+            max_attempts: 最大尝试次数（包含首次请求）
+            base_delay: 首次重试前的等待秒数
+            max_delay: 单次等待的最大秒数
+            multiplier: 每次重试等待时间的增长倍数
+            jitter: 随机抖动比例，实际等待时间在[delay * (1 - jitter), delay]之间
+        """
+        self.max_attempts: int = max(max_attempts, 1)
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.multiplier: float = multiplier
+        self.jitter: float = jitter
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        计算第attempt次失败后的等待时间
+
+        Args:
+            attempt: 已失败次数，从1开始
+
+        Returns:
+            float: 等待秒数
+        """
+        delay: float = min(self.base_delay * self.multiplier ** (attempt - 1), self.max_delay)
+        return uniform(delay * (1 - self.jitter), delay)
+
+
+class CircuitBreaker:
+    """
+    数据源熔断器
+
+    连续失败达到阈值后熔断，熔断期间直接拒绝请求；
+    经过冷却时间后放行一个试探请求，成功则恢复，失败则继续熔断。
+    """
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        初始化
+
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            reset_timeout: 熔断后放行试探请求前的冷却秒数
+        """
+        self.failure_threshold: int = max(failure_threshold, 1)
+        self.reset_timeout: float = reset_timeout
+
+        self.state: str = self.CLOSED
+        self.failure_count: int = 0
+        self.opened_time: float = 0
+        self.trip_count: int = 0
+
+        self.lock: Lock = Lock()
+
+    def allow_request(self) -> bool:
+        """
+        检查是否允许发出请求
+
+        Returns:
+            bool: 是否允许
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            # 半开状态下只放行一个试探请求
+            if self.state == self.HALF_OPEN:
+                return False
+
+            if monotonic() - self.opened_time >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """记录请求成功，恢复正常状态"""
+        with self.lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+
+    def record_failure(self) -> None:
+        """记录请求失败，连续失败达到阈值或试探请求失败时熔断"""
+        with self.lock:
+            self.failure_count += 1
+
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trip_count += 1
+                self.state = self.OPEN
+                self.opened_time = monotonic()
+
+    def is_open(self) -> bool:
+        """是否处于熔断状态"""
+        with self.lock:
+            return self.state == self.OPEN
+
+
+class ResilientDownloader(BaseStockDownloader):
+    """带重试、熔断和备用数据源的下载器包装"""
+
+    def __init__(self,
+                 downloader: BaseStockDownloader,
+                 policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 fallback: Optional[BaseStockDownloader] = None):
+        """
+        初始化
+
+        Args:
+            downloader: 实际执行下载的下载器
+            policy: 重试策略，默认最多尝试3次
+            breaker: 熔断器，默认连续失败5次后熔断60秒
+            fallback: 主数据源熔断或重试耗尽时使用的备用下载器
+        """
+        super().__init__(f"Resilient{downloader.name}")
+        self.source = downloader.source
+        self.downloader: BaseStockDownloader = downloader
+        self.policy: RetryPolicy = policy or RetryPolicy()
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self.fallback: Optional[BaseStockDownloader] = fallback
+
+        # 沿用被包装下载器的分段和合并请求设置，分段下载时每段单独重试
+        self.chunk_sizes = downloader.chunk_sizes
+        self.chunk_workers = downloader.chunk_workers
+        self.batch_size = downloader.batch_size
+
+        self.retry_count: int = 0
+        self.fallback_count: int = 0
+        self.lock: Lock = Lock()
+
+    def init_connection(self, **kwargs) -> bool:
+        """初始化被包装下载器的连接"""
+        return self.downloader.init_connection(**kwargs)
+
+    def set_cache(self, cache: Optional[ResponseCache]) -> None:
+        """为被包装下载器设置响应缓存"""
+        self.downloader.set_cache(cache)
+
+    def download_bars(self, request: DownloadRequest) -> DownloadResult:
+        """
+        下载K线数据，临时性错误按重试策略重试，失败后切换到备用数据源
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            DownloadResult: 下载结果
+        """
+        # 超过单次请求时间跨度限制时拆分为多段，每段单独重试
+        if len(self.split_request(request)) > 1:
+            return self.download_bars_chunked(request)
+
+        result: Optional[DownloadResult] = None
+
+        for attempt in range(1, self.policy.max_attempts + 1):
+            if not self.breaker.allow_request():
+                break
+
+            result = self._download(request)
+
+            if result.success:
+                self.breaker.record_success()
+                return result
+
+            # 无数据、参数错误等非临时性错误不重试，也不计入熔断
+            if not result.retryable:
+                self.breaker.record_success()
+                return result
+
+            self.breaker.record_failure()
+
+            if attempt == self.policy.max_attempts or self.breaker.is_open():
+                break
+
+            with self.lock:
+                self.retry_count += 1
+            sleep(self.policy.get_delay(attempt))
+
+        if result is None:
+            result = DownloadResult(
+                request=request,
+                bars=[],
+                success=False,
+                error_msg=f"数据源已熔断: {self.source}",
+                retryable=True
+            )
+
+        if not self.fallback:
+            return result
+
+        with self.lock:
+            self.fallback_count += 1
+
+        fallback_result: DownloadResult = self.fallback.download_bars(request)
+        if not fallback_result.success:
+            fallback_result.error_msg = f"{result.error_msg}; 备用数据源: {fallback_result.error_msg}"
+        return fallback_result
+
+    def _download(self, request: DownloadRequest) -> DownloadResult:
+        """调用被包装下载器，未捕获的异常视为临时性错误"""
+        try:
+            return self.downloader.download_bars(request)
+        except Exception as e:
+            return DownloadResult(
+                request=request,
+                bars=[],
+                success=False,
+                error_msg=f"数据下载异常: {e}",
+                retryable=True
+            )
+
+    def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        批量下载K线数据，合并请求失败的股票再逐只重试
+
+        Args:
+            requests: 下载请求列表
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        if not self.breaker.allow_request():
+            return [self.download_bars(request) for request in requests]
+
+        try:
+            results: List[DownloadResult] = self.downloader.download_bars_batch(requests)
+        except Exception:
+            self.breaker.record_failure()
+            return [self.download_bars(request) for request in requests]
+
+        if any(r.success for r in results):
+            self.breaker.record_success()
+
+        return [
+            self.download_bars(result.request) if result.retryable else result
+            for result in results
+        ]
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        获取容错统计
+
+        Returns:
+            Dict[str, object]: 重试次数、切换备用数据源次数、熔断次数和熔断器状态
+        """
+        with self.lock:
+            return {
+                "retry_count": self.retry_count,
+                "fallback_count": self.fallback_count,
+                "trip_count": self.breaker.trip_count,
+                "state": self.breaker.state,
+            }
+
+    def is_support_interval(self, interval: Interval) -> bool:
+        """检查被包装下载器是否支持指定的时间间隔"""
+        return self.downloader.is_support_interval(interval)
+
+    def get_supported_intervals(self) -> List[Interval]:
+        """获取被包装下载器支持的时间间隔"""
+        return self.downloader.get_supported_intervals()
+
+    def get_supported_exchanges(self) -> List[Exchange]:
+        """获取被包装下载器支持的交易所"""
+        return self.downloader.get_supported_exchanges()
@@ -0,0 +1,284 @@
+"""
+股票池下载调度
+
+根据数据库K线概览或AlphaLab的parquet文件获取每只股票最新数据的时间，
+按数据陈旧程度和重要性（如指数成分股）排序，在时间或数量预算内优先更新最有价值的数据。
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
+
+from vnpy.trader.constant import Interval
+from vnpy.trader.database import BarOverview, convert_tz
+from vnpy.trader.utility import extract_vt_symbol
+
+from .base import DownloadRequest, DownloadResult, DataSource
+from .incremental import get_lab_range
+from .manager import StockDataManager
+
+
+def to_naive_db_datetime(dt: datetime) -> datetime:
+    """转换为数据库时区且不含时区信息的时间，不带时区的时间视为数据库时区"""
+    if dt.tzinfo:
+        return convert_tz(dt)
+    return dt
+
+
+@dataclass(order=True)
+class ScheduleItem:
+    """调度队列中的一只股票，按优先级从高到低出队"""
+    sort_key: Tuple[float, float, int] = field(repr=False)                  # (-优先级, -重要性, 加入顺序)
+    vt_symbol: str = field(compare=False)                                   # 本地代码
+    last_datetime: Optional[datetime] = field(compare=False, default=None)  # 本地最新数据时间
+    importance: float = field(compare=False, default=0)                     # 重要性权重
+
+    @property
+    def priority(self) -> float:
+        """优先级"""
+        return -self.sort_key[0]
+
+
+class StalenessScheduler:
+    """按数据陈旧程度和重要性调度下载的股票池调度器"""
+
+    def __init__(self,
+                 manager: StockDataManager,
+                 source: DataSource = DataSource.YFINANCE,
+                 interval: Interval = Interval.DAILY,
+                 to_lab: bool = False):
+        """
+        初始化
+
+        Args:
+            manager: 执行下载的数据管理器
+            source: 数据源
+            interval: 时间间隔
+            to_lab: 是否下载到manager的AlphaLab，同时根据parquet文件判断本地数据，否则读写数据库
+        """
+        self.manager: StockDataManager = manager
+        self.source: DataSource = source
+        self.interval: Interval = interval
+        self.to_lab: bool = to_lab
+
+        self.importances: Dict[str, float] = {}
+
+    def set_importance(self, vt_symbol: str, importance: float) -> None:
+        """
+        设置股票的重要性权重
+
+        Args:
+            vt_symbol: 本地代码
+            importance: 权重，陈旧时间乘以(1 + 权重)作为优先级
+        """
+        self.importances[vt_symbol] = importance
+
+    def add_index_importance(self, index_symbol: str, importance: float, start: datetime, end: datetime) -> None:
+        """
+        为指数最新一期成分股增加重要性权重
+
+        Args:
+            index_symbol: 指数代码
+            importance: 增加的权重
+            start: 成分股数据开始时间
+            end: 成分股数据结束时间
+        """
+        if not self.manager.lab:
+            print("未设置AlphaLab，无法读取指数成分股")
+            return
+
+        index_components: Dict[datetime, List[str]] = self.manager.lab.load_component_data(index_symbol, start, end)
+        if not index_components:
+            return
+
+        for vt_symbol in index_components[max(index_components)]:
+            self.importances[vt_symbol] = self.importances.get(vt_symbol, 0) + importance
+
+    def get_last_datetimes(self, vt_symbols: List[str]) -> Dict[str, Optional[datetime]]:
+        """
+        查询本地最新数据时间
+
+        Args:
+            vt_symbols: 本地代码列表
+
+        Returns:
+            Dict[str, Optional[datetime]]: 本地代码到最新数据时间（数据库时区）的映射，没有数据时为None
+        """
+        # 从下载数据写入的位置判断陈旧程度
+        if self.to_lab:
+            if not self.manager.lab:
+                return {vt_symbol: None for vt_symbol in vt_symbols}
+
+            last_datetimes: Dict[str, Optional[datetime]] = {}
+            for vt_symbol in vt_symbols:
+                stored: Optional[Tuple[datetime, datetime]] = get_lab_range(self.manager.lab, vt_symbol, self.interval)
+                last_datetimes[vt_symbol] = stored[1] if stored else None
+            return last_datetimes
+
+        if not self.manager.database:
+            self.manager.init_database()
+
+        ends: Dict[str, datetime] = {}
+        if self.manager.database:
+            overviews: List[BarOverview] = self.manager.database.get_bar_overview()
+            for overview in overviews:
+                if overview.interval == self.interval and overview.count and overview.exchange and overview.end:
+                    ends[f"{overview.symbol}.{overview.exchange.value}"] = overview.end
+
+        return {vt_symbol: ends.get(vt_symbol) for vt_symbol in vt_symbols}
+
+    def build_queue(self, vt_symbols: List[str], now: Optional[datetime] = None) -> List[ScheduleItem]:
+        """
+        构建按优先级排列的调度队列
+
+        本地没有数据的股票优先级最高，其次按陈旧秒数乘以(1 + 重要性权重)排序。
+
+        Args:
+            vt_symbols: 本地代码列表
+            now: 计算陈旧程度的当前时间，默认为当前时间
+
+        Returns:
+            List[ScheduleItem]: 堆结构的调度队列，使用heapq.heappop按优先级出队
+        """
+        now = to_naive_db_datetime(now or datetime.now().astimezone())
+        last_datetimes: Dict[str, Optional[datetime]] = self.get_last_datetimes(vt_symbols)
+
+        queue: List[ScheduleItem] = []
+
+        for n, vt_symbol in enumerate(vt_symbols):
+            last_dt: Optional[datetime] = last_datetimes.get(vt_symbol)
+            importance: float = self.importances.get(vt_symbol, 0)
+
+            # 没有数据的股票优先级为无穷大，之间按重要性排序
+            if last_dt is None:
+                priority: float = float("inf")
+            else:
+                staleness: float = max((now - to_naive_db_datetime(last_dt)).total_seconds(), 0)
+                priority = staleness * (1 + importance)
+
+            queue.append(ScheduleItem((-priority, -importance, n), vt_symbol, last_dt, importance))
+
+        heapq.heapify(queue)
+        return queue
+
+    def iter_schedule(self, vt_symbols: List[str], now: Optional[datetime] = None) -> Iterator[ScheduleItem]:
+        """
+        按优先级从高到低逐个返回股票
+
+        Args:
+            vt_symbols: 本地代码列表
+            now: 计算陈旧程度的当前时间
+
+        Returns:
+            Iterator[ScheduleItem]: 调度项迭代器
+        """
+        queue: List[ScheduleItem] = self.build_queue(vt_symbols, now)
+        while queue:
+            yield heapq.heappop(queue)
+
+    def run(self,
+            vt_symbols: List[str],
+            time_budget: float = 0,
+            quota: int = 0,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            save_to_db: bool = True,
+            max_workers: int = 8) -> List[DownloadResult]:
+        """
+        按优先级增量下载，直到全部完成或预算用尽
+
+        Args:
+            vt_symbols: 本地代码列表
+            time_budget: 时间预算（秒），用尽后取消尚未开始的下载，0表示不限制
+            quota: 最多下载的股票数量，0表示不限制
+            start_date: 本地没有数据的股票的下载开始时间
+            end_date: 下载结束时间，None表示到最新
+            save_to_db: 是否保存到数据库，下载到AlphaLab时忽略
+            max_workers: 下载线程数
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，下载到AlphaLab时按优先级排列，否则按完成顺序排列
+        """
+        deadline: float = monotonic() + time_budget if time_budget else 0
+
+        requests: List[DownloadRequest] = []
+        for item in self.iter_schedule(vt_symbols):
+            if quota and len(requests) >= quota:
+                break
+
+            symbol, exchange = extract_vt_symbol(item.vt_symbol)
+            requests.append(DownloadRequest(symbol, exchange, start_date, end_date, self.interval))
+
+        if self.to_lab:
+            return self.run_lab(requests, deadline, max_workers)
+
+        results: List[DownloadResult] = []
+        it: Generator[DownloadResult, None, None] = self.manager.iter_download_requests(
+            requests,
+            source=self.source,
+            save_to_db=save_to_db,
+            max_workers=max_workers,
+            incremental=True
+        )
+
+        try:
+            for result in it:
+                results.append(result)
+
+                if deadline and monotonic() >= deadline:
+                    print(f"时间预算已用尽，完成{len(results)}/{len(requests)}只股票")
+                    break
+        finally:
+            it.close()
+
+        return results
+
+    def run_lab(self, requests: List[DownloadRequest], deadline: float, max_workers: int) -> List[DownloadResult]:
+        """
+        按优先级分组增量下载到AlphaLab，每组完成后检查时间预算
+
+        Args:
+            requests: 按优先级排列的下载请求
+            deadline: 时间预算截止的monotonic时间，0表示不限制
+            max_workers: 每组同时下载的股票数量
+
+        Returns:
+            List[DownloadResult]: 下载结果列表，按优先级排列
+        """
+        results: List[DownloadResult] = []
+        group_size: int = max(max_workers, 1)
+
+        n: int = 0
+        while n < len(requests):
+            # 同一交易所的连续请求合并为一组下载
+            exchange = requests[n].exchange
+            group: List[DownloadRequest] = [requests[n]]
+            while n + len(group) < len(requests) and len(group) < group_size:
+                request: DownloadRequest = requests[n + len(group)]
+                if request.exchange != exchange:
+                    break
+                group.append(request)
+            n += len(group)
+
+            results.extend(self.manager.download_to_lab(
+                [request.symbol for request in group],
+                source=self.source,
+                exchange=exchange,
+                start_date=group[0].start_date,
+                end_date=group[0].end_date,
+                interval=self.interval,
+                max_workers=max_workers,
+                incremental=True,
+                compact=False
+            ))
+
+            if deadline and monotonic() >= deadline and n < len(requests):
+                print(f"时间预算已用尽，完成{len(results)}/{len(requests)}只股票")
+                break
+
+        if self.manager.lab_sink:
+            self.manager.lab_sink.compact_async()
+
+        return results
@@ -125,7 +125,8 @@ class VnpyStockDownloader(BaseStockDownloader):
                 request=request,
                 bars=[],
                 success=False,
-                error_msg=f"数据下载失败: {str(e)}"
+                error_msg=f"数据下载失败: {str(e)}",
+                retryable=True
             )
             
     def get_supported_intervals(self) -> List[Interval]:
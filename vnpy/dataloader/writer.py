@@ -0,0 +1,178 @@
+"""
+数据库批量写入缓冲
+
+收集多次下载的K线数据，按数据量或时间间隔批量写入数据库，
+减少每只股票单独写入带来的事务和调用开销。
+"""
+
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Set, Tuple
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+
+from .base import BarColumns, DownloadResult
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+BufferKey = Tuple[str, Exchange, Interval]
+
+
+class BarFrameDatabase(Protocol):
+    """写入缓冲使用的数据库接口，BaseDatabase以及只实现按列写入的数据库均可使用"""
+
+    def save_bar_frame(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """按列批量写入一个合约的K线数据"""
+        ...
+
+
+class BarWriteBuffer:
+    """K线数据库写入缓冲"""
+
+    def __init__(self, database: BarFrameDatabase, max_rows: int = 100_000, max_delay: float = 5.0):
+        """
+        初始化
+
+        Args:
+            database: 写入的数据库
+            max_rows: 缓冲数据量达到该值时写入数据库
+            max_delay: 最早缓冲的数据等待超过该秒数时写入数据库，0表示不按时间写入
+        """
+        self.database: BarFrameDatabase = database
+        self.max_rows: int = max_rows
+        self.max_delay: float = max_delay
+
+        self.buffer: Dict[BufferKey, List[BarColumns]] = {}
+        self.buffer_rows: int = 0
+        self.buffer_time: float = 0
+
+        # 本次写入过的数据最后时间，之后的数据可以使用stream模式追加
+        self.last_datetimes: Dict[BufferKey, np.datetime64] = {}
+
+        # 写入失败的合约，调用方据此确认下载结果是否已保存
+        self.failed_keys: Set[BufferKey] = set()
+
+        self.write_count: int = 0
+        self.fail_count: int = 0
+        self.flush_count: int = 0
+        self.write_seconds: float = 0
+
+        self.lock: Lock = Lock()
+
+    def add(self, result: DownloadResult) -> bool:
+        """
+        缓冲下载结果，达到数据量或时间条件时写入数据库
+
+        Args:
+            result: 下载结果
+
+        Returns:
+            bool: 是否有数据被缓冲
+        """
+        if not result.success or not result.total_count:
+            return False
+
+        columns: Optional[BarColumns] = result.get_columns()
+        if columns is None or not len(columns):
+            return False
+
+        key: BufferKey = (columns.symbol, columns.exchange, columns.interval)
+
+        with self.lock:
+            if not self.buffer_rows:
+                self.buffer_time = perf_counter()
+
+            self.buffer.setdefault(key, []).append(columns)
+            self.buffer_rows += len(columns)
+
+            if self.buffer_rows >= self.max_rows or (
+                self.max_delay and perf_counter() - self.buffer_time >= self.max_delay
+            ):
+                self._flush()
+
+        return True
+
+    def flush(self) -> int:
+        """
+        将缓冲数据全部写入数据库
+
+        Returns:
+            int: 写入成功的数据量
+        """
+        with self.lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        """写入缓冲数据，调用前需要持有锁"""
+        if not self.buffer:
+            return 0
+
+        buffer: Dict[BufferKey, List[BarColumns]] = self.buffer
+        self.buffer = {}
+        self.buffer_rows = 0
+
+        start: float = perf_counter()
+        count: int = 0
+
+        # 数据库根据第一根K线更新概览，因此每个合约单独写入
+        for key, columns_list in buffer.items():
+            columns: Optional[BarColumns] = BarColumns.concat(columns_list)
+            if columns is None:
+                continue
+
+            # 新数据全部位于本次已写入数据之后时，数据库只需要追加概览
+            last_dt: Optional[np.datetime64] = self.last_datetimes.get(key)
+            stream: bool = last_dt is not None and columns.datetime[0] > last_dt
+
+            try:
+                success: bool = self.database.save_bar_frame(
+                    columns.to_polars(), columns.symbol, columns.exchange, columns.interval, stream
+                )
+            except Exception as e:
+                print(f"数据保存异常: {key[0]}, 错误: {e}")
+                success = False
+
+            if success:
+                count += len(columns)
+                if last_dt is None or columns.datetime[-1] > last_dt:
+                    self.last_datetimes[key] = columns.datetime[-1]
+            else:
+                self.fail_count += len(columns)
+                self.failed_keys.add(key)
+
+        elapsed: float = perf_counter() - start
+        self.write_count += count
+        self.write_seconds += elapsed
+        self.flush_count += 1
+
+        speed: float = count / elapsed if elapsed else 0
+        print(f"数据已批量保存到数据库: 合约数量: {len(buffer)}, 数据量: {count}, 速度: {speed:,.0f}条/秒")
+
+        return count
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取写入统计
+
+        Returns:
+            Dict[str, float]: 写入数据量、失败数据量、写入次数、写入耗时和每秒写入数据量
+        """
+        with self.lock:
+            return {
+                "write_count": self.write_count,
+                "fail_count": self.fail_count,
+                "flush_count": self.flush_count,
+                "write_seconds": self.write_seconds,
+                "rows_per_second": self.write_count / self.write_seconds if self.write_seconds else 0.0,
+            }
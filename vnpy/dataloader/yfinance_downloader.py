@@ -4,19 +4,35 @@
 使用yfinance库下载Yahoo Finance的美股数据
 """
 
-from datetime import datetime
-from typing import List, Optional
-import pytz
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
 
 from vnpy.trader.object import BarData
 from vnpy.trader.constant import Exchange, Interval
-from vnpy.trader.database import convert_tz
 
-from .base import BaseStockDownloader, DownloadRequest, DownloadResult, DataSource
+from .base import (
+    BaseStockDownloader,
+    DownloadRequest,
+    DownloadResult,
+    DataSource,
+    convert_dataframe_to_bars,
+    convert_dataframe_to_columns
+)
 
 
 class YfinanceStockDownloader(BaseStockDownloader):
     """基于yfinance的股票下载器"""
+
+    # Yahoo Finance对日内数据单次请求的时间跨度有限制
+    chunk_sizes: Dict[Interval, timedelta] = {
+        Interval.MINUTE: timedelta(days=7),
+        Interval.HOUR: timedelta(days=365),
+    }
+
+    # yf.download单次请求的股票数量
+    batch_size: int = 100
     
     def __init__(self):
         """初始化"""
@@ -76,6 +92,19 @@ class YfinanceStockDownloader(BaseStockDownloader):
         # yfinance会自动识别美股代码
         return ""
         
+    def _get_yf_symbol(self, request: DownloadRequest) -> str:
+        """
+        构建yfinance股票代码
+
+        Args:
+            request: 下载请求
+
+        Returns:
+            str: yfinance股票代码
+        """
+        suffix = self._convert_exchange_to_yf_suffix(request.exchange)
+        return f"{request.symbol}{suffix}"
+
     def _convert_yf_data_to_vnpy(self, df, symbol: str, exchange: Exchange, interval: Interval) -> List[BarData]:
         """
         将yfinance数据转换为vnpy BarData格式
@@ -89,41 +118,8 @@ class YfinanceStockDownloader(BaseStockDownloader):
         Returns:
             List[BarData]: vnpy BarData列表
         """
-        bars = []
-        
-        if df is None or df.empty:
-            return bars
-            
-        for timestamp, row in df.iterrows():
-            # 处理时间戳
-            if hasattr(timestamp, 'tz_localize'):
-                # 如果没有时区信息，假设为UTC
-                if timestamp.tz is None:
-                    timestamp = timestamp.tz_localize('UTC')
-                # 转换为ET（美股交易时间）
-                timestamp = timestamp.tz_convert('America/New_York')
-            
-            # 转换为vnpy数据库时区
-            dt = convert_tz(timestamp.to_pydatetime())
-            
-            # 创建BarData对象
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                datetime=dt,
-                interval=interval,
-                volume=float(row.get('Volume', 0)),
-                turnover=0.0,  # yfinance不提供成交额
-                open_interest=0.0,  # 股票没有持仓量
-                open_price=float(row.get('Open', 0)),
-                high_price=float(row.get('High', 0)),
-                low_price=float(row.get('Low', 0)),
-                close_price=float(row.get('Close', 0)),
-                gateway_name="yfinance"
-            )
-            bars.append(bar)
-            
-        return bars
+        # yfinance返回的无时区时间戳为UTC时间
+        return convert_dataframe_to_bars(df, symbol, exchange, interval, "yfinance", naive_tz="UTC")
         
     def download_bars(self, request: DownloadRequest) -> DownloadResult:
         """
@@ -154,46 +150,186 @@ class YfinanceStockDownloader(BaseStockDownloader):
                 error_msg="yfinance未初始化，请先调用init_connection"
             )
             
+        # 超过单次请求时间跨度限制时拆分为多段并行下载
+        if len(self.split_request(request)) > 1:
+            return self.download_bars_chunked(request)
+            
         try:
             # 构建yfinance股票代码
-            yf_symbol = request.symbol
-            suffix = self._convert_exchange_to_yf_suffix(request.exchange)
-            if suffix:
-                yf_symbol = f"{request.symbol}{suffix}"
+            yf_symbol = self._get_yf_symbol(request)
                 
-            # 创建yfinance股票对象
-            ticker = self.yf.Ticker(yf_symbol)
-            
             # 转换时间间隔
             yf_interval = self._convert_interval_to_yf(request.interval)
             
-            # 下载历史数据
-            df = ticker.history(
-                start=request.start_date,
-                end=request.end_date,
-                interval=yf_interval,
-                auto_adjust=True,  # 自动调整价格
-                prepost=False,     # 不包含盘前盘后
-                actions=False      # 不包含股息分红信息
-            )
+            def fetch():
+                """下载历史数据"""
+                # 创建yfinance股票对象
+                ticker = self.yf.Ticker(yf_symbol)
+                
+                return ticker.history(
+                    start=request.start_date,
+                    end=request.end_date,
+                    interval=yf_interval,
+                    auto_adjust=True,  # 自动调整价格
+                    prepost=False,     # 不包含盘前盘后
+                    actions=False      # 不包含股息分红信息
+                )
             
-            # 转换为vnpy格式
-            bars = self._convert_yf_data_to_vnpy(df, request.symbol, request.exchange, request.interval)
+            # 设置了缓存时优先读取缓存
+            df = self.fetch_frame(request, fetch)
             
-            return DownloadResult(
-                request=request,
-                bars=bars,
-                success=True if bars else False,
-                error_msg="" if bars else "未获取到数据或股票代码不存在"
-            )
+            return self._create_result(request, df)
             
         except Exception as e:
             return DownloadResult(
                 request=request,
                 bars=[],
                 success=False,
-                error_msg=f"yfinance数据下载失败: {str(e)}"
+                error_msg=f"yfinance数据下载失败: {str(e)}",
+                retryable=True
+            )
+
+    def _create_result(self, request: DownloadRequest, df: Optional[pd.DataFrame]) -> DownloadResult:
+        """
+        将yfinance返回的单只股票数据转换为下载结果
+        
+        Args:
+            request: 下载请求
+            df: yfinance返回的DataFrame
+            
+        Returns:
+            DownloadResult: 下载结果
+        """
+        # 按列转换为vnpy格式，BarData在访问result.bars时才生成
+        columns = convert_dataframe_to_columns(
+            df, request.symbol, request.exchange, request.interval, "yfinance", naive_tz="UTC"
+        )
+        
+        return DownloadResult(
+            request=request,
+            bars=None,
+            columns=columns,
+            success=columns is not None,
+            error_msg="" if columns is not None else "未获取到数据或股票代码不存在"
+        )
+
+    def download_bars_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        批量下载K线数据
+        
+        时间范围和时间间隔相同的请求按batch_size分组，每组通过一次yf.download请求获取，
+        再按股票代码拆分为各自的下载结果。需要分段下载、校验失败或命中缓存的请求单独处理。
+        
+        Args:
+            requests: 下载请求列表
+            
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        results: List[Optional[DownloadResult]] = [None] * len(requests)
+        groups: Dict[Tuple[Optional[datetime], Optional[datetime], Interval], List[int]] = {}
+        
+        for i, request in enumerate(requests):
+            is_valid, _ = self.validate_request(request)
+            if not self.yf or not is_valid or len(self.split_request(request)) > 1:
+                results[i] = self.download_bars(request)
+                continue
+                
+            df = self.lookup_frame(request)
+            if df is not None:
+                results[i] = self._create_result(request, df)
+                continue
+                
+            key = (request.start_date, request.end_date, request.interval)
+            groups.setdefault(key, []).append(i)
+            
+        for indexes in groups.values():
+            for n in range(0, len(indexes), self.batch_size):
+                batch = [requests[i] for i in indexes[n:n + self.batch_size]]
+                batch_results = self._download_batch(batch)
+                
+                for i, result in zip(indexes[n:n + self.batch_size], batch_results, strict=True):
+                    results[i] = result
+
+        # 每个请求都已在上面得到结果
+        downloaded: List[DownloadResult] = [result for result in results if result is not None]
+        assert len(downloaded) == len(requests)
+        return downloaded
+        
+    def _download_batch(self, requests: List[DownloadRequest]) -> List[DownloadResult]:
+        """
+        通过一次yf.download请求下载时间范围和时间间隔相同的多只股票
+        
+        Args:
+            requests: 下载请求列表
+            
+        Returns:
+            List[DownloadResult]: 下载结果列表，与请求一一对应
+        """
+        first = requests[0]
+        yf_symbols = [self._get_yf_symbol(request) for request in requests]
+        
+        try:
+            data = self.yf.download(
+                tickers=yf_symbols,
+                start=first.start_date,
+                end=first.end_date,
+                interval=self._convert_interval_to_yf(first.interval),
+                group_by="ticker",
+                auto_adjust=True,
+                prepost=False,
+                actions=False,
+                threads=False,
+                progress=False
             )
+        except Exception as e:
+            return [
+                DownloadResult(
+                    request=request,
+                    bars=[],
+                    success=False,
+                    error_msg=f"yfinance数据下载失败: {str(e)}",
+                    retryable=True
+                )
+                for request in requests
+            ]
+            
+        results = []
+        
+        for request, yf_symbol in zip(requests, yf_symbols, strict=True):
+            df = self._split_batch_frame(data, yf_symbol)
+            self.store_frame(request, df)
+            results.append(self._create_result(request, df))
+            
+        return results
+        
+    def _split_batch_frame(self, data: Optional[pd.DataFrame], yf_symbol: str) -> Optional[pd.DataFrame]:
+        """
+        从yf.download返回的多股票数据中取出单只股票的数据
+        
+        Args:
+            data: yf.download返回的DataFrame，列为(股票代码, 字段)
+            yf_symbol: yfinance股票代码
+            
+        Returns:
+            Optional[pd.DataFrame]: 单只股票数据，没有数据时返回None
+        """
+        if data is None or data.empty:
+            return None
+            
+        if isinstance(data.columns, pd.MultiIndex):
+            if yf_symbol not in data.columns.get_level_values(0):
+                return None
+            df = data[yf_symbol]
+        else:
+            # 旧版本yfinance只请求一只股票时返回单层列
+            df = data
+            
+        # 合并下载时各股票共用时间索引，没有交易的时间整行为空
+        df = df.dropna(how="all")
+        if df.empty:
+            return None
+        return df
             
     def get_supported_intervals(self) -> List[Interval]:
         """
@@ -1,8 +1,22 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    ConflatedSubscription,
+    OverflowPolicy,
+    EVENT_TIMER,
+    EVENT_STATS,
+    get_type_key,
+    get_vt_symbol_key
+)
 
 
 __all__ = [
     "Event",
     "EventEngine",
+    "ConflatedSubscription",
+    "OverflowPolicy",
     "EVENT_TIMER",
+    "EVENT_STATS",
+    "get_type_key",
+    "get_vt_symbol_key",
 ]
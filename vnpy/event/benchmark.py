@@ -0,0 +1,210 @@
+"""
+Event engine throughput and latency benchmark.
+
+Usage:
+    python -m vnpy.event.benchmark shard --events 100000 --shards 4 --slow-ms 4 --rate 20000
+    python -m vnpy.event.benchmark drain --events 200000 --batch-size 1000
+"""
+
+import json
+from argparse import ArgumentParser
+from threading import Event as Signal, Lock
+from time import perf_counter, sleep
+
+from .engine import Event, EventEngine, get_vt_symbol_key
+
+
+EVENT_TICK = "eTick."
+EVENT_LOG = "eLog"
+
+
+class TickStub:
+    """Tick data with vt_symbol and the time it was put into engine"""
+
+    def __init__(self, vt_symbol: str) -> None:
+        """"""
+        self.vt_symbol: str = vt_symbol
+        self.put_time: float = perf_counter()
+
+
+class LatencyRecorder:
+    """Record dispatch latency of tick events until expected count is reached"""
+
+    def __init__(self, count: int) -> None:
+        """"""
+        self.count: int = count
+        self.latencies: list[float] = []
+        self.lock: Lock = Lock()
+        self.finished: Signal = Signal()
+
+    def process_tick_event(self, event: Event) -> None:
+        """"""
+        latency: float = perf_counter() - event.data.put_time
+
+        with self.lock:
+            self.latencies.append(latency)
+            if len(self.latencies) >= self.count:
+                self.finished.set()
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """Get percentile of values by nearest rank"""
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    ix: int = min(int(len(values) * percentile / 100), len(values) - 1)
+    return values[ix]
+
+
+def run_shard_benchmark(
+    event_count: int,
+    shard_count: int,
+    symbol_count: int = 100,
+    log_every: int = 100,
+    slow_ms: float = 4.0,
+    rate: int = 0
+) -> dict[str, dict]:
+    """
+    Put tick events mixed with log events handled by a slow handler, compare
+    single thread engine with sharded engine routed by vt_symbol.
+
+    Events are put at rate per second (0 for as fast as possible), so latency
+    measures dispatch delay instead of producer backlog.
+    """
+    results: dict[str, dict] = {}
+
+    for name, count in [("single", 1), ("sharded", shard_count)]:
+        engine: EventEngine = EventEngine(shard_count=count, shard_key=get_vt_symbol_key)
+        recorder: LatencyRecorder = LatencyRecorder(event_count)
+
+        def process_log_event(event: Event) -> None:
+            sleep(slow_ms / 1000)
+
+        engine.register(EVENT_TICK, recorder.process_tick_event)
+        engine.register(EVENT_LOG, process_log_event)
+        engine.start()
+
+        start: float = perf_counter()
+
+        for i in range(event_count):
+            engine.put(Event(EVENT_TICK, TickStub(f"SYM{i % symbol_count}.SSE")))
+
+            if not i % log_every:
+                engine.put(Event(EVENT_LOG))
+
+            if rate and not i % 100:
+                delay: float = start + i / rate - perf_counter()
+                if delay > 0:
+                    sleep(delay)
+
+        recorder.finished.wait()
+        cost: float = perf_counter() - start
+
+        engine.stop()
+
+        results[name] = {
+            "shards": count,
+            "events": event_count,
+            "seconds": cost,
+            "events_per_second": event_count / cost,
+            "p50_latency_ms": get_percentile(recorder.latencies, 50) * 1000,
+            "p99_latency_ms": get_percentile(recorder.latencies, 99) * 1000,
+        }
+
+    return results
+
+
+def run_drain_benchmark(
+    event_count: int,
+    batch_size: int,
+    handler_counts: tuple[int, ...] = (1, 10, 100)
+) -> dict[str, dict]:
+    """
+    Put events as fast as possible and measure events processed per second by
+    queue mode and batched drain mode with different number of handlers.
+    """
+    results: dict[str, dict] = {}
+
+    for handler_count in handler_counts:
+        for name, size in [("queue", 0), ("batch", batch_size)]:
+            engine: EventEngine = EventEngine(batch_size=size)
+            finished: Signal = Signal()
+            last: int = event_count - 1
+
+            def process_last_event(event: Event, last: int = last, finished: Signal = finished) -> None:
+                if event.data == last:
+                    finished.set()
+
+            # Each handler is a distinct function object
+            for _ in range(handler_count - 1):
+                engine.register(EVENT_TICK, lambda event: None)
+            engine.register(EVENT_TICK, process_last_event)
+            engine.start()
+
+            start: float = perf_counter()
+
+            for i in range(event_count):
+                engine.put(Event(EVENT_TICK, i))
+
+            finished.wait()
+            cost: float = perf_counter() - start
+
+            engine.stop()
+
+            results[f"{name}_{handler_count}"] = {
+                "mode": name,
+                "handlers": handler_count,
+                "events": event_count,
+                "seconds": cost,
+                "events_per_second": event_count / cost,
+            }
+
+    return results
+
+
+def main() -> None:
+    """"""
+    parser = ArgumentParser(description="EventEngine benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    shard_parser = subparsers.add_parser("shard", help="single thread vs sharded engine with a slow log handler")
+    shard_parser.add_argument("--events", type=int, default=100_000, help="number of tick events")
+    shard_parser.add_argument("--shards", type=int, default=4, help="number of shards")
+    shard_parser.add_argument("--symbols", type=int, default=100, help="number of vt_symbols")
+    shard_parser.add_argument("--log-every", type=int, default=100, help="put one log event every N ticks")
+    shard_parser.add_argument("--slow-ms", type=float, default=4.0, help="log handler cost in milliseconds")
+    shard_parser.add_argument("--rate", type=int, default=20_000, help="events put per second, 0 for unlimited")
+
+    drain_parser = subparsers.add_parser("drain", help="queue vs batched drain with 1, 10 and 100 handlers")
+    drain_parser.add_argument("--events", type=int, default=200_000, help="number of events")
+    drain_parser.add_argument("--batch-size", type=int, default=1000, help="max events drained per batch")
+
+    for subparser in (shard_parser, drain_parser):
+        subparser.add_argument("--json", action="store_true", help="print results as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "shard":
+        results: dict = run_shard_benchmark(
+            args.events, args.shards, args.symbols, args.log_every, args.slow_ms, args.rate
+        )
+    elif args.command == "drain":
+        results = run_drain_benchmark(args.events, args.batch_size)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        if args.command == "shard":
+            print(
+                f"{name} ({result['shards']} shards): {result['events_per_second']:,.0f} events/s, "
+                f"p50 {result['p50_latency_ms']:.2f}ms, p99 {result['p99_latency_ms']:.2f}ms"
+            )
+        else:
+            print(f"{result['mode']} ({result['handlers']} handlers): {result['events_per_second']:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
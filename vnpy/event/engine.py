@@ -2,15 +2,20 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
-from collections.abc import Callable
+from collections import defaultdict, deque
+from collections.abc import Callable, Hashable
+from enum import Enum
+from functools import partial
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any
+from threading import Condition, Event as Signal, Lock, Thread, get_ident
+from time import monotonic, perf_counter, sleep
+from typing import Any, Protocol
+
+from .stats import EventStats
 
 
 EVENT_TIMER = "eTimer"
+EVENT_STATS = "eEventStats"
 
 
 class Event:
@@ -25,10 +30,323 @@ class Event:
         self.type: str = type
         self.data: Any = data
 
+        # Set by engine with instrument enabled, used to measure event age
+        self.put_time: float = 0
+
 
 # Defines handler function to be used in event engine.
 HandlerType = Callable[[Event], None]
 
+# Defines function returning the key used to route event to a shard.
+KeyType = Callable[[Event], Hashable]
+
+
+def get_type_key(event: Event) -> Hashable:
+    """
+    Route events by type, events of the same type keep their order.
+    """
+    return event.type
+
+
+def get_vt_symbol_key(event: Event) -> Hashable:
+    """
+    Route events by vt_symbol of event data (type if data has none),
+    events of the same contract keep their order.
+    """
+    return getattr(event.data, "vt_symbol", event.type)
+
+
+class EventQueue(Protocol):
+    """
+    Interface of event queues used by dispatch threads.
+    """
+
+    def put(self, event: Event, block: bool = True) -> None:
+        """
+        Put an event into queue, block is only used by bounded queue.
+        """
+        ...
+
+    def qsize(self) -> int:
+        """
+        Number of events in queue.
+        """
+        ...
+
+
+class BatchQueue:
+    """
+    Unbounded FIFO queue based on deque. Append and popleft of deque are
+    thread safe without lock, the signal is only used to wake up consumer
+    waiting on an empty queue.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.events: deque = deque()
+        self.signal: Signal = Signal()
+
+    def put(self, event: Event, block: bool = True) -> None:
+        """
+        Put an event into queue and wake up consumer, never blocks.
+        """
+        self.events.append(event)
+
+        if not self.signal.is_set():
+            self.signal.set()
+
+    def wait(self, timeout: float) -> None:
+        """
+        Wait until new event is put or timeout.
+        """
+        self.signal.clear()
+
+        # Check again after clear so an event put in between is not missed
+        if not self.events:
+            self.signal.wait(timeout)
+
+    def qsize(self) -> int:
+        """
+        Number of events in queue.
+        """
+        return len(self.events)
+
+
+class OverflowPolicy(Enum):
+    """
+    What to do when an event is put into a full BoundedQueue.
+    """
+
+    BLOCK = "block"                 # Wait until consumer makes room
+    DROP_OLDEST = "drop_oldest"     # Drop oldest pending event of the same type
+    DROP_NEWEST = "drop_newest"     # Drop the new event
+    CONFLATE = "conflate"           # Replace pending event with same type and key
+
+
+class BoundedQueue:
+    """
+    FIFO queue holding at most max_size events, overflow is handled by the
+    policy of event type.
+
+    Pending events are kept in slots (one item lists), so a dropped or
+    conflated event can be removed or replaced in place without scanning.
+    Slots of dropped events are compacted once they outnumber pending ones.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        policies: dict[str, OverflowPolicy],
+        default_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        conflate_key: KeyType = get_vt_symbol_key
+    ) -> None:
+        """"""
+        self.max_size: int = max_size
+        self.policies: dict[str, OverflowPolicy] = policies
+        self.default_policy: OverflowPolicy = default_policy
+        self.conflate_key: KeyType = conflate_key
+
+        self.slots: deque[list] = deque()
+        self.type_slots: defaultdict[str, deque[list]] = defaultdict(deque)
+        self.key_slots: dict[tuple[str, Hashable], list] = {}
+        self.size: int = 0
+        self.dead: int = 0
+        self.closed: bool = False
+
+        self.mutex: Lock = Lock()
+        self.not_empty: Condition = Condition(self.mutex)
+        self.not_full: Condition = Condition(self.mutex)
+
+        self.dropped: defaultdict[str, int] = defaultdict(int)
+        self.blocked: defaultdict[str, int] = defaultdict(int)
+        self.conflated: defaultdict[str, int] = defaultdict(int)
+
+    def put(self, event: Event, block: bool = True) -> None:
+        """
+        Put an event into queue. With block False, BLOCK policy puts the event
+        beyond max_size instead of waiting (used by dispatch threads).
+        """
+        type: str = event.type
+        policy: OverflowPolicy = self.policies.get(type, self.default_policy)
+
+        with self.mutex:
+            key: tuple[str, Hashable] | None = None
+
+            if policy is OverflowPolicy.CONFLATE:
+                key = (type, self.conflate_key(event))
+                slot: list | None = self.key_slots.get(key, None)
+
+                if slot and slot[0]:
+                    slot[0] = event
+                    self.conflated[type] += 1
+                    return
+
+            if self.size >= self.max_size and not self.closed:
+                if policy is OverflowPolicy.BLOCK:
+                    if block:
+                        self.blocked[type] += 1
+                        while self.size >= self.max_size and not self.closed:
+                            self.not_full.wait()
+                elif policy is OverflowPolicy.DROP_OLDEST and self.type_slots.get(type, None):
+                    self.type_slots[type].popleft()[0] = None
+                    self.size -= 1
+                    self.dead += 1
+                    self.dropped[type] += 1
+
+                    if self.dead > self.size:
+                        self.slots = deque(slot for slot in self.slots if slot[0])
+                        self.dead = 0
+                else:
+                    # DROP_NEWEST, or nothing of the same type to drop or conflate
+                    self.dropped[type] += 1
+                    return
+
+            slot = [event]
+            self.slots.append(slot)
+            self.type_slots[type].append(slot)
+            if key:
+                self.key_slots[key] = slot
+
+            self.size += 1
+            self.not_empty.notify()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Event:
+        """
+        Remove and return the oldest pending event, raise Empty if no event
+        is available within timeout.
+        """
+        with self.not_empty:
+            if block and timeout:
+                end: float = monotonic() + timeout
+
+            while True:
+                while self.slots:
+                    slot: list = self.slots.popleft()
+                    event: Event | None = slot[0]
+
+                    # Skip slot of dropped event
+                    if not event:
+                        self.dead -= 1
+                        continue
+
+                    slot[0] = None
+                    self.size -= 1
+
+                    type_slots: deque[list] = self.type_slots[event.type]
+                    type_slots.popleft()
+                    if not type_slots:
+                        self.type_slots.pop(event.type)
+
+                    if self.key_slots:
+                        key: tuple[str, Hashable] = (event.type, self.conflate_key(event))
+                        if self.key_slots.get(key, None) is slot:
+                            self.key_slots.pop(key)
+
+                    self.not_full.notify()
+                    return event
+
+                if not block:
+                    raise Empty
+
+                if timeout:
+                    remaining: float = end - monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self.not_empty.wait(remaining)
+                else:
+                    self.not_empty.wait()
+
+    def qsize(self) -> int:
+        """
+        Number of pending events.
+        """
+        return self.size
+
+    def close(self) -> None:
+        """
+        Stop enforcing max_size and release blocked producers.
+        """
+        with self.mutex:
+            self.closed = True
+            self.not_full.notify_all()
+
+
+class ConflatedSubscription:
+    """
+    Handler wrapper merging pending events with the same key.
+
+    Events are stored by key and the handler is called in a separate thread,
+    so when the handler is slow it only sees the newest event of each key
+    instead of building a backlog. Memory is bounded by number of keys.
+    """
+
+    def __init__(self, handler: HandlerType, key: KeyType = get_vt_symbol_key) -> None:
+        """"""
+        self.handler: HandlerType = handler
+        self.key: KeyType = key
+
+        self.pending: dict[Hashable, Event] = {}
+        self.lock: Lock = Lock()
+        self.signal: Signal = Signal()
+
+        self.conflated_count: int = 0
+
+        self.active: bool = False
+        self.thread: Thread | None = None
+
+    def __call__(self, event: Event) -> None:
+        """
+        Store event replacing pending one with same key, then wake up thread.
+        """
+        key: Hashable = self.key(event)
+
+        with self.lock:
+            if key in self.pending:
+                self.conflated_count += 1
+            self.pending[key] = event
+
+        self.signal.set()
+
+    def run(self) -> None:
+        """
+        Call handler with newest pending events.
+        """
+        while self.active:
+            self.signal.wait(1)
+            self.signal.clear()
+
+            with self.lock:
+                events: dict[Hashable, Event] = self.pending
+                self.pending = {}
+
+            for event in events.values():
+                self.handler(event)
+
+    def start(self) -> None:
+        """
+        Start handler thread.
+        """
+        if self.active:
+            return
+
+        self.active = True
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop handler thread, pending events are discarded.
+        """
+        if not self.active:
+            return
+
+        self.active = False
+        self.signal.set()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
 
 class EventEngine:
     """
@@ -37,32 +355,132 @@ class EventEngine:
 
     It also generates timer event by every interval seconds,
     which can be used for timing purpose.
+
+    With shard_count larger than 1, events are routed by shard_key into
+    shard_count queues, each processed by its own thread. Events with the
+    same key are processed in order, while handlers of different shards
+    may run at the same time and must be thread safe.
+
+    With batch_size larger than 0, events are put into lock free BatchQueue
+    and drained up to batch_size at a time, for higher throughput under
+    heavy load.
+
+    With max_size larger than 0, each queue holds at most max_size events
+    (batch_size is not used). Overflow is handled by OverflowPolicy set per
+    event type with set_overflow_policy, overflow_policy for other types.
+    Dispatch threads never block on their own queue to avoid deadlock.
+
+    With instrument enabled, per-handler call count and latency, queue depth
+    and event age at dispatch are recorded. They can be read by get_stats, and
+    are also put as EVENT_STATS event every summary_interval timer events.
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(
+        self,
+        interval: int = 1,
+        shard_count: int = 1,
+        shard_key: KeyType = get_type_key,
+        batch_size: int = 0,
+        instrument: bool = False,
+        summary_interval: int = 60,
+        max_size: int = 0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    ) -> None:
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
         """
         self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._shard_count: int = max(shard_count, 1)
+        self._shard_key: KeyType = shard_key
+        self._batch_size: int = batch_size
+
+        # Shared by all queues so policy changes apply to every shard
+        self._max_size: int = max_size
+        self._policies: dict[str, OverflowPolicy] = {}
+        self._dispatch_idents: set[int] = set()
+
+        self._queues: list[EventQueue]
+        run: Callable[..., None]
+
+        if max_size > 0:
+            self._queues = [
+                BoundedQueue(max_size, self._policies, overflow_policy) for _ in range(self._shard_count)
+            ]
+            run = self._run
+        elif batch_size > 0:
+            self._queues = [BatchQueue() for _ in range(self._shard_count)]
+            run = self._run_batch
+        else:
+            self._queues = [Queue() for _ in range(self._shard_count)]
+            run = self._run
+
+        # Each dispatch thread records into its own stats, merged in get_stats
+        self._instrument: bool = instrument
+        self._stats: list[EventStats | None] = [
+            EventStats() if instrument else None for _ in self._queues
+        ]
+        self._summary_interval: int = summary_interval
+        self._summary_count: int = 0
+
+        self._queue: EventQueue = self._queues[0]
         self._active: bool = False
-        self._thread: Thread = Thread(target=self._run)
+        self._threads: list[Thread] = [
+            Thread(target=run, args=(queue, stats)) for queue, stats in zip(self._queues, self._stats, strict=True)
+        ]
+        self._thread: Thread = self._threads[0]
         self._timer: Thread = Thread(target=self._run_timer)
         self._handlers: defaultdict = defaultdict(list)
         self._general_handlers: list = []
 
-    def _run(self) -> None:
+        # Handlers to call for each type (general handlers appended), only
+        # rebuilt on register and unregister so dispatch creates no lists
+        self._handler_table: dict[str, tuple[HandlerType, ...]] = {}
+        self._general_table: tuple[HandlerType, ...] = ()
+
+        self._subscriptions: dict[tuple[str, HandlerType], ConflatedSubscription] = {}
+
+        if instrument:
+            self.register(EVENT_TIMER, self._process_timer_event)
+
+    def _get_process(self, queue: EventQueue, stats: EventStats | None) -> Callable[[Event], None]:
+        """
+        Get function processing events of one queue.
+        """
+        if stats:
+            return partial(self._process_instrumented, queue=queue, stats=stats)
+        return self._process
+
+    def _run(self, queue: Queue | BoundedQueue, stats: EventStats | None = None) -> None:
         """
         Get event from queue and then process it.
         """
+        process: Callable[[Event], None] = self._get_process(queue, stats)
+
         while self._active:
             try:
-                event: Event = self._queue.get(block=True, timeout=1)
-                self._process(event)
+                event: Event = queue.get(block=True, timeout=1)
+                process(event)
             except Empty:
                 pass
 
+    def _run_batch(self, queue: BatchQueue, stats: EventStats | None = None) -> None:
+        """
+        Drain events from queue in batches and then process them.
+        """
+        process: Callable[[Event], None] = self._get_process(queue, stats)
+        popleft: Callable[[], Event] = queue.events.popleft
+
+        while self._active:
+            for _ in range(self._batch_size):
+                try:
+                    event: Event = popleft()
+                except IndexError:
+                    queue.wait(1)
+                    break
+
+                process(event)
+
     def _process(self, event: Event) -> None:
         """
         First distribute event to those handlers registered listening
@@ -71,11 +489,48 @@ class EventEngine:
         Then distribute event to those general handlers which listens
         to all types.
         """
-        if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+        for handler in self._handler_table.get(event.type, self._general_table):
+            handler(event)
+
+    def _process_instrumented(self, event: Event, queue: EventQueue, stats: EventStats) -> None:
+        """
+        Process event and record queue depth, event age and handler latency.
+        """
+        if event.put_time:
+            stats.event_age.add(perf_counter() - event.put_time)
+        stats.queue_depth.add(queue.qsize())
+
+        # Start timing after bookkeeping so it is not counted in first handler
+        start: float = perf_counter()
+
+        for handler in self._handler_table.get(event.type, self._general_table):
+            handler(event)
+
+            end: float = perf_counter()
+            stats.add_handler_cost(handler, end - start)
+            start = end
+
+    def _process_timer_event(self, event: Event) -> None:
+        """
+        Put statistics summary every summary_interval timer events.
+        """
+        self._summary_count += 1
+
+        if self._summary_count >= self._summary_interval:
+            self._summary_count = 0
+            self.put(Event(EVENT_STATS, self.get_stats()))
+
+    def _update_handler_table(self) -> None:
+        """
+        Rebuild handler snapshot used by _process.
+        """
+        general_table: tuple[HandlerType, ...] = tuple(self._general_handlers)
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        self._handler_table = {
+            type: tuple(handlers) + general_table
+            for type, handlers in self._handlers.items()
+        }
+        self._general_table = general_table
 
     def _run_timer(self) -> None:
         """
@@ -91,22 +546,48 @@ class EventEngine:
         Start event engine to process events and generate timer events.
         """
         self._active = True
-        self._thread.start()
+        for thread in self._threads:
+            thread.start()
+            self._dispatch_idents.add(thread.ident)     # type: ignore
         self._timer.start()
 
+        for subscription in list(self._subscriptions.values()):
+            subscription.start()
+
     def stop(self) -> None:
         """
         Stop event engine.
         """
         self._active = False
+
+        # Release producers blocked on full queues
+        for queue in self._queues:
+            if isinstance(queue, BoundedQueue):
+                queue.close()
+
         self._timer.join()
-        self._thread.join()
+        for thread in self._threads:
+            thread.join()
+
+        for subscription in list(self._subscriptions.values()):
+            subscription.stop()
 
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
         """
-        self._queue.put(event)
+        if self._instrument:
+            event.put_time = perf_counter()
+
+        if self._shard_count > 1:
+            queue: EventQueue = self._queues[hash(self._shard_key(event)) % self._shard_count]
+        else:
+            queue = self._queue
+
+        if self._max_size:
+            queue.put(event, get_ident() not in self._dispatch_idents)
+        else:
+            queue.put(event)
 
     def register(self, type: str, handler: HandlerType) -> None:
         """
@@ -117,6 +598,8 @@ class EventEngine:
         if handler not in handler_list:
             handler_list.append(handler)
 
+        self._update_handler_table()
+
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
         Unregister an existing handler function from event engine.
@@ -129,6 +612,59 @@ class EventEngine:
         if not handler_list:
             self._handlers.pop(type)
 
+        self._update_handler_table()
+
+    def set_overflow_policy(self, type: str, policy: OverflowPolicy) -> None:
+        """
+        Set overflow policy of an event type, only used with max_size.
+        """
+        self._policies[type] = policy
+
+    def get_overflow_counts(self) -> dict[str, dict[str, int]]:
+        """
+        Get number of dropped, blocked and conflated events of each type.
+        """
+        counts: dict[str, defaultdict[str, int]] = {
+            "dropped": defaultdict(int),
+            "blocked": defaultdict(int),
+            "conflated": defaultdict(int),
+        }
+
+        for queue in self._queues:
+            if isinstance(queue, BoundedQueue):
+                for name, type_counts in counts.items():
+                    for type, count in list(getattr(queue, name).items()):
+                        type_counts[type] += count
+
+        return {name: dict(type_counts) for name, type_counts in counts.items()}
+
+    def register_conflated(self, type: str, handler: HandlerType, key: KeyType = get_vt_symbol_key) -> None:
+        """
+        Register a handler only interested in the newest event of each key,
+        e.g. latest tick of each vt_symbol. The handler is called in its own
+        thread through ConflatedSubscription.
+        """
+        if (type, handler) in self._subscriptions:
+            return
+
+        subscription: ConflatedSubscription = ConflatedSubscription(handler, key)
+        self._subscriptions[(type, handler)] = subscription
+        self.register(type, subscription)
+
+        if self._active:
+            subscription.start()
+
+    def unregister_conflated(self, type: str, handler: HandlerType) -> None:
+        """
+        Unregister an existing conflated handler.
+        """
+        subscription: ConflatedSubscription | None = self._subscriptions.pop((type, handler), None)
+        if not subscription:
+            return
+
+        self.unregister(type, subscription)
+        subscription.stop()
+
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types. Every
@@ -137,9 +673,35 @@ class EventEngine:
         if handler not in self._general_handlers:
             self._general_handlers.append(handler)
 
+        self._update_handler_table()
+
     def unregister_general(self, handler: HandlerType) -> None:
         """
         Unregister an existing general handler function.
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+
+        self._update_handler_table()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get statistics merged from all dispatch threads, empty if instrument
+        is not enabled.
+        """
+        if not self._instrument:
+            return {}
+
+        merged: EventStats = EventStats()
+        for stats in self._stats:
+            if stats:
+                merged.merge(stats)
+        return merged.to_dict()
+
+    def reset_stats(self) -> None:
+        """
+        Clear recorded statistics.
+        """
+        for stats in self._stats:
+            if stats:
+                stats.clear()
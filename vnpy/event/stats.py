@@ -0,0 +1,156 @@
+"""
+Statistics collected by event engine when instrumentation is enabled.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import Any
+
+
+# Upper bounds of histogram buckets, values above the last bound go to an overflow bucket
+LATENCY_BOUNDS: tuple[float, ...] = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0)
+DEPTH_BOUNDS: tuple[float, ...] = (0, 1, 10, 100, 1000, 10000)
+
+
+class Histogram:
+    """
+    Count values into fixed buckets.
+    """
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """"""
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.max: float = 0
+
+    def add(self, value: float) -> None:
+        """
+        Add one value into its bucket.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Add counts of another histogram with same bounds.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """"""
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "max": self.max,
+        }
+
+
+class HandlerStats:
+    """
+    Call count and latency of one handler.
+    """
+
+    def __init__(self, name: str) -> None:
+        """"""
+        self.name: str = name
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def add(self, cost: float) -> None:
+        """
+        Record one call taking cost seconds.
+        """
+        self.count += 1
+        self.total += cost
+
+        if cost > self.max:
+            self.max = cost
+
+    def merge(self, other: "HandlerStats") -> None:
+        """"""
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """"""
+        return {
+            "name": self.name,
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+def get_handler_name(handler: Callable) -> str:
+    """
+    Get readable name of handler function, bound method or callable object.
+    """
+    if not hasattr(handler, "__qualname__"):
+        handler = type(handler)
+
+    return f"{handler.__module__}.{handler.__qualname__}"
+
+
+class EventStats:
+    """
+    Statistics of one dispatch thread, so no lock is needed when recording.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all recorded statistics.
+        """
+        self.handlers: dict[Callable, HandlerStats] = {}
+        self.queue_depth: Histogram = Histogram(DEPTH_BOUNDS)
+        self.event_age: Histogram = Histogram(LATENCY_BOUNDS)
+
+    def add_handler_cost(self, handler: Callable, cost: float) -> None:
+        """
+        Record one handler call.
+        """
+        stats: HandlerStats | None = self.handlers.get(handler, None)
+        if not stats:
+            stats = HandlerStats(get_handler_name(handler))
+            self.handlers[handler] = stats
+        stats.add(cost)
+
+    def merge(self, other: "EventStats") -> None:
+        """
+        Merge statistics of another dispatch thread.
+        """
+        for handler, stats in list(other.handlers.items()):
+            merged: HandlerStats | None = self.handlers.get(handler, None)
+            if not merged:
+                merged = HandlerStats(stats.name)
+                self.handlers[handler] = merged
+            merged.merge(stats)
+
+        self.queue_depth.merge(other.queue_depth)
+        self.event_age.merge(other.event_age)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert into dict with handlers sorted by total latency.
+        """
+        handlers: list[HandlerStats] = sorted(self.handlers.values(), key=lambda s: s.total, reverse=True)
+
+        return {
+            "events": self.queue_depth.count,
+            "handlers": [stats.to_dict() for stats in handlers],
+            "queue_depth": self.queue_depth.to_dict(),
+            "event_age": self.event_age.to_dict(),
+        }
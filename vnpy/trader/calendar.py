@@ -0,0 +1,177 @@
+"""
+Trading calendar with sorted session arrays and binary-search lookups.
+"""
+
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from threading import Lock
+from typing import Literal
+
+import numpy as np
+
+from .constant import Exchange
+
+
+SESSION_DTYPE: str = "datetime64[us]"
+
+
+def to_datetime64(dt: datetime | date) -> np.datetime64:
+    """Convert datetime or date into naive datetime64, timezone info is dropped"""
+    if isinstance(dt, datetime):
+        dt = dt.replace(tzinfo=None)
+    else:
+        dt = datetime.combine(dt, time())
+    return np.datetime64(dt, "us")
+
+
+def to_session_array(dts: Iterable[datetime | date] | np.ndarray) -> np.ndarray:
+    """Convert datetimes into a sorted unique datetime64 array"""
+    if isinstance(dts, np.ndarray):
+        array: np.ndarray = dts.astype(SESSION_DTYPE)
+    else:
+        array = np.array([to_datetime64(dt) for dt in dts], dtype=SESSION_DTYPE)
+    return np.unique(array)
+
+
+class TradingCalendar:
+    """
+    Sorted trading sessions stored in a datetime64 array.
+
+    Sessions are naive datetimes, e.g. midnight of each trading day for daily
+    bars or bar timestamps for intraday data. All lookups use binary search.
+    """
+
+    def __init__(self, sessions: Iterable[datetime | date] | np.ndarray | None = None) -> None:
+        """Constructor"""
+        self.sessions: np.ndarray = to_session_array(sessions if sessions is not None else [])
+
+    @classmethod
+    def from_weekdays(
+        cls,
+        start: date,
+        end: date,
+        holidays: Iterable[date] = ()
+    ) -> "TradingCalendar":
+        """Create daily calendar of weekdays between start and end (inclusive), excluding holidays"""
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+
+        days: np.ndarray = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(end, "D") + 1,
+            dtype="datetime64[D]"
+        )
+        holiday_days: list[np.datetime64] = [np.datetime64(d, "D") for d in holidays]
+        days = days[np.is_busday(days, holidays=holiday_days)]
+
+        return cls(days)
+
+    def __len__(self) -> int:
+        """Number of sessions"""
+        return len(self.sessions)
+
+    def __contains__(self, dt: datetime | date) -> bool:
+        """Check if dt is a session"""
+        return self.is_session(dt)
+
+    def add_sessions(self, dts: Iterable[datetime | date] | np.ndarray) -> None:
+        """Merge new sessions into calendar"""
+        self.sessions = np.union1d(self.sessions, to_session_array(dts))
+
+    def is_session(self, dt: datetime | date) -> bool:
+        """Check if dt is a session"""
+        value: np.datetime64 = to_datetime64(dt)
+        ix: int = int(np.searchsorted(self.sessions, value))
+        return ix < len(self.sessions) and self.sessions[ix] == value
+
+    def next_session(self, dt: datetime | date, inclusive: bool = False) -> datetime | None:
+        """Get first session after dt (or at dt if inclusive)"""
+        side: Literal["left", "right"] = "left" if inclusive else "right"
+        ix: int = int(np.searchsorted(self.sessions, to_datetime64(dt), side=side))
+
+        if ix >= len(self.sessions):
+            return None
+
+        session: datetime = self.sessions[ix].item()
+        return session
+
+    def previous_session(self, dt: datetime | date, inclusive: bool = False) -> datetime | None:
+        """Get last session before dt (or at dt if inclusive)"""
+        side: Literal["left", "right"] = "right" if inclusive else "left"
+        ix: int = int(np.searchsorted(self.sessions, to_datetime64(dt), side=side)) - 1
+
+        if ix < 0:
+            return None
+
+        session: datetime = self.sessions[ix].item()
+        return session
+
+    def get_range(self, start: datetime | date | None = None, end: datetime | date | None = None) -> np.ndarray:
+        """Get sessions between start and end (inclusive) as datetime64 array"""
+        left: int = int(np.searchsorted(self.sessions, to_datetime64(start), "left")) if start else 0
+        right: int = int(np.searchsorted(self.sessions, to_datetime64(end), "right")) if end else len(self.sessions)
+        return self.sessions[left:right]
+
+    def get_sessions(self, start: datetime | date | None = None, end: datetime | date | None = None) -> list[datetime]:
+        """Get sessions between start and end (inclusive)"""
+        sessions: list[datetime] = self.get_range(start, end).tolist()
+        return sessions
+
+    def count_sessions(self, start: datetime | date | None = None, end: datetime | date | None = None) -> int:
+        """Count sessions between start and end (inclusive)"""
+        return len(self.get_range(start, end))
+
+    def align(self, dts: np.ndarray, method: str = "previous") -> np.ndarray:
+        """
+        Align timestamps to sessions.
+
+        method "previous" maps each timestamp to the last session at or before it,
+        "next" maps to the first session at or after it. Timestamps outside the
+        calendar are mapped to NaT.
+        """
+        values: np.ndarray = np.asarray(dts).astype(SESSION_DTYPE)
+        aligned: np.ndarray = np.full(len(values), np.datetime64("NaT"), dtype=SESSION_DTYPE)
+
+        if method == "previous":
+            ix: np.ndarray = np.searchsorted(self.sessions, values, side="right") - 1
+            valid: np.ndarray = ix >= 0
+        elif method == "next":
+            ix = np.searchsorted(self.sessions, values, side="left")
+            valid = ix < len(self.sessions)
+        else:
+            raise ValueError(f"Unsupported align method {method}")
+
+        aligned[valid] = self.sessions[ix[valid]]
+        return aligned
+
+    def get_missing(
+        self,
+        dts: np.ndarray,
+        start: datetime | date | None = None,
+        end: datetime | date | None = None
+    ) -> np.ndarray:
+        """Get sessions between start and end with no timestamp aligned to them"""
+        expected: np.ndarray = self.get_range(start, end)
+
+        aligned: np.ndarray = self.align(dts)
+        aligned = aligned[~np.isnat(aligned)]
+
+        return np.setdiff1d(expected, aligned, assume_unique=False)
+
+
+calendars: dict[Exchange, TradingCalendar] = {}
+calendars_lock: Lock = Lock()
+
+
+def get_calendar(exchange: Exchange) -> TradingCalendar | None:
+    """Get trading calendar of exchange"""
+    with calendars_lock:
+        return calendars.get(exchange, None)
+
+
+def set_calendar(exchange: Exchange, calendar: TradingCalendar) -> None:
+    """Set trading calendar of exchange"""
+    with calendars_lock:
+        calendars[exchange] = calendar
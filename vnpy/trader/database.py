@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta
 from types import ModuleType
+from typing import TYPE_CHECKING
 from dataclasses import dataclass
 from importlib import import_module
+from threading import Lock
 
 from .constant import Interval, Exchange
 from .object import BarData, TickData
@@ -10,15 +13,42 @@ from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
 
+if TYPE_CHECKING:
+    import polars as pl
 
-DB_TZ = ZoneInfo(SETTINGS["database.timezone"])
+
+db_tz: ZoneInfo | None = None
+
+
+def get_db_tz() -> ZoneInfo:
+    """
+    Get timezone of database, resolved from SETTINGS on first use.
+    """
+    global db_tz
+    if not db_tz:
+        db_tz = ZoneInfo(SETTINGS["database.timezone"])
+    return db_tz
+
+
+def __getattr__(name: str) -> ZoneInfo:
+    """
+    Keep DB_TZ importable while deferring timezone lookup to first access.
+    """
+    if name == "DB_TZ":
+        return get_db_tz()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Columns of bar data frame, datetime is naive in DB_TZ
+BAR_FRAME_COLUMNS: list[str] = [
+    "datetime", "open", "high", "low", "close", "volume", "turnover", "open_interest"
+]
 
 
 def convert_tz(dt: datetime) -> datetime:
     """
     Convert timezone of datetime object to DB_TZ.
     """
-    dt = dt.astimezone(DB_TZ)
+    dt = dt.astimezone(get_db_tz())
     return dt.replace(tzinfo=None)
 
 
@@ -132,8 +162,122 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def save_bar_frame(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """
+        Save bar data of one contract in polars DataFrame format.
+
+        The frame uses BAR_FRAME_COLUMNS with naive datetime in DB_TZ. The
+        default implementation converts rows into BarData and calls
+        save_bar_data, database drivers can override it with bulk insert.
+        """
+        if df.is_empty():
+            return False
+
+        tz: ZoneInfo = get_db_tz()
+
+        bars: list[BarData] = [
+            BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=row["datetime"].replace(tzinfo=tz),
+                interval=interval,
+                volume=row["volume"],
+                turnover=row["turnover"],
+                open_interest=row["open_interest"],
+                open_price=row["open"],
+                high_price=row["high"],
+                low_price=row["low"],
+                close_price=row["close"],
+                gateway_name="DB"
+            )
+            for row in df.select(BAR_FRAME_COLUMNS).iter_rows(named=True)
+        ]
+
+        return self.save_bar_data(bars, stream)
+
+    def load_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> "pl.DataFrame":
+        """
+        Load bar data of one contract in polars DataFrame format.
+
+        The default implementation converts result of load_bar_data, database
+        drivers can override it to read columns directly without BarData.
+        """
+        import polars as pl
+
+        bars: list[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+
+        return pl.DataFrame(
+            {
+                "datetime": [bar.datetime.replace(tzinfo=None) for bar in bars],
+                "open": [bar.open_price for bar in bars],
+                "high": [bar.high_price for bar in bars],
+                "low": [bar.low_price for bar in bars],
+                "close": [bar.close_price for bar in bars],
+                "volume": [bar.volume for bar in bars],
+                "turnover": [bar.turnover for bar in bars],
+                "open_interest": [bar.open_interest for bar in bars],
+            },
+            schema={"datetime": pl.Datetime("us"), **{name: pl.Float64 for name in BAR_FRAME_COLUMNS[1:]}}
+        )
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000
+    ) -> Iterator[list[TickData]]:
+        """
+        Load tick data from database as batches of batch_size ticks.
+
+        The default implementation calls load_tick_data once per day, so at
+        most one day of ticks is held in memory. Database drivers can override
+        it with cursor based reads.
+        """
+        def iter_days() -> Iterator[list[TickData]]:
+            current: datetime = start
+            while current <= end:
+                day_end: datetime = datetime.combine(current.date(), time.max, tzinfo=current.tzinfo)
+                yield self.load_tick_data(symbol, exchange, current, min(day_end, end))
+                current = day_end + timedelta(microseconds=1)
+
+        return split_batches((tick for ticks in iter_days() for tick in ticks), batch_size)
+
+
+def split_batches(ticks: Iterable[TickData], batch_size: int) -> Iterator[list[TickData]]:
+    """
+    Group ticks into lists of batch_size, the last batch may be smaller.
+    """
+    batch: list[TickData] = []
+
+    for tick in ticks:
+        batch.append(tick)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
 
 database: BaseDatabase | None = None
+database_lock: Lock = Lock()
 
 
 def get_database() -> BaseDatabase:
@@ -143,6 +287,16 @@ def get_database() -> BaseDatabase:
     if database:
         return database
 
+    # Only one thread imports and creates the driver
+    with database_lock:
+        if not database:
+            database = create_database()
+        return database
+
+
+def create_database() -> BaseDatabase:
+    """Import database driver module and create database object"""
+
     # Read database related global setting
     database_name: str = SETTINGS["database.name"]
     module_name: str = f"vnpy_{database_name}"
@@ -155,5 +309,11 @@ def get_database() -> BaseDatabase:
         module = import_module("vnpy_sqlite")
 
     # Create database object from module
-    database = module.Database()
-    return database
+    driver: BaseDatabase = module.Database()
+
+    # Wrap with in-memory bar cache, cache size setting is in MB
+    if SETTINGS["database.cache"]:
+        from .database_cache import CachedDatabase
+        return CachedDatabase(driver, SETTINGS["database.cache_size"] * 1024 * 1024)
+
+    return driver
@@ -0,0 +1,347 @@
+"""
+Read-through bar data cache in front of a database driver.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+from .database import (
+    BAR_FRAME_COLUMNS,
+    BarOverview,
+    BaseDatabase,
+    TickOverview,
+    convert_tz,
+    get_db_tz
+)
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+CacheKey = tuple[str, Exchange, Interval]
+
+
+def to_db_datetime64(dt: datetime) -> np.datetime64:
+    """Convert datetime into naive datetime64 in database timezone"""
+    if dt.tzinfo:
+        dt = convert_tz(dt)
+    return np.datetime64(dt, "us")
+
+
+def to_boundary(value: np.datetime64, like: datetime) -> datetime:
+    """Convert cached range boundary into datetime with same timezone style as like"""
+    dt: datetime = value.astype("datetime64[us]").astype(datetime)
+    if like.tzinfo:
+        dt = dt.replace(tzinfo=get_db_tz())
+    return dt
+
+
+@dataclass
+class CacheEntry:
+    """Cached bar data of one contract covering [start, end] in columnar form"""
+
+    start: np.datetime64
+    end: np.datetime64
+    columns: dict[str, np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by column arrays"""
+        return sum(array.nbytes for array in self.columns.values())
+
+    def slice(self, start: np.datetime64, end: np.datetime64) -> dict[str, np.ndarray]:
+        """Get columns between start and end (inclusive)"""
+        dts: np.ndarray = self.columns["datetime"]
+        left: int = int(np.searchsorted(dts, start, "left"))
+        right: int = int(np.searchsorted(dts, end, "right"))
+        return {name: array[left:right] for name, array in self.columns.items()}
+
+
+class CachedDatabase(BaseDatabase):
+    """
+    Database wrapper keeping recently loaded bar ranges in memory.
+
+    Each contract keeps one continuous range, requests overlapping it only load
+    the missing head or tail from the wrapped database. Entries are evicted in
+    LRU order when total size exceeds max_bytes, and invalidated when bar data
+    of the contract is saved or deleted through this wrapper.
+    """
+
+    def __init__(self, database: BaseDatabase, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """Constructor"""
+        self.database: BaseDatabase = database
+        self.max_bytes: int = max_bytes
+
+        self.entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self.total_bytes: int = 0
+
+        # Increase on invalidation so loads started before it are not cached
+        self.generations: dict[CacheKey, int] = {}
+
+        self.hit_count: int = 0
+        self.partial_count: int = 0
+        self.miss_count: int = 0
+
+        self.lock: Lock = Lock()
+
+    def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
+        """Save bar data and invalidate cached contracts"""
+        keys: set[CacheKey] = {
+            (bar.symbol, bar.exchange, bar.interval) for bar in bars if bar.interval
+        }
+        try:
+            return self.database.save_bar_data(bars, stream)
+        finally:
+            self.invalidate(keys)
+
+    def save_bar_frame(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """Save bar data frame and invalidate cached contract"""
+        try:
+            return self.database.save_bar_frame(df, symbol, exchange, interval, stream)
+        finally:
+            self.invalidate([(symbol, exchange, interval)])
+
+    def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """Save tick data"""
+        return self.database.save_tick_data(ticks, stream)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """Load bar data from cache, only missing range is loaded from database"""
+        columns: dict[str, np.ndarray] = self.load_columns(symbol, exchange, interval, start, end)
+        tz: ZoneInfo = get_db_tz()
+
+        return [
+            BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt.replace(tzinfo=tz),
+                interval=interval,
+                volume=volume,
+                turnover=turnover,
+                open_interest=open_interest,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                gateway_name="DB"
+            )
+            for dt, open_price, high_price, low_price, close_price, volume, turnover, open_interest in zip(
+                columns["datetime"].tolist(),
+                columns["open"].tolist(),
+                columns["high"].tolist(),
+                columns["low"].tolist(),
+                columns["close"].tolist(),
+                columns["volume"].tolist(),
+                columns["turnover"].tolist(),
+                columns["open_interest"].tolist(),
+                strict=True
+            )
+        ]
+
+    def load_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> "pl.DataFrame":
+        """Load bar data frame from cache without creating BarData"""
+        import polars as pl
+
+        columns: dict[str, np.ndarray] = self.load_columns(symbol, exchange, interval, start, end)
+        return pl.DataFrame(columns)
+
+    def load_columns(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """Load bar data columns between start and end"""
+        key: CacheKey = (symbol, exchange, interval)
+        start64: np.datetime64 = to_db_datetime64(start)
+        end64: np.datetime64 = to_db_datetime64(end)
+
+        with self.lock:
+            entry: CacheEntry | None = self.entries.get(key, None)
+            generation: int = self.generations.get(key, 0)
+
+            if entry:
+                self.entries.move_to_end(key)
+
+                if entry.start <= start64 and end64 <= entry.end:
+                    self.hit_count += 1
+                    return entry.slice(start64, end64)
+
+        # Load missing head and tail if requested range overlaps cached range
+        if entry and start64 <= entry.end and entry.start <= end64:
+            parts: list[dict[str, np.ndarray]] = [entry.columns]
+
+            if start64 < entry.start:
+                parts.append(self.fetch_columns(key, start, to_boundary(entry.start, start)))
+            if end64 > entry.end:
+                parts.append(self.fetch_columns(key, to_boundary(entry.end, end), end))
+
+            new_entry: CacheEntry = CacheEntry(
+                min(start64, entry.start), max(end64, entry.end), merge_columns(parts)
+            )
+            partial: bool = True
+        else:
+            new_entry = CacheEntry(start64, end64, self.fetch_columns(key, start, end))
+            partial = False
+
+        with self.lock:
+            if partial:
+                self.partial_count += 1
+            else:
+                self.miss_count += 1
+
+            if self.generations.get(key, 0) == generation:
+                self.store(key, new_entry)
+
+        return new_entry.slice(start64, end64)
+
+    def fetch_columns(self, key: CacheKey, start: datetime, end: datetime) -> dict[str, np.ndarray]:
+        """Load bar data columns from wrapped database"""
+        symbol, exchange, interval = key
+        df: pl.DataFrame = self.database.load_bar_frame(symbol, exchange, interval, start, end)
+
+        columns: dict[str, np.ndarray] = {
+            "datetime": df["datetime"].to_numpy().astype("datetime64[us]")
+        }
+        for name in BAR_FRAME_COLUMNS[1:]:
+            columns[name] = df[name].to_numpy().astype(float)
+
+        return columns
+
+    def store(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Store entry and evict least recently used entries, caller should hold lock"""
+        old_entry: CacheEntry | None = self.entries.pop(key, None)
+        if old_entry:
+            self.total_bytes -= old_entry.nbytes
+
+        nbytes: int = entry.nbytes
+        if nbytes > self.max_bytes:
+            return
+
+        self.entries[key] = entry
+        self.total_bytes += nbytes
+
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+
+    def invalidate(self, keys: Iterable[CacheKey]) -> None:
+        """Remove cached data of contracts"""
+        with self.lock:
+            for key in keys:
+                self.generations[key] = self.generations.get(key, 0) + 1
+
+                entry: CacheEntry | None = self.entries.pop(key, None)
+                if entry:
+                    self.total_bytes -= entry.nbytes
+
+    def clear(self) -> None:
+        """Remove all cached data"""
+        self.invalidate(list(self.entries))
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> list[TickData]:
+        """Load tick data"""
+        return self.database.load_tick_data(symbol, exchange, start, end)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000
+    ) -> Iterator[list[TickData]]:
+        """Load tick data as batches"""
+        return self.database.iter_tick_data(symbol, exchange, start, end, batch_size)
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """Delete bar data and invalidate cached contract"""
+        try:
+            return self.database.delete_bar_data(symbol, exchange, interval)
+        finally:
+            self.invalidate([(symbol, exchange, interval)])
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """Delete tick data"""
+        return self.database.delete_tick_data(symbol, exchange)
+
+    def get_bar_overview(self) -> list[BarOverview]:
+        """Return bar data avaible in database"""
+        return self.database.get_bar_overview()
+
+    def get_tick_overview(self) -> list[TickOverview]:
+        """Return tick data avaible in database"""
+        return self.database.get_tick_overview()
+
+    def get_stats(self) -> dict[str, float]:
+        """Get cache hit rate and memory usage"""
+        with self.lock:
+            total: int = self.hit_count + self.partial_count + self.miss_count
+
+            return {
+                "hit_count": self.hit_count,
+                "partial_count": self.partial_count,
+                "miss_count": self.miss_count,
+                "hit_rate": self.hit_count / total if total else 0.0,
+                "entry_count": len(self.entries),
+                "total_bytes": self.total_bytes,
+            }
+
+
+def merge_columns(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """Concatenate column parts, sort by datetime and drop duplicated datetime"""
+    data: dict[str, np.ndarray] = {
+        name: np.concatenate([part[name] for part in parts])
+        for name in BAR_FRAME_COLUMNS
+    }
+
+    # np.unique returns index of first occurrence, cached data takes priority
+    _, index = np.unique(data["datetime"], return_index=True)
+    return {name: array[index] for name, array in data.items()}
@@ -34,7 +34,9 @@ SETTINGS: dict = {
     "database.host": "",
     "database.port": 0,
     "database.user": "",
-    "database.password": ""
+    "database.password": "",
+    "database.cache": False,
+    "database.cache_size": 256
 }
 
 
@@ -0,0 +1,294 @@
+"""
+File based columnar tick storage partitioned by symbol and day.
+"""
+
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import fields
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from .constant import Exchange
+from .object import TickData
+from .database import TickOverview, convert_tz, get_db_tz, split_batches
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+# Float columns of tick data frame
+TICK_FLOAT_COLUMNS: list[str] = [
+    field.name for field in fields(TickData)
+    if field.type in (float, "float")
+]
+
+# Columns of tick data frame, datetime and localtime are naive in database timezone
+TICK_FRAME_COLUMNS: list[str] = ["datetime", "name"] + TICK_FLOAT_COLUMNS + ["localtime"]
+
+
+def to_naive(dt: datetime) -> datetime:
+    """Convert datetime into naive datetime in database timezone"""
+    if dt.tzinfo:
+        return convert_tz(dt)
+    return dt
+
+
+class TickStore:
+    """
+    Tick data stored as one parquet file per symbol per day.
+
+    Files are saved under <root>/<exchange>/<symbol>/<YYYYMMDD>.parquet, so a
+    range read only touches the days inside it and days can be read in
+    parallel. iter_tick_data yields fixed size batches while holding at most
+    max_workers days in memory.
+
+    All TickData fields except symbol, exchange and gateway_name are stored.
+    localtime is loaded as naive datetime in database timezone, files saved
+    before name and localtime were stored load them as defaults.
+    """
+
+    def __init__(self, root_path: str | Path) -> None:
+        """Constructor"""
+        self.root_path: Path = Path(root_path)
+        self.root_path.mkdir(parents=True, exist_ok=True)
+
+        self.lock: Lock = Lock()
+
+    def get_folder(self, symbol: str, exchange: Exchange) -> Path:
+        """Get folder of tick files of one contract"""
+        return self.root_path.joinpath(exchange.value, symbol)
+
+    def get_file_path(self, symbol: str, exchange: Exchange, day: date) -> Path:
+        """Get tick file path of one day"""
+        return self.get_folder(symbol, exchange).joinpath(f"{day:%Y%m%d}.parquet")
+
+    def get_days(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> list[date]:
+        """Get sorted days with tick data between start and end"""
+        folder: Path = self.get_folder(symbol, exchange)
+        if not folder.exists():
+            return []
+
+        days: list[date] = sorted(
+            datetime.strptime(path.stem, "%Y%m%d").date()
+            for path in folder.glob("*.parquet")
+        )
+
+        if start:
+            start_day: date = to_naive(start).date()
+            days = [day for day in days if day >= start_day]
+        if end:
+            end_day: date = to_naive(end).date()
+            days = [day for day in days if day <= end_day]
+
+        return days
+
+    def save_tick_data(self, ticks: list[TickData]) -> bool:
+        """Save tick data, existing ticks with same datetime are replaced"""
+        import polars as pl
+
+        if not ticks:
+            return False
+
+        # Group ticks by contract and day
+        groups: dict[tuple[str, Exchange, date], list[TickData]] = {}
+
+        for tick in ticks:
+            dt: datetime = to_naive(tick.datetime)
+            groups.setdefault((tick.symbol, tick.exchange, dt.date()), []).append(tick)
+
+        with self.lock:
+            for (symbol, exchange, day), day_ticks in groups.items():
+                df: pl.DataFrame = to_tick_frame(day_ticks)
+
+                file_path: Path = self.get_file_path(symbol, exchange, day)
+                if file_path.exists():
+                    df = pl.concat([pl.read_parquet(file_path), df], how="diagonal_relaxed")
+                    df = df.with_columns(pl.col("name").fill_null(""))
+
+                df = df.unique(subset="datetime", keep="last").sort("datetime")
+
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                df.write_parquet(file_path)
+
+        return True
+
+    def load_tick_df(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        day: date,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> "pl.DataFrame":
+        """Load tick data frame of one day, filtered by start and end"""
+        import polars as pl
+
+        file_path: Path = self.get_file_path(symbol, exchange, day)
+        df: pl.DataFrame = pl.read_parquet(file_path)
+
+        if start:
+            df = df.filter(pl.col("datetime") >= to_naive(start))
+        if end:
+            df = df.filter(pl.col("datetime") <= to_naive(end))
+
+        return df
+
+    def iter_tick_df(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        max_workers: int = 1
+    ) -> Iterator["pl.DataFrame"]:
+        """Load tick data frames day by day, next days are read ahead in threads"""
+        days: list[date] = self.get_days(symbol, exchange, start, end)
+        if not days:
+            return
+
+        if max_workers <= 1:
+            for day in days:
+                yield self.load_tick_df(symbol, exchange, day, start, end)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: deque[Future] = deque()
+            remaining: Iterator[date] = iter(days)
+
+            for day in remaining:
+                futures.append(executor.submit(self.load_tick_df, symbol, exchange, day, start, end))
+                if len(futures) >= max_workers:
+                    break
+
+            while futures:
+                df: pl.DataFrame = futures.popleft().result()
+
+                next_day: date | None = next(remaining, None)
+                if next_day:
+                    futures.append(executor.submit(self.load_tick_df, symbol, exchange, next_day, start, end))
+
+                yield df
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000,
+        max_workers: int = 1
+    ) -> Iterator[list[TickData]]:
+        """Load tick data as batches of batch_size ticks"""
+        tz: ZoneInfo = get_db_tz()
+
+        ticks: Iterator[TickData] = (
+            tick
+            for df in self.iter_tick_df(symbol, exchange, start, end, max_workers)
+            for tick in to_ticks(df, symbol, exchange, tz)
+        )
+        return split_batches(ticks, batch_size)
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> list[TickData]:
+        """Load all tick data between start and end"""
+        tz: ZoneInfo = get_db_tz()
+
+        ticks: list[TickData] = []
+        for df in self.iter_tick_df(symbol, exchange, start, end):
+            ticks.extend(to_ticks(df, symbol, exchange, tz))
+        return ticks
+
+    def delete_tick_data(self, symbol: str, exchange: Exchange) -> int:
+        """Delete all tick data of one contract"""
+        import polars as pl
+
+        count: int = 0
+
+        with self.lock:
+            for day in self.get_days(symbol, exchange):
+                file_path: Path = self.get_file_path(symbol, exchange, day)
+                count += pl.scan_parquet(file_path).select(pl.len()).collect().item()
+                file_path.unlink()
+
+        return count
+
+    def get_tick_overview(self) -> list[TickOverview]:
+        """Return tick data available in store"""
+        import polars as pl
+
+        overviews: list[TickOverview] = []
+        tz: ZoneInfo = get_db_tz()
+
+        for exchange_folder in sorted(self.root_path.iterdir()):
+            if not exchange_folder.is_dir():
+                continue
+            exchange: Exchange = Exchange(exchange_folder.name)
+
+            for symbol_folder in sorted(exchange_folder.iterdir()):
+                paths: list[Path] = sorted(symbol_folder.glob("*.parquet"))
+                if not paths:
+                    continue
+
+                summary: pl.DataFrame = pl.scan_parquet(paths).select(
+                    pl.len().alias("count"),
+                    pl.col("datetime").min().alias("start"),
+                    pl.col("datetime").max().alias("end")
+                ).collect()
+
+                overviews.append(TickOverview(
+                    symbol=symbol_folder.name,
+                    exchange=exchange,
+                    count=summary["count"][0],
+                    start=summary["start"][0].replace(tzinfo=tz),
+                    end=summary["end"][0].replace(tzinfo=tz)
+                ))
+
+        return overviews
+
+
+def to_tick_frame(ticks: list[TickData]) -> "pl.DataFrame":
+    """Convert ticks into data frame with TICK_FRAME_COLUMNS"""
+    import polars as pl
+
+    data: dict[str, list] = {
+        "datetime": [to_naive(tick.datetime) for tick in ticks],
+        "name": [tick.name for tick in ticks],
+    }
+    for name in TICK_FLOAT_COLUMNS:
+        data[name] = [getattr(tick, name) for tick in ticks]
+    data["localtime"] = [to_naive(tick.localtime) if tick.localtime else None for tick in ticks]
+
+    return pl.DataFrame(
+        data,
+        schema={
+            "datetime": pl.Datetime("us"),
+            "name": pl.String,
+            **{name: pl.Float64 for name in TICK_FLOAT_COLUMNS},
+            "localtime": pl.Datetime("us"),
+        }
+    )
+
+
+def to_ticks(df: "pl.DataFrame", symbol: str, exchange: Exchange, tz: ZoneInfo) -> Iterator[TickData]:
+    """Convert tick data frame rows into TickData lazily"""
+    # Files saved by older versions may not have all columns
+    columns: list[str] = [name for name in TICK_FRAME_COLUMNS if name in df.columns]
+
+    for row in df.select(columns).iter_rows(named=True):
+        row["datetime"] = row["datetime"].replace(tzinfo=tz)
+        yield TickData(symbol=symbol, exchange=exchange, gateway_name="DB", **row)
@@ -2,6 +2,8 @@
 General utility functions.
 """
 
+from __future__ import annotations
+
 import json
 import sys
 from datetime import datetime, time
@@ -9,15 +11,17 @@ from pathlib import Path
 from collections.abc import Callable
 from decimal import Decimal
 from math import floor, ceil
+from typing import TYPE_CHECKING
 
-import numpy as np
-import talib
 from zoneinfo import ZoneInfo, available_timezones      # noqa
 
 from .object import BarData, TickData
 from .constant import Exchange, Interval
 from .locale import _
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 def extract_vt_symbol(vt_symbol: str) -> tuple[str, Exchange]:
     """
@@ -493,6 +497,10 @@ class ArrayManager:
 
     def __init__(self, size: int = 100) -> None:
         """Constructor"""
+        # numpy and talib are imported on first use, talib also imports
+        # pandas and polars which would slow down importing vnpy.trader
+        import numpy as np
+
         self.count: int = 0
         self.size: int = size
         self.inited: bool = False
@@ -582,6 +590,8 @@ class ArrayManager:
         """
         Simple moving average.
         """
+        import talib
+
         result_array: np.ndarray = talib.SMA(self.close, n)
         if array:
             return result_array
@@ -593,6 +603,8 @@ class ArrayManager:
         """
         Exponential moving average.
         """
+        import talib
+
         result_array: np.ndarray = talib.EMA(self.close, n)
         if array:
             return result_array
@@ -604,6 +616,8 @@ class ArrayManager:
         """
         KAMA.
         """
+        import talib
+
         result_array: np.ndarray = talib.KAMA(self.close, n)
         if array:
             return result_array
@@ -615,6 +629,8 @@ class ArrayManager:
         """
         WMA.
         """
+        import talib
+
         result_array: np.ndarray = talib.WMA(self.close, n)
         if array:
             return result_array
@@ -632,6 +648,8 @@ class ArrayManager:
         """
         APO.
         """
+        import talib
+
         result_array: np.ndarray = talib.APO(self.close, fast_period, slow_period, matype)      # type: ignore
         if array:
             return result_array
@@ -643,6 +661,8 @@ class ArrayManager:
         """
         CMO.
         """
+        import talib
+
         result_array: np.ndarray = talib.CMO(self.close, n)
         if array:
             return result_array
@@ -654,6 +674,8 @@ class ArrayManager:
         """
         MOM.
         """
+        import talib
+
         result_array: np.ndarray = talib.MOM(self.close, n)
         if array:
             return result_array
@@ -671,6 +693,8 @@ class ArrayManager:
         """
         PPO.
         """
+        import talib
+
         result_array: np.ndarray = talib.PPO(self.close, fast_period, slow_period, matype)      # type: ignore
         if array:
             return result_array
@@ -682,6 +706,8 @@ class ArrayManager:
         """
         ROC.
         """
+        import talib
+
         result_array: np.ndarray = talib.ROC(self.close, n)
         if array:
             return result_array
@@ -693,6 +719,8 @@ class ArrayManager:
         """
         ROCR.
         """
+        import talib
+
         result_array: np.ndarray = talib.ROCR(self.close, n)
         if array:
             return result_array
@@ -704,6 +732,8 @@ class ArrayManager:
         """
         ROCP.
         """
+        import talib
+
         result_array: np.ndarray = talib.ROCP(self.close, n)
         if array:
             return result_array
@@ -715,6 +745,8 @@ class ArrayManager:
         """
         ROCR100.
         """
+        import talib
+
         result_array: np.ndarray = talib.ROCR100(self.close, n)
         if array:
             return result_array
@@ -726,6 +758,8 @@ class ArrayManager:
         """
         TRIX.
         """
+        import talib
+
         result_array: np.ndarray = talib.TRIX(self.close, n)
         if array:
             return result_array
@@ -737,6 +771,8 @@ class ArrayManager:
         """
         Standard deviation.
         """
+        import talib
+
         result_array: np.ndarray = talib.STDDEV(self.close, n, nbdev)
         if array:
             return result_array
@@ -748,6 +784,8 @@ class ArrayManager:
         """
         OBV.
         """
+        import talib
+
         result_array: np.ndarray = talib.OBV(self.close, self.volume)
         if array:
             return result_array
@@ -759,6 +797,8 @@ class ArrayManager:
         """
         Commodity Channel Index (CCI).
         """
+        import talib
+
         result_array: np.ndarray = talib.CCI(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -770,6 +810,8 @@ class ArrayManager:
         """
         Average True Range (ATR).
         """
+        import talib
+
         result_array: np.ndarray = talib.ATR(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -781,6 +823,8 @@ class ArrayManager:
         """
         NATR.
         """
+        import talib
+
         result_array: np.ndarray = talib.NATR(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -792,6 +836,8 @@ class ArrayManager:
         """
         Relative Strenght Index (RSI).
         """
+        import talib
+
         result_array: np.ndarray = talib.RSI(self.close, n)
         if array:
             return result_array
@@ -809,6 +855,8 @@ class ArrayManager:
         """
         MACD.
         """
+        import talib
+
         macd, signal, hist = talib.MACD(
             self.close, fast_period, slow_period, signal_period
         )
@@ -820,6 +868,8 @@ class ArrayManager:
         """
         ADX.
         """
+        import talib
+
         result_array: np.ndarray = talib.ADX(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -831,6 +881,8 @@ class ArrayManager:
         """
         ADXR.
         """
+        import talib
+
         result_array: np.ndarray = talib.ADXR(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -842,6 +894,8 @@ class ArrayManager:
         """
         DX.
         """
+        import talib
+
         result_array: np.ndarray = talib.DX(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -853,6 +907,8 @@ class ArrayManager:
         """
         MINUS_DI.
         """
+        import talib
+
         result_array: np.ndarray = talib.MINUS_DI(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -864,6 +920,8 @@ class ArrayManager:
         """
         PLUS_DI.
         """
+        import talib
+
         result_array: np.ndarray = talib.PLUS_DI(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -875,6 +933,8 @@ class ArrayManager:
         """
         WILLR.
         """
+        import talib
+
         result_array: np.ndarray = talib.WILLR(self.high, self.low, self.close, n)
         if array:
             return result_array
@@ -892,6 +952,8 @@ class ArrayManager:
         """
         Ultimate Oscillator.
         """
+        import talib
+
         result_array: np.ndarray = talib.ULTOSC(self.high, self.low, self.close, time_period1, time_period2, time_period3)
         if array:
             return result_array
@@ -903,6 +965,8 @@ class ArrayManager:
         """
         TRANGE.
         """
+        import talib
+
         result_array: np.ndarray = talib.TRANGE(self.high, self.low, self.close)
         if array:
             return result_array
@@ -919,6 +983,8 @@ class ArrayManager:
         """
         Bollinger Channel.
         """
+        import talib
+
         mid_array: np.ndarray = talib.SMA(self.close, n)
         std_array: np.ndarray = talib.STDDEV(self.close, n, 1)
 
@@ -942,6 +1008,8 @@ class ArrayManager:
         """
         Keltner Channel.
         """
+        import talib
+
         mid_array: np.ndarray = talib.SMA(self.close, n)
         atr_array: np.ndarray = talib.ATR(self.high, self.low, self.close, n)
 
@@ -962,6 +1030,8 @@ class ArrayManager:
         """
         Donchian Channel.
         """
+        import talib
+
         up: np.ndarray = talib.MAX(self.high, n)
         down: np.ndarray = talib.MIN(self.low, n)
 
@@ -977,6 +1047,8 @@ class ArrayManager:
         """
         Aroon indicator.
         """
+        import talib
+
         aroon_down, aroon_up = talib.AROON(self.high, self.low, n)
 
         if array:
@@ -987,6 +1059,8 @@ class ArrayManager:
         """
         Aroon Oscillator.
         """
+        import talib
+
         result_array: np.ndarray = talib.AROONOSC(self.high, self.low, n)
 
         if array:
@@ -999,6 +1073,8 @@ class ArrayManager:
         """
         MINUS_DM.
         """
+        import talib
+
         result_array: np.ndarray = talib.MINUS_DM(self.high, self.low, n)
 
         if array:
@@ -1011,6 +1087,8 @@ class ArrayManager:
         """
         PLUS_DM.
         """
+        import talib
+
         result_array: np.ndarray = talib.PLUS_DM(self.high, self.low, n)
 
         if array:
@@ -1023,6 +1101,8 @@ class ArrayManager:
         """
         Money Flow Index.
         """
+        import talib
+
         result_array: np.ndarray = talib.MFI(self.high, self.low, self.close, self.volume, n)
         if array:
             return result_array
@@ -1034,6 +1114,8 @@ class ArrayManager:
         """
         AD.
         """
+        import talib
+
         result_array: np.ndarray = talib.AD(self.high, self.low, self.close, self.volume)
         if array:
             return result_array
@@ -1050,6 +1132,8 @@ class ArrayManager:
         """
         ADOSC.
         """
+        import talib
+
         result_array: np.ndarray = talib.ADOSC(self.high, self.low, self.close, self.volume, fast_period, slow_period)
         if array:
             return result_array
@@ -1061,6 +1145,8 @@ class ArrayManager:
         """
         BOP.
         """
+        import talib
+
         result_array: np.ndarray = talib.BOP(self.open, self.high, self.low, self.close)
 
         if array:
@@ -1081,6 +1167,8 @@ class ArrayManager:
         """
         Stochastic Indicator
         """
+        import talib
+
         k, d = talib.STOCH(
             self.high,
             self.low,
@@ -1099,6 +1187,8 @@ class ArrayManager:
         """
         SAR.
         """
+        import talib
+
         result_array: np.ndarray = talib.SAR(self.high, self.low, acceleration, maximum)
         if array:
             return result_array